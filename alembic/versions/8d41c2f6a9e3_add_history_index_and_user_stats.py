@@ -0,0 +1,98 @@
+"""add history index and user stats
+
+Revision ID: 8d41c2f6a9e3
+Revises: 3f9a1c7e5b20
+Create Date: 2026-10-18 17:31:05.218734
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41c2f6a9e3"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c7e5b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_predictions_user_created",
+        "predictions",
+        ["user_telegram_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_table(
+        "user_stats",
+        sa.Column("user_telegram_id", sa.BigInteger(), nullable=False),
+        sa.Column("runs", sa.Integer(), nullable=False),
+        sa.Column("best_classification_metric", sa.Float(), nullable=True),
+        sa.Column("best_regression_metric", sa.Float(), nullable=True),
+        sa.Column("favourite_model", sa.String(), nullable=True),
+        sa.Column("favourite_model_runs", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_telegram_id"], ["users.telegram_id"]),
+        sa.PrimaryKeyConstraint("user_telegram_id"),
+    )
+    op.create_table(
+        "user_model_stats",
+        sa.Column("user_telegram_id", sa.BigInteger(), nullable=False),
+        sa.Column("best_model", sa.String(), nullable=False),
+        sa.Column("runs", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_telegram_id"], ["users.telegram_id"]),
+        sa.PrimaryKeyConstraint("user_telegram_id", "best_model"),
+    )
+
+    # Backfill from the existing history; new predictions keep them up to date.
+    op.execute("""
+        INSERT INTO user_model_stats (user_telegram_id, best_model, runs)
+        SELECT user_telegram_id, best_model, count(*)
+        FROM predictions
+        GROUP BY user_telegram_id, best_model
+        """)
+    op.execute("""
+        INSERT INTO user_stats (
+            user_telegram_id,
+            runs,
+            best_classification_metric,
+            best_regression_metric,
+            favourite_model_runs
+        )
+        SELECT
+            user_telegram_id,
+            count(*),
+            max(CASE WHEN task_type = 'classification' THEN metric END),
+            min(CASE WHEN task_type = 'regression' THEN metric END),
+            0
+        FROM predictions
+        GROUP BY user_telegram_id
+        """)
+    op.execute("""
+        UPDATE user_stats SET
+            favourite_model = (
+                SELECT best_model FROM user_model_stats m
+                WHERE m.user_telegram_id = user_stats.user_telegram_id
+                ORDER BY runs DESC, best_model
+                LIMIT 1
+            ),
+            favourite_model_runs = (
+                SELECT max(runs) FROM user_model_stats m
+                WHERE m.user_telegram_id = user_stats.user_telegram_id
+            )
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_model_stats")
+    op.drop_table("user_stats")
+    op.drop_index("ix_predictions_user_created", table_name="predictions")
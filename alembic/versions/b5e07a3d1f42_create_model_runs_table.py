@@ -0,0 +1,50 @@
+"""create model_runs table
+
+Revision ID: b5e07a3d1f42
+Revises: 8d41c2f6a9e3
+Create Date: 2026-10-18 17:40:12.905311
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e07a3d1f42"
+down_revision: Union[str, Sequence[str], None] = "8d41c2f6a9e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "model_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("prediction_id", sa.UUID(), nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("best_iteration", sa.Integer(), nullable=True),
+        sa.Column("sample_size", sa.Integer(), nullable=True),
+        sa.Column("duration", sa.Float(), nullable=True),
+        sa.Column("is_best", sa.Boolean(), nullable=False),
+        sa.Column("partial", sa.Boolean(), nullable=False),
+        sa.Column("abandoned", sa.Boolean(), nullable=False),
+        sa.Column("model_id", sa.String(), nullable=True),
+        sa.Column("predictions_id", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["prediction_id"], ["predictions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_model_runs_prediction_id"), "model_runs", ["prediction_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_model_runs_prediction_id"), table_name="model_runs")
+    op.drop_table("model_runs")
@@ -1,9 +1,46 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from api.db.models import Prediction
+from api.db.crud.stats import record_prediction_stats, record_prediction_stats_async
+from api.db.models import ModelRun, Prediction
 from api.db.schemas import TaskType
 
 
+def model_run_rows(prediction: Prediction, results: list[dict]) -> list[dict]:
+    """
+    Turn the model results of a training task into ``model_runs`` rows.
+
+    Passed as a list to a single ``insert``, the rows are written in one
+    executemany batch.
+    Args:
+        prediction (Prediction): The prediction the models were trained for.
+        results (list[dict]): The task's ``all_results``.
+    Returns:
+        list[dict]: One row per model.
+    """
+    return [
+        {
+            'prediction_id': prediction.id,
+            'model_name': r['model_name'],
+            'score': r.get('best_score'),
+            'params': r.get('params'),
+            'best_iteration': r.get('best_iteration'),
+            'sample_size': r.get('sample_size'),
+            'duration': r.get('duration'),
+            'is_best': r['model_name'] == prediction.best_model,
+            'partial': bool(r.get('partial')),
+            'abandoned': bool(r.get('abandoned')),
+            'model_id': r.get('model_id'),
+            'predictions_id': r.get('predictions_id'),
+        }
+        for r in results
+    ]
+
+
 def create_new_prediction(
     db: Session,
     user_telegram_id: str,
@@ -12,6 +49,8 @@ def create_new_prediction(
     target: str,
     metric: float,
     dataset_hash: str,
+    model_id: str | None = None,
+    model_runs: list[dict] | None = None,
 ) -> Prediction:
     """
     Create a new prediction record in the database.
@@ -23,6 +62,9 @@ def create_new_prediction(
         target (str): Target variable for the prediction.
         metric (float): Metric value of the prediction.
         dataset_hash (str): Hash of the dataset used.
+        model_id (str | None): ID of the stored best model.
+        model_runs (list[dict] | None): Results of every model trained, from the
+            task's ``all_results``.
     Returns:
         Prediction: The created prediction record.
     """
@@ -33,10 +75,17 @@ def create_new_prediction(
         target=target,
         metric=metric,
         dataset_hash=dataset_hash,
+        model_id=model_id,
     )
 
     try:
         db.add(prediction)
+        db.flush()
+        record_prediction_stats(db, prediction)
+
+        if model_runs:
+            db.execute(insert(ModelRun), model_run_rows(prediction, model_runs))
+
         db.commit()
         db.refresh(prediction)
     except Exception:
@@ -55,6 +104,136 @@ def get_user_prediction(db: Session, user_telegram_id: str) -> list[Prediction]:
     Returns:
         List[Prediction]: List of the latest prediction records for the user.
     """
-    predictions = db.query(Prediction).filter(Prediction.user_telegram_id == user_telegram_id).order_by(Prediction.created_at.desc()).limit(10).all()
+    predictions = (
+        db.query(Prediction)
+        .filter(Prediction.user_telegram_id == user_telegram_id)
+        .order_by(Prediction.created_at.desc())
+        .limit(10)
+        .all()
+    )
+
+    return predictions
+
+
+async def create_new_prediction_async(
+    db: AsyncSession,
+    user_telegram_id: str,
+    task_type: TaskType,
+    best_model: str,
+    target: str,
+    metric: float,
+    dataset_hash: str,
+    model_id: str | None = None,
+    model_runs: list[dict] | None = None,
+) -> Prediction:
+    """
+    Create a new prediction record in the database without blocking the event loop.
+    Args:
+        db (AsyncSession): Async database session.
+        user_telegram_id (str): Telegram ID of the user.
+        task_type (TaskType): Type of the task.
+        best_model (str): Best model used for the prediction.
+        target (str): Target variable for the prediction.
+        metric (float): Metric value of the prediction.
+        dataset_hash (str): Hash of the dataset used.
+        model_id (str | None): ID of the stored best model.
+        model_runs (list[dict] | None): Results of every model trained, from the
+            task's ``all_results``.
+    Returns:
+        Prediction: The created prediction record.
+    """
+    prediction = Prediction(
+        user_telegram_id=user_telegram_id,
+        task_type=task_type,
+        best_model=best_model,
+        target=target,
+        metric=metric,
+        dataset_hash=dataset_hash,
+        model_id=model_id,
+    )
+
+    try:
+        db.add(prediction)
+        await db.flush()
+        await record_prediction_stats_async(db, prediction)
+
+        if model_runs:
+            await db.execute(insert(ModelRun), model_run_rows(prediction, model_runs))
+
+        await db.commit()
+        await db.refresh(prediction)
+    except Exception:
+        await db.rollback()
+        raise
+
+    return prediction
+
+
+def encode_cursor(prediction: Prediction) -> str:
+    """
+    Encode the position of a prediction in a user's history as a short cursor.
+
+    The cursor is the creation time in microseconds and the hex ID, short
+    enough for Telegram callback data.
+    """
+
+    created_at = prediction.created_at
+
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+
+    return f'{round(created_at.timestamp() * 1_000_000)}.{prediction.id.hex}'
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor from ``encode_cursor``, raising ``ValueError`` if it is malformed.
+    """
+
+    micros, _, hex_id = cursor.partition('.')
+    created_at = datetime.fromtimestamp(int(micros) / 1_000_000, tz=timezone.utc)
+
+    return created_at, uuid.UUID(hex=hex_id)
+
+
+async def get_user_predictions_page_async(
+    db: AsyncSession,
+    user_telegram_id: int,
+    limit: int = 10,
+    cursor: str | None = None,
+) -> tuple[list[Prediction], str | None]:
+    """
+    Retrieve a page of a user's predictions, newest first.
+
+    Pages are read by keyset rather than offset: each page starts right after
+    the last prediction of the previous one, found through the
+    (user_telegram_id, created_at, id) index, so deep pages cost the same as
+    the first.
+    Args:
+        db (AsyncSession): Async database session.
+        user_telegram_id (int): Telegram ID of the user.
+        limit (int): Maximum number of predictions in the page.
+        cursor (str | None): Cursor of the previous page, ``None`` for the first page.
+    Returns:
+        tuple[list[Prediction], str | None]: The predictions and the cursor of the
+            next page, ``None`` on the last page.
+    """
+    query = select(Prediction).where(Prediction.user_telegram_id == user_telegram_id)
+
+    if cursor is not None:
+        query = query.where(
+            tuple_(Prediction.created_at, Prediction.id) < decode_cursor(cursor)
+        )
+
+    predictions = list(
+        await db.scalars(
+            query.order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(
+                limit + 1
+            )
+        )
+    )
+
+    if len(predictions) <= limit:
+        return predictions, None
 
-    return predictions
\ No newline at end of file
+    return predictions[:limit], encode_cursor(predictions[limit - 1])
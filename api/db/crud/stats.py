@@ -0,0 +1,135 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api.db.db_config import dialect_insert
+from api.db.models import Prediction, UserModelStats, UserStats
+from api.db.schemas import TaskType
+
+# Column of the best metric of each task type, and whether higher is better.
+BEST_METRICS = {
+    TaskType.classification: ('best_classification_metric', True),
+    TaskType.regression: ('best_regression_metric', False),
+}
+
+
+def as_task_type(task_type: TaskType | str) -> TaskType:
+    """
+    Accept a task type by member, value ('Regression') or name ('regression').
+    """
+
+    if isinstance(task_type, str) and task_type in TaskType.__members__:
+        return TaskType[task_type]
+
+    return TaskType(task_type)
+
+
+def model_stats_upsert(insert, prediction: Prediction):
+    """
+    Count one more win of the prediction's model, returning the new count.
+    """
+
+    stmt = insert(UserModelStats).values(
+        user_telegram_id=prediction.user_telegram_id,
+        best_model=prediction.best_model,
+        runs=1,
+    )
+
+    return stmt.on_conflict_do_update(
+        index_elements=[UserModelStats.user_telegram_id, UserModelStats.best_model],
+        set_={'runs': UserModelStats.runs + 1},
+    ).returning(UserModelStats.runs)
+
+
+def user_stats_upsert(insert, prediction: Prediction, model_runs: int):
+    """
+    Fold one prediction into the user's stats row, creating it on the first one.
+
+    Every value is computed by the database from the stored row, so concurrent
+    predictions of the same user do not overwrite each other's updates.
+
+    Args:
+        insert: Insert construct of the database, from ``dialect_insert``.
+        prediction (Prediction): The new prediction.
+        model_runs (int): Wins of the prediction's model, including this one.
+    Returns:
+        The upsert statement.
+    """
+
+    column, higher_is_better = BEST_METRICS[as_task_type(prediction.task_type)]
+    stmt = insert(UserStats).values(
+        user_telegram_id=prediction.user_telegram_id,
+        runs=1,
+        favourite_model=prediction.best_model,
+        favourite_model_runs=model_runs,
+        **{column: prediction.metric},
+    )
+
+    best = getattr(UserStats, column)
+    new = stmt.excluded[column]
+    improved = new > best if higher_is_better else new < best
+    takes_over = UserStats.favourite_model_runs < model_runs
+
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_telegram_id],
+        set_={
+            'runs': UserStats.runs + 1,
+            column: case((best.is_(None), new), (improved, new), else_=best),
+            'favourite_model': case(
+                (takes_over, prediction.best_model), else_=UserStats.favourite_model
+            ),
+            'favourite_model_runs': case(
+                (takes_over, model_runs), else_=UserStats.favourite_model_runs
+            ),
+            'updated_at': func.now(),
+        },
+    )
+
+
+def record_prediction_stats(db: Session, prediction: Prediction) -> None:
+    """
+    Update the user's stats with a new prediction, in the caller's transaction.
+    Args:
+        db (Session): Database session.
+        prediction (Prediction): The prediction being inserted.
+    Returns:
+        None
+    """
+
+    insert = dialect_insert(db)
+    model_runs = db.execute(model_stats_upsert(insert, prediction)).scalar_one()
+    db.execute(user_stats_upsert(insert, prediction, model_runs))
+
+
+async def record_prediction_stats_async(
+    db: AsyncSession, prediction: Prediction
+) -> None:
+    """
+    Update the user's stats with a new prediction, in the caller's transaction.
+    Args:
+        db (AsyncSession): Async database session.
+        prediction (Prediction): The prediction being inserted.
+    Returns:
+        None
+    """
+
+    insert = dialect_insert(db)
+    result = await db.execute(model_stats_upsert(insert, prediction))
+    await db.execute(user_stats_upsert(insert, prediction, result.scalar_one()))
+
+
+async def get_user_stats_async(
+    db: AsyncSession, user_telegram_id: int
+) -> UserStats | None:
+    """
+    Retrieve the stats of a user, ``None`` before their first prediction.
+    Args:
+        db (AsyncSession): Async database session.
+        user_telegram_id (int): Telegram ID of the user.
+    Returns:
+        UserStats | None: The user's stats.
+    """
+
+    return await db.scalar(
+        select(UserStats).where(UserStats.user_telegram_id == user_telegram_id)
+    )
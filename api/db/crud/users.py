@@ -1,25 +1,44 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from api.db.db_config import dialect_insert
 from api.db.models import User
+from core.known_users import get_known_users
 
 
-def get_or_create_user(db: Session, tg_id: str, username: str):
-    user = (
-        db.query(User)
-        .filter(User.telegram_id == tg_id, User.username == username)
-        .first()
-    )
+def user_upsert(insert, tg_id: int, username: str):
+    """
+    Insert a user or update their username, returning the stored row.
 
-    if user:
-        return user
+    A single statement, so concurrent calls for the same user cannot both
+    try to insert it.
+    """
+
+    stmt = insert(User).values(telegram_id=tg_id, username=username)
+
+    return stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={'username': stmt.excluded.username},
+    ).returning(User)
+
+
+def get_or_create_user(db: Session, tg_id: int, username: str) -> User:
+    """
+    Create a user, or update the username of an existing one, in one round trip.
+    Args:
+        db (Session): Database session.
+        tg_id (int): Telegram ID of the user.
+        username (str): Current username of the user.
+    Returns:
+        User: The stored user.
+    """
 
-    user = User(
-        telegram_id=tg_id,
-        username=username,
-    )
-    db.add(user)
+    user = db.scalars(
+        user_upsert(dialect_insert(db), tg_id, username),
+        execution_options={'populate_existing': True},
+    ).one()
     db.commit()
-    db.refresh(user)
 
     return user
 
@@ -28,3 +47,57 @@ def get_user_profile(db: Session, tg_id: str):
     user = db.query(User).filter(User.telegram_id == tg_id).first()
 
     return user
+
+
+async def get_or_create_user_async(db: AsyncSession, tg_id: int, username: str) -> User:
+    """
+    Create a user, or update the username of an existing one, in one round trip.
+
+    Users already known to this process with the same username skip the
+    database entirely.
+    Args:
+        db (AsyncSession): Async database session.
+        tg_id (int): Telegram ID of the user.
+        username (str): Current username of the user.
+    Returns:
+        User: The stored user.
+    """
+
+    known_users = get_known_users()
+    user = known_users.get(tg_id)
+
+    if user is not None and user.username == username:
+        return user
+
+    user = (
+        await db.scalars(
+            user_upsert(dialect_insert(db), tg_id, username),
+            execution_options={'populate_existing': True},
+        )
+    ).one()
+    await db.commit()
+    known_users.put(user)
+
+    return user
+
+
+async def get_user_profile_async(db: AsyncSession, tg_id: int) -> User | None:
+    """
+    Retrieve a user, from the known users cache when possible.
+    Args:
+        db (AsyncSession): Async database session.
+        tg_id (int): Telegram ID of the user.
+    Returns:
+        User | None: The user, ``None`` if they never started the bot.
+    """
+
+    known_users = get_known_users()
+    user = known_users.get(tg_id)
+
+    if user is None:
+        user = await db.scalar(select(User).where(User.telegram_id == tg_id))
+
+        if user is not None:
+            known_users.put(user)
+
+    return user
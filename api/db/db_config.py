@@ -1,10 +1,25 @@
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
+# Async driver of each database, for the engine used inside the event loop.
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'sqlite': 'aiosqlite',
+}
+
+# INSERT ... ON CONFLICT of each supported database.
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
 engine = create_engine(
     DATABASE_URL,
     echo=True,
@@ -17,4 +32,73 @@ SessionLocal = sessionmaker(
     autocommit=False,
 )
 
+
+def async_database_url(url: str) -> str:
+    """
+    Swap the driver of a database URL for its async counterpart.
+
+    Parameters:
+        url (str): Database URL, with or without an explicit driver.
+
+    Returns:
+        str: The same URL using asyncpg or aiosqlite.
+    """
+
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}').render_as_string(
+        hide_password=False
+    )
+
+
+def async_engine_options(url: str) -> dict:
+    """
+    Pool and timeout options of the async engine, from the settings.
+    """
+
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {'connect_args': {'timeout': settings.DB_CONNECT_TIMEOUT_S}}
+
+    return {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT_S,
+        'pool_recycle': settings.DB_POOL_RECYCLE_S,
+        'pool_pre_ping': True,
+        'connect_args': {
+            'timeout': settings.DB_CONNECT_TIMEOUT_S,
+            'command_timeout': settings.DB_COMMAND_TIMEOUT_S,
+        },
+    }
+
+
+def dialect_insert(db):
+    """
+    Return the ``insert`` supporting ``on_conflict_do_update`` for a session's database.
+
+    Parameters:
+        db (Session | AsyncSession): Database session.
+
+    Returns:
+        Callable: ``insert`` of the PostgreSQL or SQLite dialect.
+    """
+
+    return DIALECT_INSERTS[db.get_bind().dialect.name]
+
+
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=True,
+    **async_engine_options(ASYNC_DATABASE_URL),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
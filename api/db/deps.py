@@ -1,4 +1,4 @@
-from api.db.db_config import SessionLocal
+from api.db.db_config import AsyncSessionLocal, SessionLocal
 
 
 def get_db():
@@ -7,3 +7,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,7 +1,8 @@
 import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import (BigInteger, Column, DateTime, Enum, Float, ForeignKey,
-                        String, func)
+from sqlalchemy import (JSON, BigInteger, Boolean, Column, DateTime, Enum,
+                        Float, ForeignKey, Index, Integer, String, func)
 from sqlalchemy.dialects.postgresql import UUID
 
 from api.db.db_config import Base
@@ -39,6 +40,80 @@ class Prediction(Base):
     target = Column(String, nullable=False)
     metric = Column(Float, nullable=False)
     dataset_hash = Column(String, nullable=True)
+    model_id = Column(String, nullable=True)
+    # Set by the application as well, so SQLite stores the same precision it
+    # is compared with when paging the history.
     created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # Serves the history of a user newest first, and its keyset pages.
+        Index(
+            'ix_predictions_user_created',
+            'user_telegram_id',
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
+
+
+class ModelRun(Base):
+    """
+    Result of one model trained for a prediction, the best one or not.
+    """
+
+    __tablename__ = 'model_runs'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    prediction_id = Column(
+        UUID(as_uuid=True), ForeignKey('predictions.id'), nullable=False, index=True
+    )
+    model_name = Column(String, nullable=False)
+    score = Column(Float, nullable=True)
+    params = Column(JSON, nullable=True)
+    best_iteration = Column(Integer, nullable=True)
+    sample_size = Column(Integer, nullable=True)
+    duration = Column(Float, nullable=True)
+    is_best = Column(Boolean, nullable=False, default=False)
+    partial = Column(Boolean, nullable=False, default=False)
+    abandoned = Column(Boolean, nullable=False, default=False)
+    model_id = Column(String, nullable=True)
+    predictions_id = Column(String, nullable=True)
+
+
+class UserStats(Base):
+    """
+    Summary of a user's predictions, updated with every new prediction.
+    """
+
+    __tablename__ = 'user_stats'
+
+    user_telegram_id = Column(
+        BigInteger, ForeignKey('users.telegram_id'), primary_key=True
+    )
+    runs = Column(Integer, nullable=False, default=0)
+    best_classification_metric = Column(Float, nullable=True)
+    best_regression_metric = Column(Float, nullable=True)
+    favourite_model = Column(String, nullable=True)
+    favourite_model_runs = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+
+
+class UserModelStats(Base):
+    """
+    Number of times each model won a user's predictions, to find their favourite.
+    """
+
+    __tablename__ = 'user_model_stats'
+
+    user_telegram_id = Column(
+        BigInteger, ForeignKey('users.telegram_id'), primary_key=True
+    )
+    best_model = Column(String, primary_key=True)
+    runs = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class TaskType(str, Enum):
@@ -8,6 +8,33 @@ class TaskType(str, Enum):
     regression = 'Regression'
 
 
+class SearchMode(str, Enum):
+    random = 'random'
+    halving = 'halving'
+
+
 class PredictionRequest(BaseModel):
-    df_path: str
+    df_path: str | None = None
     target: str
+    search_mode: SearchMode = SearchMode.random
+    search_budget: float | None = Field(default=None, gt=0)
+    dataset_hash: str | None = None
+    features: list[str] | None = None
+    time_budget_s: float | None = Field(default=None, gt=0)
+
+    @model_validator(mode='after')
+    def check_dataset(self) -> 'PredictionRequest':
+        # Without a path, the workers fetch the dataset from the store by hash.
+        if self.df_path is None and self.dataset_hash is None:
+            raise ValueError('Either df_path or dataset_hash is required')
+
+        return self
+
+
+class ScoringRequest(BaseModel):
+    rows: list[dict]
+
+
+class BatchScoringRequest(BaseModel):
+    dataset_hash: str
+    save_output: bool = False
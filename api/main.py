@@ -1,9 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from api.db.db_config import async_engine
 from api.v1.router import router as v1_router
 from api.v2.router import router as v2_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await async_engine.dispose()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.include_router(v1_router, prefix='/v1')
 app.include_router(v2_router, prefix='/v2')
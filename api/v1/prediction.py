@@ -1,10 +1,14 @@
+import logging
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from ml.src.regression import regression_training
+from ml.src.tasks.regression import regression_task
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 
 class PredictionRequest(BaseModel):
     df_path: str
@@ -12,16 +16,25 @@ class PredictionRequest(BaseModel):
 
 
 @router.post('/regression/')
-async def regression_predict(data: PredictionRequest):
-    results = regression_training(data.df_path, data.target)
-    best_result = min(results, key=lambda x: x['best_score'])
+def regression_predict(data: PredictionRequest) -> dict:
+    """
+    Initiates a regression training task.
+
+    Training runs on the workers; follow the task at
+    ``/v2/regression/tasks/{task_id}``.
+
+    Args:
+        data (PredictionRequest): The request body containing the dataframe path
+            and target column.
+    Returns:
+        dict: A dictionary containing the task ID and status.
+    """
+
+    task = regression_task.delay(data.df_path, data.target)
 
-    print(results)
-    print(best_result)
+    logger.info('Enqueued regression task %s for %s', task.id, data.df_path)
 
     return {
-        'model_name': best_result['model_name'],
-        'best_score': float(best_result['best_score']),
-        'predictions': best_result['predictions'][:5],
-        'params': best_result.get('params', {}),
+        'task_id': task.id,
+        'status': 'started',
     }
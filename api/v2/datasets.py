@@ -0,0 +1,91 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from core.dataset_store import CHUNK_BYTES, get_dataset_store
+
+router = APIRouter()
+
+
+def get_dataset_path(dataset_hash: str):
+    """
+    Returns the stored file of a dataset or responds with 404.
+    """
+
+    try:
+        path = get_dataset_store().get(dataset_hash)
+    except ValueError:
+        path = None
+
+    if path is None:
+        raise HTTPException(status_code=404, detail='Dataset not found')
+
+    return path
+
+
+@router.put('/{dataset_hash}')
+async def upload_dataset(dataset_hash: str, request: Request) -> dict:
+    """
+    Stores a CSV or Feather dataset under the SHA-256 of its content.
+
+    The request body is the raw file. A dataset that is already stored is
+    not written again.
+
+    Args:
+        dataset_hash (str): The SHA-256 of the file, checked against the body.
+        request (Request): The request streaming the file.
+    Returns:
+        dict: A dictionary containing the dataset hash and whether it was new.
+    """
+
+    store = get_dataset_store()
+
+    try:
+        if store.get(dataset_hash) is not None:
+            return {'dataset_hash': dataset_hash, 'created': False}
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    tmp_path = await run_in_threadpool(store.temp_path)
+
+    # Disk writes run in the threadpool, a buffer at a time, so a multi-GB body
+    # does not block the event loop. A body cut short, as by a disconnecting
+    # client, leaves no temporary file behind.
+    try:
+        with open(tmp_path, 'wb') as f:
+            buffer = bytearray()
+
+            async for chunk in request.stream():
+                buffer += chunk
+
+                if len(buffer) >= CHUNK_BYTES:
+                    await run_in_threadpool(f.write, buffer)
+                    buffer.clear()
+
+            await run_in_threadpool(f.write, buffer)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    try:
+        _, created = await run_in_threadpool(store.add, tmp_path, dataset_hash)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    return {'dataset_hash': dataset_hash, 'created': created}
+
+
+@router.api_route('/{dataset_hash}', methods=['GET', 'HEAD'])
+def download_dataset(dataset_hash: str) -> FileResponse:
+    """
+    Downloads a stored dataset; ``HEAD`` only checks that it is stored.
+
+    Args:
+        dataset_hash (str): The SHA-256 of the dataset file.
+    Returns:
+        FileResponse: The CSV or Feather file.
+    """
+
+    return FileResponse(
+        get_dataset_path(dataset_hash), media_type='application/octet-stream'
+    )
@@ -0,0 +1,111 @@
+import uuid
+
+import pandas as pd
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+
+from api.db.schemas import BatchScoringRequest, ScoringRequest
+from api.v2.datasets import get_dataset_path
+from core.model_cache import get_model_cache
+from ml.src.artifacts import scores_path
+from ml.src.scoring import check_columns, iter_scored_csv, score_file
+
+router = APIRouter()
+
+
+def get_pipeline(model_id: str):
+    """
+    Loads a trained pipeline or responds with 404.
+    """
+
+    try:
+        return get_model_cache().get(model_id)
+    except (FileNotFoundError, ValueError):
+        raise HTTPException(status_code=404, detail='Model not found')
+
+
+@router.post('/{model_id}/predict')
+def model_predict(model_id: str, data: ScoringRequest) -> dict:
+    """
+    Scores rows with a trained model.
+
+    Args:
+        model_id (str): The ID of the model returned with the training result.
+        data (ScoringRequest): The feature rows to score.
+    Returns:
+        dict: A dictionary containing the model ID and one prediction per row.
+    """
+
+    pipeline = get_pipeline(model_id)
+
+    try:
+        predictions = pipeline.predict(pd.DataFrame(data.rows))
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    return {'model_id': model_id, 'predictions': predictions.tolist()}
+
+
+@router.post('/{model_id}/score')
+def model_score(model_id: str, data: BatchScoringRequest):
+    """
+    Scores a whole stored CSV or Feather dataset in chunks of rows.
+
+    Memory use does not depend on the size of the dataset. The model and the
+    dataset columns are checked before any prediction is sent. Predictions are
+    streamed back as a CSV response, or, with ``save_output``, written to the
+    server and downloaded by the returned ``scores_id``.
+
+    Args:
+        model_id (str): The ID of the model returned with the training result.
+        data (BatchScoringRequest): The dataset hash and whether to save the output.
+    Returns:
+        dict | StreamingResponse: Scores ID, row count and rows per second,
+            or the streamed predictions.
+    """
+
+    pipeline = get_pipeline(model_id)
+    df_path = get_dataset_path(data.dataset_hash)
+
+    try:
+        check_columns(pipeline, df_path)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    if not data.save_output:
+        return StreamingResponse(
+            iter_scored_csv(pipeline, df_path), media_type='text/csv'
+        )
+
+    scores_id = uuid.uuid4().hex
+
+    try:
+        stats = score_file(pipeline, df_path, scores_path(scores_id))
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    del stats['output_path']
+
+    return {'scores_id': scores_id, **stats}
+
+
+@router.get('/scores/{scores_id}')
+def get_scores(scores_id: str) -> FileResponse:
+    """
+    Downloads the predictions saved by a batch scoring request.
+
+    Args:
+        scores_id (str): The ``scores_id`` returned by the scoring request.
+    Returns:
+        FileResponse: The predictions as a CSV file.
+    """
+
+    try:
+        path = scores_path(scores_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail='Scores not found')
+
+    if not path.exists():
+        raise HTTPException(status_code=404, detail='Scores not found')
+
+    return FileResponse(path, media_type='text/csv', filename=path.name)
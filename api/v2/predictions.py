@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from ml.src.artifacts import predictions_path
+
+router = APIRouter()
+
+
+@router.get('/{predictions_id}')
+def get_predictions(predictions_id: str) -> FileResponse:
+    """
+    Downloads the full test-split predictions of a trained model.
+
+    Args:
+        predictions_id (str): The ``predictions_id`` returned with a model result.
+    Returns:
+        FileResponse: The predictions as a NumPy ``.npy`` file.
+    """
+
+    try:
+        path = predictions_path(predictions_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail='Predictions not found')
+
+    if not path.exists():
+        raise HTTPException(status_code=404, detail='Predictions not found')
+
+    return FileResponse(path, media_type='application/octet-stream', filename=path.name)
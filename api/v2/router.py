@@ -1,11 +1,26 @@
 from fastapi import APIRouter
 
-from api.v2.classification import router as classification_router
-from api.v2.regression import router as regression_router
+from api.v2.datasets import router as datasets_router
+from api.v2.models import router as models_router
+from api.v2.predictions import router as predictions_router
+from api.v2.training import build_training_router
+from api.v2.users import router as users_router
+from ml.src.tasks.classification import classification_task
+from ml.src.tasks.regression import regression_task
+
+TRAINING_TASKS = {
+    'regression': regression_task,
+    'classification': classification_task,
+}
 
 router = APIRouter()
 
-router.include_router(regression_router, prefix='/regression', tags=['regression'])
-router.include_router(
-    classification_router, prefix='/classification', tags=['classification']
-)
\ No newline at end of file
+for task_type, task in TRAINING_TASKS.items():
+    router.include_router(
+        build_training_router(task, task_type), prefix=f'/{task_type}', tags=[task_type]
+    )
+
+router.include_router(models_router, prefix='/models', tags=['models'])
+router.include_router(predictions_router, prefix='/predictions', tags=['predictions'])
+router.include_router(datasets_router, prefix='/datasets', tags=['datasets'])
+router.include_router(users_router, prefix='/users', tags=['users'])
@@ -0,0 +1,286 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+
+from celery import Task
+from celery.result import AsyncResult
+from celery.utils import uuid
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from api.db.schemas import PredictionRequest
+from api.v2.datasets import get_dataset_path
+from core.celery_app import celery_app
+from core.result_cache import get_result_cache
+from ml.src.search import model_summary
+
+# Seconds between two reads of the task state by an open event stream.
+STREAM_POLL_INTERVAL_S = 1.0
+
+# Seconds a stream waits for a task to leave PENDING; Celery reports unknown
+# and expired task IDs as PENDING too, and those never change.
+STREAM_PENDING_GRACE_S = 300.0
+
+
+def enqueue_training(task: Task, task_type: str, data: PredictionRequest) -> dict:
+    """
+    Serve a training request from the result cache or enqueue it once.
+
+    A request whose dataset hash was seen before returns the cached result.
+    An identical request that is still running returns that job's task ID
+    instead of enqueuing a duplicate task.
+
+    Args:
+        task (Task): The Celery training task to enqueue.
+        task_type (str): 'classification' or 'regression'.
+        data (PredictionRequest): The training request.
+    Returns:
+        dict: A dictionary containing the task ID, status and, for cache hits, the result.
+    """
+
+    # Fail fast, rather than in the workers, on a dataset that was never uploaded.
+    if data.df_path is None:
+        get_dataset_path(data.dataset_hash)
+
+    args = (
+        data.df_path,
+        data.target,
+        data.search_mode.value,
+        data.search_budget,
+        data.features,
+        data.time_budget_s,
+    )
+
+    if data.dataset_hash is None:
+        return {'task_id': task.delay(*args).id, 'status': 'started'}
+
+    # The time budget is left out of the key: a complete result serves any budget,
+    # and partial results are never cached.
+    cache = get_result_cache()
+    key = cache.make_key(
+        data.dataset_hash,
+        data.target,
+        task_type,
+        search_mode=data.search_mode.value,
+        search_budget=data.search_budget,
+        features=data.features,
+    )
+
+    cached = cache.get(key)
+
+    if cached is not None:
+        return {
+            'task_id': cached['task_id'],
+            'status': 'cached',
+            'info': cached['result'],
+        }
+
+    task_id = uuid()
+    running = cache.claim(key, task_id)
+
+    # A crashed job leaves its marker behind until it expires; take over from it.
+    if running is not None and AsyncResult(running, app=celery_app).failed():
+        cache.forget(key, running)
+        running = cache.claim(key, task_id)
+
+    if running is not None:
+        return {'task_id': running, 'status': 'running'}
+
+    task.apply_async(
+        args, {'cache_key': key, 'dataset_hash': data.dataset_hash}, task_id=task_id
+    )
+
+    return {'task_id': task_id, 'status': 'started'}
+
+
+def format_event(event: str, data) -> str:
+    """
+    Format one server-sent event.
+    """
+
+    return f'event: {event}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+def read_task(task_id: str) -> tuple[str, object]:
+    """
+    Read the state and info of a task; blocking, as it queries the result backend.
+    """
+
+    task = AsyncResult(task_id, app=celery_app)
+
+    return task.state, task.info
+
+
+def read_finished_models(jobs: dict) -> list:
+    """
+    Read the results of the per-model subtasks that have finished; blocking.
+    """
+
+    results = []
+
+    for job_id in jobs.values():
+        job = AsyncResult(job_id, app=celery_app)
+
+        if job.successful():
+            results.append(job.result)
+
+    return results
+
+
+async def iter_task_events(
+    task_id: str,
+    poll_interval: float = STREAM_POLL_INTERVAL_S,
+    pending_grace: float = STREAM_PENDING_GRACE_S,
+) -> AsyncIterator[str]:
+    """
+    Yield a server-sent event for each model a training task finishes.
+
+    A ``model`` event carries the name, score, hyperparameters and duration of
+    one model, as soon as its subtask has finished. The stream ends with a
+    ``done`` event holding the best model, or an ``error`` event if the task
+    failed or stayed ``PENDING`` for longer than ``pending_grace``.
+
+    Args:
+        task_id (str): The ID of the training task.
+        poll_interval (float): Seconds between two reads of the task state.
+        pending_grace (float): Seconds after which a task still ``PENDING`` is
+            taken as unknown.
+    Returns:
+        AsyncIterator[str]: Formatted server-sent events.
+    """
+
+    sent = set()
+    pending_until = time.monotonic() + pending_grace
+
+    while True:
+        state, info = await run_in_threadpool(read_task, task_id)
+
+        if state == 'SUCCESS':
+            results = info['all_results']
+        elif state == 'PROGRESS' and isinstance(info, dict) and 'jobs' in info:
+            results = await run_in_threadpool(read_finished_models, info['jobs'])
+        else:
+            results = []
+
+        for result in results:
+            if result.get('abandoned') or result['model_name'] in sent:
+                continue
+
+            sent.add(result['model_name'])
+            yield format_event('model', model_summary(result))
+
+        if state == 'SUCCESS':
+            best = info['best_model']
+            yield format_event(
+                'done',
+                {
+                    'partial': info['partial'],
+                    'best_model': {
+                        **model_summary(best),
+                        'model_id': best.get('model_id'),
+                    },
+                },
+            )
+            return
+
+        if state in ('FAILURE', 'REVOKED'):
+            yield format_event('error', {'state': state, 'detail': str(info)})
+            return
+
+        if state == 'PENDING' and time.monotonic() >= pending_until:
+            yield format_event(
+                'error',
+                {
+                    'state': state,
+                    'detail': f'Task unknown or not started within {pending_grace}s',
+                },
+            )
+            return
+
+        await asyncio.sleep(poll_interval)
+
+
+def stream_task(task_id: str) -> StreamingResponse:
+    """
+    Stream the progress of a training task as server-sent events.
+
+    Args:
+        task_id (str): The ID of the training task.
+    Returns:
+        StreamingResponse: A ``text/event-stream`` response.
+    """
+
+    return StreamingResponse(
+        iter_task_events(task_id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache'},
+    )
+
+
+def build_training_router(task: Task, task_type: str) -> APIRouter:
+    """
+    Build the routes to train models of one task type and follow their tasks.
+
+    The training route is a plain ``def``: the result cache, the dataset store
+    and the broker are all queried with blocking calls, so FastAPI runs it in
+    its threadpool rather than on the event loop.
+
+    Args:
+        task (Task): The Celery training task of the task type.
+        task_type (str): 'classification' or 'regression'.
+    Returns:
+        APIRouter: The ``/train/``, ``/tasks/{task_id}`` and
+            ``/tasks/{task_id}/stream`` routes.
+    """
+
+    router = APIRouter()
+
+    @router.post('/train/', name=f'{task_type}_predict')
+    def train(data: PredictionRequest) -> dict:
+        """
+        Initiates a training task.
+
+        Args:
+            data (PredictionRequest): The request body containing the dataframe path,
+                target column and search settings.
+        Returns:
+            dict: A dictionary containing the task ID, status and, for cache hits,
+                the result.
+        """
+
+        return enqueue_training(task, task_type, data)
+
+    @router.get('/tasks/{task_id}')
+    def get_task_status(task_id: str) -> dict:
+        """
+        Retrieves the status of a training task.
+
+        Args:
+            task_id (str): The ID of the task to check.
+        Returns:
+            dict: A dictionary containing the state and info of the task.
+        """
+
+        state, info = read_task(task_id)
+
+        return {'state': state, 'info': info}
+
+    @router.get('/tasks/{task_id}/stream')
+    def stream_task_status(task_id: str) -> StreamingResponse:
+        """
+        Streams the results of a training task as server-sent events.
+
+        A ``model`` event is sent as each model finishes, then a ``done`` event
+        with the best model, or an ``error`` event if the task failed.
+
+        Args:
+            task_id (str): The ID of the task to follow.
+        Returns:
+            StreamingResponse: The event stream.
+        """
+
+        return stream_task(task_id)
+
+    return router
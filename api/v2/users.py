@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.db.crud.predictions import get_user_predictions_page_async
+from api.db.crud.stats import get_user_stats_async
+from api.db.deps import get_async_db
+
+router = APIRouter()
+
+PREDICTION_FIELDS = (
+    'id',
+    'task_type',
+    'best_model',
+    'target',
+    'metric',
+    'dataset_hash',
+    'model_id',
+    'created_at',
+)
+
+STATS_FIELDS = (
+    'runs',
+    'best_classification_metric',
+    'best_regression_metric',
+    'favourite_model',
+    'updated_at',
+)
+
+
+@router.get('/{telegram_id}/predictions')
+async def user_predictions(
+    telegram_id: int,
+    limit: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """
+    Lists a user's predictions, newest first, one page at a time.
+
+    Args:
+        telegram_id (int): The Telegram ID of the user.
+        limit (int): The maximum number of predictions in the page.
+        cursor (str | None): The ``next_cursor`` of the previous page.
+        db (AsyncSession): The database session.
+    Returns:
+        dict: A dictionary containing the predictions and the cursor of the next page,
+            ``None`` on the last page.
+    """
+
+    try:
+        predictions, next_cursor = await get_user_predictions_page_async(
+            db, telegram_id, limit, cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=422, detail='Invalid cursor')
+
+    return {
+        'predictions': [
+            {field: getattr(p, field) for field in PREDICTION_FIELDS}
+            for p in predictions
+        ],
+        'next_cursor': next_cursor,
+    }
+
+
+@router.get('/{telegram_id}/stats')
+async def user_stats(
+    telegram_id: int, db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """
+    Summarizes a user's predictions.
+
+    Args:
+        telegram_id (int): The Telegram ID of the user.
+        db (AsyncSession): The database session.
+    Returns:
+        dict: A dictionary containing the run count, the best metric per task type
+            and the model that won most often.
+    """
+
+    stats = await get_user_stats_async(db, telegram_id)
+
+    if stats is None:
+        raise HTTPException(status_code=404, detail='No predictions yet')
+
+    return {field: getattr(stats, field) for field in STATS_FIELDS}
@@ -0,0 +1,144 @@
+"""
+Wall-clock comparison of the training executor backends.
+
+Trains every candidate model on synthetic datasets, one after the other as a
+training subtask does, with the backend its CV folds are fitted on forced
+through ``TRAINING_EXECUTOR``. Prints the per-model duration together with
+the speedup over the thread backend.
+
+Usage:
+    python -m benchmarks.executor_backends --task classification --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml.src import classification, regression
+from ml.src.data_preprocessing import build_cv_splits, split_dataset
+from ml.src.executors import EXECUTOR_BACKENDS
+from ml.src.search import build_fold_caches
+
+MODULES = {
+    'classification': classification,
+    'regression': regression,
+}
+
+
+def make_dataset(rows: int, task_type: str, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a synthetic dataset with numeric and categorical features.
+
+    Parameters:
+        rows (int): Number of rows.
+        task_type (str): 'classification' or 'regression'.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Dataset with a 'target' column.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame(
+        rng.normal(size=(rows, 10)), columns=[f'num_{i}' for i in range(10)]
+    )
+
+    for i in range(3):
+        df[f'cat_{i}'] = pd.Series(
+            rng.choice([f'level_{j}' for j in range(20)], size=rows), dtype='category'
+        )
+
+    signal = df['num_0'] * 2 - df['num_1'] + (df['cat_0'].cat.codes % 3)
+
+    if task_type == 'classification':
+        df['target'] = (signal + rng.normal(size=rows) > signal.median()).astype(int)
+    else:
+        df['target'] = signal + rng.normal(size=rows)
+
+    return df
+
+
+def run(task_type: str, rows: int, backend: str) -> tuple[dict, float]:
+    """
+    Train every model of a task type with a single forced backend.
+
+    Parameters:
+        task_type (str): 'classification' or 'regression'.
+        rows (int): Number of rows in the synthetic dataset.
+        backend (str): One of ``EXECUTOR_BACKENDS``.
+
+    Returns:
+        tuple: Per-model durations and total wall-clock time.
+    """
+
+    module = MODULES[task_type]
+
+    df = make_dataset(rows, task_type)
+    X_train, X_test, y_train, y_test = split_dataset(df, 'target')
+    models = module.build_models()
+    stratify = module.STRATIFY
+    cv_splits = build_cv_splits(X_train, y_train, stratify=stratify)
+    caches = build_fold_caches(
+        models, X_train, X_test, y_train, y_test, cv_splits, stratify=stratify
+    )
+
+    os.environ['TRAINING_EXECUTOR'] = backend
+    started = time.perf_counter()
+
+    try:
+        durations = {
+            model_name: module.train_single_model(
+                model_name,
+                model,
+                module.GRID_PARAMS.get(model_name),
+                caches[model_name],
+            )['duration']
+            for model_name, model in models.items()
+        }
+    finally:
+        del os.environ['TRAINING_EXECUTOR']
+
+    return durations, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--task', choices=list(MODULES), default='classification')
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        '--backends',
+        nargs='+',
+        choices=EXECUTOR_BACKENDS,
+        default=list(EXECUTOR_BACKENDS),
+    )
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        timings = {backend: run(args.task, rows, backend) for backend in args.backends}
+        baseline, baseline_total = timings.get('thread', next(iter(timings.values())))
+
+        print(f'\n{args.task}, {rows:,} rows')
+        print(f'{"model":<20}' + ''.join(f'{b:>18}' for b in args.backends))
+
+        for model_name in baseline:
+            cells = ''
+            for backend in args.backends:
+                duration = timings[backend][0][model_name]
+                cells += f'{duration:>9.2f}s ({baseline[model_name] / duration:>4.1f}x)'
+            print(f'{model_name:<20}{cells}')
+
+        totals = ''.join(
+            f'{total:>9.2f}s ({baseline_total / total:>4.1f}x)'
+            for _, total in timings.values()
+        )
+        print(f'{"wall clock":<20}{totals}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from core.config import Settings
+
+# Responses of an overloaded or restarting API, worth retrying.
+RETRY_STATUSES = (502, 503, 504)
+
+# Methods safe to send again after the API may have received them.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+
+# Errors raised before the request left the bot, safe to retry for any method.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ApiUnavailable(Exception):
+    """
+    The API did not answer, or the circuit breaker stopped calling it.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing service for a while instead of piling up requests.
+
+    After ``threshold`` failures in a row the circuit opens and calls fail
+    immediately. Once ``reset_timeout`` seconds have passed a single trial
+    call is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """
+        Whether a call may be made now.
+        """
+
+        if not self.open:
+            return True
+
+        if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+
+        self.trial = True
+
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self.trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.trial = False
+
+
+class ApiClient:
+    """
+    Client of the AutoML API shared by every chat of the bot.
+
+    One ``httpx.AsyncClient`` keeps a bounded pool of keep-alive connections
+    to the API. Failed requests are retried with exponential backoff and
+    jitter, and a circuit breaker fails fast while the API keeps failing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        retries: int = 3,
+        backoff: float = 0.5,
+        breaker: CircuitBreaker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.client = httpx.AsyncClient(
+            base_url=base_url, timeout=timeout, limits=limits, transport=transport
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(threshold=5, reset_timeout=30)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'ApiClient':
+        """
+        Build the client from the ``API_*`` settings.
+        """
+
+        return cls(
+            settings.API_URL,
+            timeout=httpx.Timeout(
+                settings.API_TIMEOUT_S, connect=settings.API_CONNECT_TIMEOUT_S
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.API_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            retries=settings.API_RETRIES,
+            backoff=settings.API_BACKOFF_S,
+            breaker=CircuitBreaker(
+                settings.API_BREAKER_THRESHOLD, settings.API_BREAKER_RESET_S
+            ),
+        )
+
+    async def __aenter__(self) -> 'ApiClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def delay(self, attempt: int) -> float:
+        """
+        Seconds to wait before a retry, doubling with each attempt.
+        """
+
+        return self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+
+    async def request(
+        self, method: str, url: str, retries: int | None = None, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request to the API, retrying failures that are safe to retry.
+
+        Parameters:
+            method (str): HTTP method.
+            url (str): Path relative to the API URL.
+            retries (int | None): Retries allowed, ``None`` uses the client default.
+                Requests with a streamed body cannot be sent again and pass 0.
+            **kwargs: Passed to ``httpx.AsyncClient.request``.
+
+        Returns:
+            httpx.Response: The last response, possibly an error status.
+        """
+
+        retries = self.retries if retries is None else retries
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                raise ApiUnavailable('The API is failing, calls are paused')
+
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                self.breaker.record_failure()
+
+                if attempt >= retries or not (
+                    idempotent or isinstance(exc, NOT_SENT_ERRORS)
+                ):
+                    raise ApiUnavailable(f'{method} {url} failed: {exc}') from exc
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+
+                    return response
+
+                self.breaker.record_failure()
+
+                if attempt >= retries or not idempotent:
+                    return response
+
+            await asyncio.sleep(self.delay(attempt))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('PUT', url, **kwargs)
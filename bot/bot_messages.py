@@ -54,6 +54,11 @@ Best model: {model_name}
 
 """
 
+API_UNAVAILABLE = """⚠️ The service is busy right now.
+
+Please try again in a minute.
+"""
+
 USER_PROFILE = """
 👤 Your profile
 
@@ -61,3 +66,12 @@ USER_PROFILE = """
 👤 Username: {username}
 📅 Joined: {created_at}
 """
+
+USER_STATS = """
+📊 Your stats
+
+🔁 Predictions: {runs}
+🏆 Best F1 (classification): {best_classification_metric}
+📉 Best MAE (regression): {best_regression_metric}
+❤️ Favourite model: {favourite_model}
+"""
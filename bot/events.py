@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import redis.asyncio as redis
+
+from core.celery_app import REDIS_URL
+from core.training_events import TRAINING_EVENTS_CHANNEL, parse_training_event
+
+# Seconds a chat waits for its event before reading the task state once, in
+# case the event was published while the bot was not listening.
+RECONCILE_INTERVAL_S = 60.0
+
+# Seconds before listening again after the connection to Redis dropped.
+RECONNECT_DELAY_S = 1.0
+
+TERMINAL_STATES = ('SUCCESS', 'FAILURE', 'REVOKED')
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingEvents:
+    """
+    Single subscription to the training events channel, shared by all chats.
+
+    ``run`` listens for the end of training jobs and resolves the futures of
+    the chats waiting on them, so a waiting chat costs nothing until its job
+    ends instead of polling the API.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        channel: str = TRAINING_EVENTS_CHANNEL,
+        reconcile_interval: float = RECONCILE_INTERVAL_S,
+    ):
+        self.client = client
+        self.channel = channel
+        self.reconcile_interval = reconcile_interval
+        self.waiters: dict[str, list[asyncio.Future]] = {}
+
+    def dispatch(self, event: dict) -> None:
+        """
+        Hand an event to every chat waiting on its task.
+
+        Parameters:
+            event (dict): Event from ``core.training_events.training_event``.
+        """
+
+        for future in self.waiters.pop(event['task_id'], []):
+            if not future.done():
+                future.set_result(event)
+
+    async def run(self) -> None:
+        """
+        Listen to the events channel until cancelled.
+
+        A message that cannot be handled is logged and skipped; on a Redis
+        error the listener subscribes again after ``RECONNECT_DELAY_S``.
+        """
+
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+
+                    async for message in pubsub.listen():
+                        if message['type'] != 'message':
+                            continue
+
+                        try:
+                            self.dispatch(parse_training_event(message['data']))
+                        except Exception:
+                            logger.exception(
+                                'Skipping training event %r', message['data']
+                            )
+            except redis.RedisError as exc:
+                logger.warning('Training events listener disconnected: %s', exc)
+                await asyncio.sleep(RECONNECT_DELAY_S)
+
+    async def wait(
+        self, task_id: str, read_state: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """
+        Wait for the end of a training job.
+
+        The task state is read once after subscribing, since the job may have
+        ended before, and again after every ``reconcile_interval`` without an
+        event.
+
+        Parameters:
+            task_id (str): ID of the training task.
+            read_state (Callable[[], Awaitable[dict]]): Reads the task state and
+                info from the API.
+
+        Returns:
+            dict: The event, or the task status in the same format.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(task_id, []).append(future)
+
+        try:
+            while True:
+                status = await read_state()
+
+                if status['state'] in TERMINAL_STATES:
+                    return {'task_id': task_id, **status}
+
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.shield(future), self.reconcile_interval
+                    )
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            waiters = self.waiters.get(task_id, [])
+
+            if future in waiters:
+                waiters.remove(future)
+
+            if not waiters:
+                self.waiters.pop(task_id, None)
+
+
+training_events = TrainingEvents(redis.Redis.from_url(REDIS_URL))
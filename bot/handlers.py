@@ -1,24 +1,34 @@
-import os
-
-import httpx
-import pandas as pd
 from aiogram import F, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, ExceptionTypeFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import Message
+from aiogram.types import CallbackQuery, ErrorEvent, Message
 
 import bot.bot_messages
 import bot.keyboards
 from api.db.crud import users
-from api.db.crud.predictions import get_user_prediction
-from api.db.db_config import SessionLocal
-from bot.utils import (generate_dataset_hash, poll_training_status,
-                       save_dataset_as_csv)
-from core.config import settings
+from api.db.crud.predictions import get_user_predictions_page_async
+from api.db.crud.stats import get_user_stats_async
+from api.db.db_config import AsyncSessionLocal
+from bot.api_client import ApiClient, ApiUnavailable
+from bot.utils import (
+    dataset_exists,
+    receive_dataset,
+    send_training_result,
+    wait_for_training,
+)
 
 router = Router()
 
+# Uploads remembered per user by Telegram file_unique_id, so a file sent again
+# is not downloaded again.
+MAX_REMEMBERED_UPLOADS = 20
+
+# Predictions shown per page of /my_history.
+HISTORY_PAGE_SIZE = 5
+
+NOT_AVAILABLE = '—'
+
 
 class MakingPrediction(StatesGroup):
     """
@@ -43,13 +53,13 @@ async def start(message: Message) -> None:
         None
     """
 
-    db = SessionLocal()
-    try:
-        users.get_or_create_user(
-            db=db, tg_id=message.from_user.id, username=message.from_user.username
+    # Telegram usernames are optional; fall back to the display name.
+    username = message.from_user.username or message.from_user.full_name
+
+    async with AsyncSessionLocal() as db:
+        await users.get_or_create_user_async(
+            db=db, tg_id=message.from_user.id, username=username
         )
-    finally:
-        db.close()
 
     await message.answer(
         bot.bot_messages.WELCOME_MESSAGE, reply_markup=bot.keyboards.main_menu
@@ -75,39 +85,52 @@ async def make_prediction_first_stage(message: Message, state: FSMContext) -> No
 
 
 @router.message(MakingPrediction.csv_dataset_id)
-async def dataset_uploading(message: Message, state: FSMContext) -> None:
+async def dataset_uploading(
+    message: Message, state: FSMContext, api: ApiClient
+) -> None:
     """
     Handle dataset uploading.
 
     Parameters:
         message (Message): Incoming message.
         state (FSMContext): FSM context.
+        api (ApiClient): Shared API client.
 
     Returns:
         None
     """
 
-    # Check if the uploaded file is a CSV
-    if message.document.mime_type == 'text/csv':
-        file_id = message.document.file_id
-        file = await message.bot.get_file(file_id)
-        file_content = await message.bot.download_file(file.file_path)
+    document = message.document
 
-        df = pd.read_csv(file_content)
+    # Check if the uploaded file is a CSV
+    if document is None or document.mime_type != 'text/csv':
+        await message.answer('You dataset is not CSV.')
+        return
 
-        rows_count, columns_count = df.shape
+    data = await state.get_data()
+    uploads = data.get('uploads', {})
+    dataset = uploads.pop(document.file_unique_id, None)
 
-        await message.answer(
-            bot.bot_messages.TASK_TYPE_SETTINGS.format(
-                rows=rows_count, columns=columns_count
-            ),
-            reply_markup=bot.keyboards.task_types_markup,
+    # The store may have evicted a file sent long ago.
+    if dataset is None or not await dataset_exists(api, dataset['dataset_hash']):
+        dataset = await receive_dataset(
+            message.bot, api, document, message.from_user.id
         )
 
-        await state.update_data(csv_dataset_id=file_id)
-        await state.set_state(MakingPrediction.task_type)
-    else:
-        await message.answer('You dataset is not CSV.')
+    uploads[document.file_unique_id] = dataset
+
+    while len(uploads) > MAX_REMEMBERED_UPLOADS:
+        uploads.pop(next(iter(uploads)))
+
+    await message.answer(
+        bot.bot_messages.TASK_TYPE_SETTINGS.format(
+            rows=dataset['rows'], columns=len(dataset['columns'])
+        ),
+        reply_markup=bot.keyboards.task_types_markup,
+    )
+
+    await state.update_data(uploads=uploads, csv_dataset_id=dataset)
+    await state.set_state(MakingPrediction.task_type)
 
 
 @router.message(MakingPrediction.task_type)
@@ -129,58 +152,69 @@ async def setting_task_type(message: Message, state: FSMContext) -> None:
 
 
 @router.message(MakingPrediction.target)
-async def target_setting(message: Message, state: FSMContext) -> None:
+async def target_setting(message: Message, state: FSMContext, api: ApiClient) -> None:
     """
     Set the target column and start training.
 
     Parameters:
         message (Message): Incoming message.
         state (FSMContext): FSM context.
+        api (ApiClient): Shared API client.
 
     Returns:
         None
     """
 
     data = await state.get_data()
-    file_id = data['csv_dataset_id']
-
-    file = await message.bot.get_file(file_id)
-    file_content = await message.bot.download_file(file.file_path)
-
-    df = pd.read_csv(file_content)
+    dataset = data['csv_dataset_id']
+    dataset_hash = dataset['dataset_hash']
 
     task_type = data['task_type'].lower()
 
-    if message.text not in df.columns:
+    if message.text not in dataset['columns']:
         await message.answer(bot.bot_messages.TARGET_NOT_FOUND)
         return
 
-    file_path = save_dataset_as_csv(df, message.from_user.id, file_id)
-    absolute_path = os.path.abspath(file_path)
-    dataset_hash = generate_dataset_hash(absolute_path)
-
     target = message.text
 
     await message.answer(bot.bot_messages.TRAINING_STARTED)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f'{settings.API_URL}/v2/{task_type}/train/',
-            json={
-                'df_path': absolute_path,
-                'target': target,
-            },
-        )
+    response = await api.post(
+        f'/v2/{task_type}/train/',
+        json={'target': target, 'dataset_hash': dataset_hash},
+    )
+    response.raise_for_status()
 
-    task_id = response.json()['task_id']
+    payload = response.json()
+    task_id = payload['task_id']
     await message.answer(f'🆔 Task ID: `{task_id}`')
 
-    await poll_training_status(message, task_id, task_type, target, dataset_hash)
+    if payload['status'] == 'cached':
+        await send_training_result(
+            message, payload['info'], task_type, target, dataset_hash
+        )
+    else:
+        await wait_for_training(message, api, task_id, task_type, target, dataset_hash)
+
+    # Keep the remembered uploads for the next prediction.
+    await state.set_state(None)
+    await state.set_data({'uploads': data.get('uploads', {})})
 
-    if os.path.exists(absolute_path):
-        os.remove(absolute_path)
 
-    await state.clear()
+@router.errors(ExceptionTypeFilter(ApiUnavailable))
+async def api_unavailable(event: ErrorEvent) -> None:
+    """
+    Tell the user the API is unreachable instead of failing silently.
+
+    Parameters:
+        event (ErrorEvent): The failed update and its exception.
+
+    Returns:
+        None
+    """
+
+    if event.update.message is not None:
+        await event.update.message.answer(bot.bot_messages.API_UNAVAILABLE)
 
 
 @router.message(Command('me'))
@@ -193,7 +227,8 @@ async def get_my_profile(message: Message):
         None
     """
 
-    user = users.get_user_profile(tg_id=message.from_user.id)
+    async with AsyncSessionLocal() as db:
+        user = await users.get_user_profile_async(db=db, tg_id=message.from_user.id)
 
     if not user:
         return await message.answer('❌ User not found. First execute /start')
@@ -207,27 +242,126 @@ async def get_my_profile(message: Message):
     )
 
 
-@router.message(Command('my_history'))
-async def my_predictions_history(message: Message):
-    with SessionLocal() as db:
-        predictions = get_user_prediction(
-            db=db,
-            user_telegram_id=message.from_user.id,
-        )
+def format_history(predictions: list) -> str:
+    """
+    Format a page of the prediction history.
 
-    if not predictions:
-        return await message.answer("You haven't made any predictions yet")
+    Parameters:
+        predictions (list): Predictions of the page, newest first.
+
+    Returns:
+        str: Message text.
+    """
 
     text = '📊 Your prediction history:\n\n'
 
-    for i, p in enumerate(predictions, 1):
+    for p in predictions:
         metric_name = 'MAE' if p.task_type == 'Regression' else 'F1'
         text += (
-            f'{i}️⃣ {p.created_at:%Y-%m-%d}\n'
+            f'🗓 {p.created_at:%Y-%m-%d}\n'
             f'🎯 Target: {p.target}\n'
             f'🤖 Model: {p.best_model}\n'
             f'🧠 Task type: {p.task_type.name.capitalize()}\n'
             f'📈 Metric ({metric_name}): {p.metric}\n\n'
         )
 
-    await message.answer(text)
\ No newline at end of file
+    return text
+
+
+@router.message(Command('my_history'))
+async def my_predictions_history(message: Message):
+    """
+    Show the latest predictions, with a button loading older ones.
+
+    Parameters:
+        message (Message): Incoming message.
+
+    Returns:
+        None
+    """
+
+    async with AsyncSessionLocal() as db:
+        predictions, cursor = await get_user_predictions_page_async(
+            db=db,
+            user_telegram_id=message.from_user.id,
+            limit=HISTORY_PAGE_SIZE,
+        )
+
+    if not predictions:
+        return await message.answer("You haven't made any predictions yet")
+
+    await message.answer(
+        format_history(predictions), reply_markup=bot.keyboards.history_markup(cursor)
+    )
+
+
+@router.callback_query(F.data.startswith(bot.keyboards.HISTORY_CALLBACK_PREFIX))
+async def older_predictions_history(callback: CallbackQuery):
+    """
+    Replace a history page with the next, older one.
+
+    Parameters:
+        callback (CallbackQuery): Press of the history button.
+
+    Returns:
+        None
+    """
+
+    cursor = callback.data.removeprefix(bot.keyboards.HISTORY_CALLBACK_PREFIX)
+
+    async with AsyncSessionLocal() as db:
+        predictions, cursor = await get_user_predictions_page_async(
+            db=db,
+            user_telegram_id=callback.from_user.id,
+            limit=HISTORY_PAGE_SIZE,
+            cursor=cursor,
+        )
+
+    await callback.answer()
+
+    if predictions:
+        await callback.message.edit_text(
+            format_history(predictions),
+            reply_markup=bot.keyboards.history_markup(cursor),
+        )
+
+
+@router.message(Command('stats'))
+@router.message(F.text == 'View my stats')
+async def my_stats(message: Message):
+    """
+    Show the summary of the user's predictions.
+
+    Parameters:
+        message (Message): Incoming message.
+
+    Returns:
+        None
+    """
+
+    async with AsyncSessionLocal() as db:
+        stats = await get_user_stats_async(db=db, user_telegram_id=message.from_user.id)
+
+    if stats is None:
+        return await message.answer("You haven't made any predictions yet")
+
+    await message.answer(
+        bot.bot_messages.USER_STATS.format(
+            runs=stats.runs,
+            best_classification_metric=(
+                NOT_AVAILABLE
+                if stats.best_classification_metric is None
+                else stats.best_classification_metric
+            ),
+            best_regression_metric=(
+                NOT_AVAILABLE
+                if stats.best_regression_metric is None
+                else stats.best_regression_metric
+            ),
+            favourite_model=(
+                NOT_AVAILABLE
+                if stats.favourite_model is None
+                else stats.favourite_model
+            ),
+        )
+    )
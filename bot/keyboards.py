@@ -1,4 +1,12 @@
-from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
+from aiogram.types import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    KeyboardButton,
+    ReplyKeyboardMarkup,
+)
+
+# Prefix of the callback data asking for an older page of the history.
+HISTORY_CALLBACK_PREFIX = 'history:'
 
 # Define the main menu keyboard
 main_menu = ReplyKeyboardMarkup(
@@ -17,3 +25,22 @@ task_types_markup = ReplyKeyboardMarkup(
     ],
     resize_keyboard=True,
 )
+
+
+def history_markup(cursor: str | None) -> InlineKeyboardMarkup | None:
+    """
+    Build the button loading the next page of the prediction history, if any.
+    """
+
+    if cursor is None:
+        return None
+
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text='Older ▶️', callback_data=f'{HISTORY_CALLBACK_PREFIX}{cursor}'
+                )
+            ]
+        ]
+    )
@@ -1,17 +1,71 @@
 import asyncio
 
 from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
+from api.db.db_config import async_engine
+from bot.api_client import ApiClient
+from bot.events import training_events
 from bot.handlers import router
+from bot.storage import build_storage
 from core.config import settings
 
 bot = Bot(token=settings.BOT_TOKEN)
-dp = Dispatcher()
+dp = Dispatcher(storage=build_storage(settings))
+
+
+async def run_polling():
+    await bot.delete_webhook()
+    await dp.start_polling(bot)
+
+
+async def run_webhook():
+    """
+    Serve updates pushed by Telegram until cancelled.
+
+    Every replica registers the same webhook URL, so the load balancer in
+    front of them spreads the updates. Updates are handled in the background
+    and acknowledged right away.
+    """
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=settings.WEBHOOK_SECRET
+    ).register(app, path=settings.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    try:
+        await web.TCPSite(runner, settings.WEBHOOK_HOST, settings.WEBHOOK_PORT).start()
+        await bot.set_webhook(
+            f'{settings.WEBHOOK_URL}{settings.WEBHOOK_PATH}',
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
 
 
 async def main():
     dp.include_router(router)
-    await dp.start_polling(bot)
+    listener = asyncio.create_task(training_events.run())
+
+    # Handlers receive the client through their ``api`` argument.
+    async with ApiClient.from_settings(settings) as api:
+        dp['api'] = api
+
+        try:
+            if settings.BOT_MODE == 'webhook':
+                await run_webhook()
+            else:
+                await run_polling()
+        finally:
+            listener.cancel()
+            await async_engine.dispose()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,32 @@
+import redis.asyncio as redis
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+
+from core.celery_app import REDIS_URL
+from core.config import Settings
+
+
+def build_storage(settings: Settings, client: redis.Redis | None = None) -> BaseStorage:
+    """
+    Build the FSM storage conversations are kept in.
+
+    The Redis storage survives restarts and is shared by every replica of the
+    bot; the memory storage only suits a single polling process.
+
+    Parameters:
+        settings (Settings): The bot settings.
+        client (redis.Redis | None): Redis client, ``None`` connects to ``REDIS_URL``.
+
+    Returns:
+        BaseStorage: The storage for the dispatcher.
+    """
+
+    if settings.FSM_STORAGE == 'memory':
+        return MemoryStorage()
+
+    return RedisStorage(
+        client or redis.Redis.from_url(REDIS_URL),
+        state_ttl=settings.FSM_STATE_TTL_S,
+        data_ttl=settings.FSM_STATE_TTL_S,
+    )
@@ -1,65 +1,234 @@
-import asyncio
+import csv
 import hashlib
 from pathlib import Path
 
-import httpx
-import pandas as pd
-from aiogram.types import Message
+import aiofiles
+from aiogram import Bot
+from aiogram.types import Document, Message
 
 import bot.bot_messages
-from api.db.crud.predictions import create_new_prediction
-from api.db.db_config import SessionLocal
+from api.db.crud.predictions import create_new_prediction_async
+from api.db.db_config import AsyncSessionLocal
 from api.db.schemas import TaskType
-from core.config import settings
+from bot.api_client import ApiClient
+from bot.events import training_events
 
 DATASET_STORAGE_DIR = Path('storage/datasets')
 
+# Bytes read at most while looking for the end of the header line.
+MAX_HEADER_BYTES = 1024 * 1024
 
-def save_dataset_as_csv(df: pd.DataFrame, user_id: str, dataset_id: str) -> str:
+
+class DatasetProfile:
     """
-    Save the dataset as a CSV file.
+    Binary sink that writes a download to disk while hashing and profiling it.
+
+    Passed as the destination of ``Bot.download``, it sees every chunk once:
+    the SHA-256 and the line count are updated as the chunks arrive and the
+    header line is kept, so the file never has to be read back.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.hasher = hashlib.sha256()
+        self.head = b''
+        self.lines = 0
+        self.last_byte = b''
+
+    def write(self, chunk: bytes) -> int:
+        self.file.write(chunk)
+        self.hasher.update(chunk)
+        self.lines += chunk.count(b'\n')
+
+        if b'\n' not in self.head and len(self.head) < MAX_HEADER_BYTES:
+            self.head += chunk
+
+        if chunk:
+            self.last_byte = chunk[-1:]
+
+        return len(chunk)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    @property
+    def columns(self) -> list[str]:
+        line = self.head.split(b'\n', 1)[0].decode('utf-8-sig', errors='replace')
+
+        return next(csv.reader([line.rstrip('\r')]), [])
+
+    @property
+    def rows(self) -> int:
+        # Lines after the header, counting a last line without a line break.
+        lines = self.lines + (self.last_byte not in (b'', b'\n'))
+
+        return max(lines - 1, 0)
+
+    def summary(self) -> dict:
+        return {
+            'dataset_hash': self.hasher.hexdigest(),
+            'columns': self.columns,
+            'rows': self.rows,
+        }
 
-    Parameters:
-        df (pd.DataFrame): Dataframe to save.
-        user_id (str): ID of the user.
-        dataset_id (str): ID of the dataset.
 
+async def receive_dataset(
+    bot: Bot, api: ApiClient, document: Document, user_id: int
+) -> dict:
+    """
+    Download a CSV document into the dataset store in a single pass.
+
+    The file is streamed to disk while it is hashed and its header and rows
+    are counted, uploaded to the store and deleted locally.
+    Parameters:
+        bot (Bot): The bot to download the file with.
+        api (ApiClient): The shared API client.
+        document (Document): The uploaded CSV document.
+        user_id (int): ID of the user who sent it.
     Returns:
-        str: Path to the saved CSV file.
+        dict: The dataset hash, column names and row count.
     """
 
     DATASET_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-    file_name = f'{user_id}_{dataset_id}.csv'
-    file_path = DATASET_STORAGE_DIR / file_name
-    df.to_csv(file_path, index=False)
+    file_path = DATASET_STORAGE_DIR / f'{user_id}_{document.file_unique_id}.csv'
+
+    try:
+        with open(file_path, 'wb') as f:
+            profile = DatasetProfile(f)
+            await bot.download(document, destination=profile, seek=False)
+
+        summary = profile.summary()
+        await upload_dataset(api, str(file_path), summary['dataset_hash'])
+    finally:
+        file_path.unlink(missing_ok=True)
+
+    return summary
+
+
+async def iter_file(file_path: str, chunk_size: int = 1024 * 1024):
+    """
+    Read a file in chunks without blocking the event loop.
+    """
+
+    async with aiofiles.open(file_path, 'rb') as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+async def dataset_exists(api: ApiClient, dataset_hash: str) -> bool:
+    """
+    Check whether the dataset store still holds a dataset.
+    Parameters:
+        api (ApiClient): The shared API client.
+        dataset_hash (str): SHA-256 of the dataset file.
+    Returns:
+        bool: Whether the dataset is stored.
+    """
+
+    response = await api.head(f'/v2/datasets/{dataset_hash}')
+
+    return response.status_code == 200
 
-    return str(file_path)
 
+async def upload_dataset(api: ApiClient, file_path: str, dataset_hash: str) -> None:
+    """
+    Upload a dataset to the store the workers fetch it from, unless it is there.
+    Parameters:
+        api (ApiClient): The shared API client.
+        file_path (str): Path to the dataset file.
+        dataset_hash (str): SHA-256 of the file.
+    Returns:
+        None
+    """
+
+    if await dataset_exists(api, dataset_hash):
+        return
+
+    # The streamed body cannot be replayed, so the upload is not retried.
+    response = await api.put(
+        f'/v2/datasets/{dataset_hash}', content=iter_file(file_path), retries=0
+    )
+
+    response.raise_for_status()
+
+
+async def send_training_result(
+    message: Message, result: dict, task_type: TaskType, target: str, dataset_hash: str
+) -> None:
+    """
+    Send the best model of a finished training to the user and record the prediction
+    with the results of every model.
+    Parameters:
+        message (Message): The message object to send updates to the user.
+        result (dict): The training task result.
+        task_type (str): The type of the task (e.g., 'Regression', 'Classification').
+        target (str): The target variable for the prediction.
+        dataset_hash (str): The hash of the dataset used.
+    Returns:
+        None
+    """
 
-def generate_dataset_hash(csv_path: str) -> str:
+    best = result['best_model']
+    metric = 'MAE' if task_type == TaskType.regression else TaskType.classification
+
+    await message.answer(
+        bot.bot_messages.TRAINING_COMPLETED.format(
+            model_name=best['model_name'],
+            metric=metric,
+            best_score=best['best_score'],
+            predictions=best['predictions_preview'][:5],
+            params=best['params'],
+        )
+    )
+
+    async with AsyncSessionLocal() as db:
+        await create_new_prediction_async(
+            db=db,
+            user_telegram_id=message.from_user.id,
+            task_type=task_type,
+            best_model=best['model_name'],
+            target=target,
+            metric=float(best['best_score']),
+            dataset_hash=dataset_hash,
+            model_id=best.get('model_id'),
+            model_runs=result['all_results'],
+        )
+
+
+async def read_task_status(api: ApiClient, task_id: str, task_type: TaskType) -> dict:
     """
-    Generate a SHA-256 hash of the dataset file.
+    Read the state and info of a training task from the API.
     Parameters:
-        csv_path (str): Path to the CSV file.
+        api (ApiClient): The shared API client.
+        task_id (str): The ID of the training task.
+        task_type (str): The type of the task (e.g., 'Regression', 'Classification').
     Returns:
-        str: SHA-256 hash of the file.
+        dict: The state and info of the task.
     """
 
-    hasher = hashlib.sha256()
-    with open(csv_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            hasher.update(chunk)
+    response = await api.get(f'/v2/{task_type}/tasks/{task_id}')
+
+    response.raise_for_status()
 
-    return hasher.hexdigest()
+    return response.json()
 
 
-async def poll_training_status(
-    message: Message, task_id: str, task_type: TaskType, target: str, dataset_hash: str
+async def wait_for_training(
+    message: Message,
+    api: ApiClient,
+    task_id: str,
+    task_type: TaskType,
+    target: str,
+    dataset_hash: str,
 ) -> None:
     """
-    Poll the training status of a task and notify the user upon completion.
+    Wait for the end of a training task and notify the user.
+
+    The end of the task is pushed by the training events dispatcher, so the
+    API is only read when the wait starts and once in a long while after.
     Parameters:
         message (Message): The message object to send updates to the user.
+        api (ApiClient): The shared API client.
         task_id (str): The ID of the training task.
         task_type (str): The type of the task (e.g., 'Regression', 'Classification').
         target (str): The target variable for the prediction.
@@ -68,51 +237,15 @@ async def poll_training_status(
         None
     """
 
-    async with httpx.AsyncClient() as client:
-        sent_progress = False
-
-        metric = 'MAE' if task_type == TaskType.regression else TaskType.classification
-
-        while True:
-            await asyncio.sleep(5)
-
-            response = await client.get(
-                f'{settings.API_URL}/v2/{task_type}/tasks/{task_id}'
-            )
-
-            data = response.json()
-
-            if data['state'] == 'PROGRESS':
-                if not sent_progress:
-                    sent_progress = True
-                    await message.answer('⏳ Training models...')
-
-            elif data['state'] == 'SUCCESS':
-                result = data['info']
-                best = result['best_model']
-
-                await message.answer(
-                    bot.bot_messages.TRAINING_COMPLETED.format(
-                        model_name=best['model_name'],
-                        metric=metric,
-                        best_score=best['best_score'],
-                        predictions=best['predictions'][:5],
-                        params=best['params'],
-                    )
-                )
-
-                with SessionLocal() as db:
-                    create_new_prediction(
-                        db=db,
-                        user_telegram_id=message.from_user.id,
-                        task_type=task_type,
-                        best_model=best['model_name'],
-                        target=target,
-                        metric=float(best['best_score']),
-                        dataset_hash=dataset_hash,
-                    )
-                break
-
-            elif data['state'] == 'FAILURE':
-                await message.answer('❌ Training failed')
-                break
+    await message.answer('⏳ Training models...')
+
+    event = await training_events.wait(
+        task_id, lambda: read_task_status(api, task_id, task_type)
+    )
+
+    if event['state'] == 'SUCCESS':
+        await send_training_result(
+            message, event['info'], task_type, target, dataset_hash
+        )
+    else:
+        await message.answer('❌ Training failed')
@@ -2,8 +2,12 @@ import os
 
 from celery import Celery
 
+from core.serialization import register_orjson
+
 REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379/0')
 
+register_orjson()
+
 celery_app = Celery(
     'automl',
     broker=REDIS_URL,
@@ -11,6 +15,7 @@ celery_app = Celery(
     include=[
         'ml.src.tasks.regression',
         'ml.src.tasks.classification',
+        'ml.src.tasks.training',
     ],
 )
 
@@ -18,7 +23,9 @@ celery_app.conf.update(
     task_track_started=True,
     result_expires=3600,
     result_backend='redis://redis:6379/1',
-    task_serializer='json',
-    result_serializer='json',
-    accept_content=['json'],
+    task_serializer='orjson',
+    result_serializer='orjson',
+    # JSON is still accepted for messages and results written before the switch.
+    accept_content=['orjson', 'json'],
+    result_accept_content=['orjson', 'json'],
 )
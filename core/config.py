@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +8,28 @@ class Settings(BaseSettings):
     BOT_TOKEN: str
     API_URL: str
 
+    # 'webhook' serves updates over HTTP, so several replicas can share them
+    # behind a load balancer; they then need the 'redis' FSM storage.
+    BOT_MODE: Literal['polling', 'webhook'] = 'polling'
+    WEBHOOK_URL: str | None = None
+    WEBHOOK_PATH: str = '/webhook'
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = '0.0.0.0'
+    WEBHOOK_PORT: int = 8080
+
+    FSM_STORAGE: Literal['memory', 'redis'] = 'memory'
+    FSM_STATE_TTL_S: int = 7 * 24 * 3600
+
+    # Client the bot calls the API with.
+    API_TIMEOUT_S: float = 30.0
+    API_CONNECT_TIMEOUT_S: float = 5.0
+    API_MAX_CONNECTIONS: int = 100
+    API_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    API_RETRIES: int = 3
+    API_BACKOFF_S: float = 0.5
+    API_BREAKER_THRESHOLD: int = 5
+    API_BREAKER_RESET_S: float = 30.0
+
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
@@ -12,7 +37,26 @@ class Settings(BaseSettings):
     DB_PORT: str
     DATABASE_URL: str
 
+    # Async engine used by the bot and the API routes.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 10.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_CONNECT_TIMEOUT_S: float = 10.0
+    DB_COMMAND_TIMEOUT_S: float = 30.0
+
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
+    @model_validator(mode='after')
+    def check_webhook_mode(self):
+        if self.BOT_MODE == 'webhook':
+            if not self.WEBHOOK_URL:
+                raise ValueError('BOT_MODE=webhook requires WEBHOOK_URL')
+
+            if self.FSM_STORAGE != 'redis':
+                raise ValueError('BOT_MODE=webhook requires FSM_STORAGE=redis')
+
+        return self
+
 
 settings = Settings()
@@ -0,0 +1,289 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable
+
+import httpx
+
+DATASET_STORE_DIR = Path(os.getenv('DATASET_STORE_DIR', 'storage/datasets/store'))
+DATASET_STORE_MAX_MB = int(os.getenv('DATASET_STORE_MAX_MB', 10_240))
+
+DATASET_CACHE_DIR = Path(os.getenv('DATASET_CACHE_DIR', 'storage/datasets/cache'))
+DATASET_CACHE_MAX_MB = int(os.getenv('DATASET_CACHE_MAX_MB', 4_096))
+
+# Where workers download the datasets they do not have cached yet.
+DATASET_STORE_URL = os.getenv('DATASET_STORE_URL', 'http://api:8000/v2/datasets')
+
+DIGEST_PATTERN = re.compile(r'[0-9a-f]{64}')
+CHUNK_BYTES = 1024 * 1024
+
+# Stored files keep the suffix the dataset loader dispatches on; anything that
+# does not start with the Arrow magic bytes is stored as CSV.
+FEATHER_MAGIC = b'ARROW1'
+DATASET_SUFFIXES = ('.feather', '.csv')
+
+# Suffix of the columnar copy converted from a stored CSV, kept next to it.
+COLUMNAR_SUFFIX = '.arrow'
+
+
+class DatasetStore:
+    """
+    CSV and Feather datasets stored once per SHA-256 of their content.
+
+    Reading a dataset refreshes its access time, and once the files exceed
+    ``max_bytes`` the least recently used ones are deleted. A CSV dataset may
+    have a columnar copy next to it, which counts towards ``max_bytes`` and is
+    deleted with it. Files are written to a temporary name and renamed into
+    place, so several processes can share the directory.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def path(self, digest: str, suffix: str) -> Path:
+        """
+        Return the file of a dataset.
+
+        Parameters:
+            digest (str): SHA-256 of the dataset file.
+            suffix (str): One of ``DATASET_SUFFIXES``.
+
+        Returns:
+            Path: Path to the file, whether it exists or not.
+        """
+
+        if not DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f'Invalid dataset hash: {digest}')
+
+        return self.root / f'{digest}{suffix}'
+
+    def get(self, digest: str) -> Path | None:
+        """
+        Return the file of a stored dataset and mark it as recently used.
+
+        Parameters:
+            digest (str): SHA-256 of the dataset file.
+
+        Returns:
+            Path | None: Path to the file, ``None`` if it is not stored.
+        """
+
+        for suffix in DATASET_SUFFIXES:
+            path = self.path(digest, suffix)
+
+            try:
+                os.utime(path, (time.time(), path.stat().st_mtime))
+            except FileNotFoundError:
+                continue
+
+            return path
+
+        return None
+
+    def columnar_path(self, digest: str) -> Path:
+        """
+        Return the columnar copy of a stored CSV dataset, whether it exists or not.
+        """
+
+        return self.path(digest, COLUMNAR_SUFFIX)
+
+    def temp_path(self) -> Path:
+        """
+        Create an empty temporary file in the store, to be passed to ``add``.
+        """
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        os.close(fd)
+
+        return Path(name)
+
+    def add(self, tmp_path: str | Path, digest: str | None = None) -> tuple[str, bool]:
+        """
+        Move a downloaded or uploaded file into the store under its SHA-256.
+
+        The temporary file is consumed either way. A dataset that is already
+        stored is kept and the new copy dropped.
+
+        Parameters:
+            tmp_path (str | Path): File created by ``temp_path``.
+            digest (str | None): Expected SHA-256, checked against the content.
+
+        Returns:
+            tuple[str, bool]: SHA-256 of the dataset and whether it was new.
+        """
+
+        tmp_path = Path(tmp_path)
+
+        try:
+            hasher = hashlib.sha256()
+
+            with open(tmp_path, 'rb') as f:
+                head = f.read(len(FEATHER_MAGIC))
+                hasher.update(head)
+
+                for chunk in iter(lambda: f.read(CHUNK_BYTES), b''):
+                    hasher.update(chunk)
+
+            actual = hasher.hexdigest()
+
+            if digest is not None and actual != digest:
+                raise ValueError(f'Dataset hash {actual} does not match {digest}')
+
+            if self.get(actual) is not None:
+                return actual, False
+
+            suffix = '.feather' if head == FEATHER_MAGIC else '.csv'
+            tmp_path.replace(self.path(actual, suffix))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self.evict(keep=actual)
+
+        return actual, True
+
+    def write(self, chunks: Iterable[bytes], digest: str | None = None) -> str:
+        """
+        Store a dataset from chunks of bytes.
+
+        Parameters:
+            chunks (Iterable[bytes]): Content of the dataset file.
+            digest (str | None): Expected SHA-256, checked against the content.
+
+        Returns:
+            str: SHA-256 of the dataset.
+        """
+
+        tmp_path = self.temp_path()
+
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+        return self.add(tmp_path, digest)[0]
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Delete the least recently used datasets until the store fits ``max_bytes``.
+
+        Parameters:
+            keep (str | None): SHA-256 of a dataset never evicted, such as the one
+                just added.
+        """
+
+        datasets = {}
+
+        for path in self.root.iterdir():
+            if path.suffix not in (*DATASET_SUFFIXES, COLUMNAR_SUFFIX):
+                continue
+
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            # A dataset and its columnar copy are used, and evicted, together;
+            # a copy left without its dataset goes first.
+            atime, size, paths = datasets.get(path.stem, (0.0, 0, []))
+
+            if path.suffix != COLUMNAR_SUFFIX:
+                atime = stat.st_atime
+
+            datasets[path.stem] = (atime, size + stat.st_size, [*paths, path])
+
+        total = sum(size for _, size, _ in datasets.values())
+
+        for digest, (_, size, paths) in sorted(
+            datasets.items(), key=lambda item: item[1][0]
+        ):
+            if total <= self.max_bytes:
+                break
+
+            if digest == keep:
+                continue
+
+            for path in paths:
+                path.unlink(missing_ok=True)
+
+            total -= size
+
+
+_store = None
+_cache = None
+
+
+def get_dataset_store() -> DatasetStore:
+    """
+    Return the store the API serves datasets from.
+    """
+
+    global _store
+
+    if _store is None:
+        _store = DatasetStore(DATASET_STORE_DIR, DATASET_STORE_MAX_MB * 2**20)
+
+    return _store
+
+
+def get_dataset_cache() -> DatasetStore:
+    """
+    Return the local copy of the store kept by a worker.
+    """
+
+    global _cache
+
+    if _cache is None:
+        _cache = DatasetStore(DATASET_CACHE_DIR, DATASET_CACHE_MAX_MB * 2**20)
+
+    return _cache
+
+
+def find_store(path: str | Path) -> DatasetStore | None:
+    """
+    Return the store or worker cache a dataset file belongs to.
+
+    Parameters:
+        path (str | Path): Path to a dataset file.
+
+    Returns:
+        DatasetStore | None: The store holding the file, ``None`` for any other file.
+    """
+
+    path = Path(path)
+
+    if not DIGEST_PATTERN.fullmatch(path.stem):
+        return None
+
+    for store in (get_dataset_cache(), get_dataset_store()):
+        if path.parent.resolve() == store.root.resolve():
+            return store
+
+    return None
+
+
+def fetch_dataset(digest: str) -> str:
+    """
+    Return a local path to a stored dataset, downloading it on a cache miss.
+
+    Parameters:
+        digest (str): SHA-256 of the dataset file.
+
+    Returns:
+        str: Path to the dataset file in the worker's cache.
+    """
+
+    cache = get_dataset_cache()
+    path = cache.get(digest)
+
+    if path is not None:
+        return str(path)
+
+    with httpx.stream('GET', f'{DATASET_STORE_URL}/{digest}', timeout=60) as response:
+        response.raise_for_status()
+        cache.write(response.iter_bytes(CHUNK_BYTES), digest)
+
+    return str(cache.get(digest))
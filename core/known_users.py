@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+KNOWN_USERS_MAX_ENTRIES = int(os.getenv('KNOWN_USERS_MAX_ENTRIES', 10_000))
+KNOWN_USERS_TTL_S = float(os.getenv('KNOWN_USERS_TTL_S', 600))
+
+
+class KnownUsers:
+    """
+    Users recently read or written, kept in memory so repeated lookups skip the database.
+
+    Entries expire after ``ttl`` seconds, which bounds how stale a profile
+    changed by another process can be, and beyond ``max_entries`` the least
+    recently used ones are dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = KNOWN_USERS_MAX_ENTRIES,
+        ttl: float = KNOWN_USERS_TTL_S,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, telegram_id: int):
+        """
+        Return the cached user, ``None`` if it is unknown or expired.
+
+        Parameters:
+            telegram_id (int): Telegram ID of the user.
+
+        Returns:
+            User | None: The user as last read from the database.
+        """
+
+        with self._lock:
+            entry = self._users.get(telegram_id)
+
+            if entry is None:
+                return None
+
+            user, expires_at = entry
+
+            if time.monotonic() >= expires_at:
+                del self._users[telegram_id]
+                return None
+
+            self._users.move_to_end(telegram_id)
+
+            return user
+
+    def put(self, user) -> None:
+        """
+        Remember a user read from or written to the database.
+        """
+
+        with self._lock:
+            self._users[user.telegram_id] = (user, time.monotonic() + self.ttl)
+            self._users.move_to_end(user.telegram_id)
+
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+_known_users = None
+
+
+def get_known_users() -> KnownUsers:
+    """
+    Return the process-wide cache of known users.
+    """
+
+    global _known_users
+
+    if _known_users is None:
+        _known_users = KnownUsers()
+
+    return _known_users
@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import OrderedDict
+
+from ml.src.artifacts import artifact_path, load_model
+
+MODEL_CACHE_MAX_MB = int(os.getenv('MODEL_CACHE_MAX_MB', 512))
+
+
+class ModelCache:
+    """
+    Recently used pipelines kept loaded in memory, least recently used first out.
+
+    The size of a pipeline is estimated by the size of its artifact file, and
+    the total stays under ``max_bytes``. A pipeline larger than the whole
+    budget is loaded for the call but not kept.
+    """
+
+    def __init__(self, max_bytes: int = MODEL_CACHE_MAX_MB * 2**20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_id: str):
+        """
+        Return a loaded pipeline, reading it from the artifact store on a miss.
+
+        Parameters:
+            model_id (str): Model identifier.
+
+        Returns:
+            Pipeline: The fitted pipeline.
+        """
+
+        with self._lock:
+            if model_id in self._models:
+                self._models.move_to_end(model_id)
+                return self._models[model_id][0]
+
+        nbytes = artifact_path(model_id).stat().st_size
+        pipeline = load_model(model_id)
+
+        with self._lock:
+            if model_id not in self._models and nbytes <= self.max_bytes:
+                self._models[model_id] = (pipeline, nbytes)
+                self.size += nbytes
+
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self._models.popitem(last=False)
+                    self.size -= evicted
+
+        return pipeline
+
+
+_cache = None
+
+
+def get_model_cache() -> ModelCache:
+    """
+    Return the process-wide model cache.
+    """
+
+    global _cache
+
+    if _cache is None:
+        _cache = ModelCache()
+
+    return _cache
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import time
+
+import redis
+
+from core.celery_app import REDIS_URL
+from ml.src import ENGINE_VERSION
+
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', 7 * 24 * 3600))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', 10_000))
+INFLIGHT_TTL = int(os.getenv('INFLIGHT_TTL', 2 * 3600))
+
+
+class ResultCache:
+    """
+    Training results keyed by dataset hash, target, task type and engine version.
+
+    Results expire after ``ttl`` seconds, and once more than ``max_entries``
+    are stored the oldest ones are evicted. A second, short-lived key per
+    request marks a job that is still running, so identical requests can
+    attach to it instead of enqueuing a duplicate task.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int = RESULT_CACHE_TTL,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        inflight_ttl: int = INFLIGHT_TTL,
+        prefix: str = 'automl',
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.inflight_ttl = inflight_ttl
+        self.prefix = prefix
+
+    @staticmethod
+    def make_key(dataset_hash: str, target: str, task_type: str, **settings) -> str:
+        """
+        Build the cache key for a training request.
+
+        Parameters:
+            dataset_hash (str): SHA-256 of the dataset file.
+            target (str): Target column name.
+            task_type (str): 'classification' or 'regression'.
+            **settings: Any other setting that changes the result (search mode, budget).
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+
+        payload = json.dumps(
+            {
+                'dataset_hash': dataset_hash,
+                'target': target,
+                'task_type': task_type,
+                'engine_version': ENGINE_VERSION,
+                **settings,
+            },
+            sort_keys=True,
+        )
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _result_key(self, key: str) -> str:
+        return f'{self.prefix}:result:{key}'
+
+    def _inflight_key(self, key: str) -> str:
+        return f'{self.prefix}:inflight:{key}'
+
+    @property
+    def _index_key(self) -> str:
+        return f'{self.prefix}:result-index'
+
+    def get(self, key: str) -> dict | None:
+        """
+        Return the cached result for a key, if any.
+        """
+
+        raw = self.client.get(self._result_key(key))
+
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, result: dict) -> None:
+        """
+        Store a result and evict the oldest entries beyond the size limit.
+        """
+
+        now = time.time()
+
+        pipe = self.client.pipeline()
+        pipe.set(self._result_key(key), json.dumps(result), ex=self.ttl)
+        pipe.zadd(self._index_key, {key: now})
+        pipe.zremrangebyscore(self._index_key, '-inf', now - self.ttl)
+        pipe.execute()
+
+        overflow = self.client.zcard(self._index_key) - self.max_entries
+
+        if overflow > 0:
+            evicted = self.client.zpopmin(self._index_key, overflow)
+            self.client.delete(*(self._result_key(k.decode()) for k, _ in evicted))
+
+    def claim(self, key: str, task_id: str) -> str | None:
+        """
+        Mark a request as running under ``task_id``.
+
+        Returns:
+            str | None: ``None`` if the claim succeeded, otherwise the id of
+                the task that already runs this request.
+        """
+
+        if self.client.set(
+            self._inflight_key(key), task_id, nx=True, ex=self.inflight_ttl
+        ):
+            return None
+
+        running = self.client.get(self._inflight_key(key))
+
+        # The other job finished between our SET and GET, so claim again.
+        if running is None:
+            return self.claim(key, task_id)
+
+        return running.decode()
+
+    def forget(self, key: str, task_id: str) -> None:
+        """
+        Drop the running marker only if it still points at ``task_id``.
+        """
+
+        inflight_key = self._inflight_key(key)
+
+        if self.client.get(inflight_key) == task_id.encode():
+            self.client.delete(inflight_key)
+
+    def release(self, key: str) -> None:
+        """
+        Clear the running marker of a request.
+        """
+
+        self.client.delete(self._inflight_key(key))
+
+
+_cache = None
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Return the process-wide result cache backed by the Celery Redis instance.
+    """
+
+    global _cache
+
+    if _cache is None:
+        _cache = ResultCache(redis.Redis.from_url(REDIS_URL))
+
+    return _cache
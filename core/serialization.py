@@ -0,0 +1,26 @@
+import orjson
+from kombu.serialization import register
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_dumps(obj) -> bytes:
+    """
+    Serialize to compact JSON bytes, with native support for numpy arrays and scalars.
+    """
+
+    return orjson.dumps(obj, option=ORJSON_OPTIONS)
+
+
+def register_orjson() -> None:
+    """
+    Register the ``orjson`` serializer for Celery messages and results.
+    """
+
+    register(
+        'orjson',
+        orjson_dumps,
+        orjson.loads,
+        content_type='application/x-orjson',
+        content_encoding='binary',
+    )
@@ -0,0 +1,76 @@
+import logging
+import os
+
+import orjson
+import redis
+
+from core.celery_app import REDIS_URL
+from core.serialization import orjson_dumps
+
+logger = logging.getLogger(__name__)
+
+# Channel every training job publishes its outcome to, once, when it ends.
+TRAINING_EVENTS_CHANNEL = os.getenv('TRAINING_EVENTS_CHANNEL', 'automl:training')
+
+_client = None
+
+
+def get_events_client() -> redis.Redis:
+    """
+    Return the Redis client training events are published with.
+    """
+
+    global _client
+
+    if _client is None:
+        _client = redis.Redis.from_url(REDIS_URL)
+
+    return _client
+
+
+def training_event(task_id: str, state: str, result: dict | None = None) -> dict:
+    """
+    Build the event announcing the end of a training job.
+
+    Parameters:
+        task_id (str): ID of the training task the client enqueued.
+        state (str): 'SUCCESS' or 'FAILURE'.
+        result (dict | None): Task result of a successful job.
+
+    Returns:
+        dict: The event, with the same state and info as the task status endpoint.
+    """
+
+    return {'task_id': task_id, 'state': state, 'info': result}
+
+
+def publish_training_event(
+    task_id: str, state: str, result: dict | None = None
+) -> None:
+    """
+    Announce the end of a training job to the listeners of the events channel.
+
+    Publishing is best effort: the job result stays in the Celery backend, and
+    listeners fall back to reading it there.
+
+    Parameters:
+        task_id (str): ID of the training task the client enqueued.
+        state (str): 'SUCCESS' or 'FAILURE'.
+        result (dict | None): Task result of a successful job.
+    """
+
+    try:
+        get_events_client().publish(
+            TRAINING_EVENTS_CHANNEL,
+            orjson_dumps(training_event(task_id, state, result)),
+        )
+    except redis.RedisError as exc:
+        logger.warning('Could not publish the end of task %s: %s', task_id, exc)
+
+
+def parse_training_event(raw: bytes | str) -> dict:
+    """
+    Decode an event read from the events channel.
+    """
+
+    return orjson.loads(raw)
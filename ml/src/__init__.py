@@ -0,0 +1,3 @@
+# Bump whenever a change to the training engine can change its results,
+# so cached results from older engines are no longer served.
+ENGINE_VERSION = 6
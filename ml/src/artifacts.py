@@ -0,0 +1,221 @@
+import os
+import re
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+ARTIFACT_DIR = Path(os.getenv('ARTIFACT_DIR', 'storage/artifacts'))
+
+MODEL_ID_PATTERN = re.compile(r'[0-9A-Za-z-]+(_[0-9A-Za-z-]+)?')
+
+# Leading predictions kept in the task result; the full array is stored as
+# an artifact and fetched by id.
+PREDICTION_PREVIEW_ROWS = 10
+
+
+def build_pipeline(preprocessor, estimator) -> Pipeline:
+    """
+    Chain a fitted preprocessor and a fitted estimator into one pipeline.
+
+    Parameters:
+        preprocessor: Column transformer fitted on the training split.
+        estimator: Estimator fitted on the preprocessed training split.
+
+    Returns:
+        Pipeline: Pipeline that scores raw feature dataframes.
+    """
+
+    return Pipeline([('preprocessor', preprocessor), ('model', estimator)])
+
+
+def make_model_id(task_id: str, dataset_hash: str | None = None) -> str:
+    """
+    Build the identifier of the model trained by a task.
+
+    Parameters:
+        task_id (str): ID of the training task.
+        dataset_hash (str | None): SHA-256 of the training dataset.
+
+    Returns:
+        str: Model identifier.
+    """
+
+    return task_id if dataset_hash is None else f'{dataset_hash}_{task_id}'
+
+
+def artifact_path(model_id: str) -> Path:
+    """
+    Return the artifact file of a model.
+
+    Parameters:
+        model_id (str): Model identifier.
+
+    Returns:
+        Path: Path to the serialized pipeline.
+    """
+
+    if not MODEL_ID_PATTERN.fullmatch(model_id):
+        raise ValueError(f'Invalid model id: {model_id}')
+
+    return ARTIFACT_DIR / f'{model_id}.joblib'
+
+
+def save_model(
+    pipeline: Pipeline, task_id: str, dataset_hash: str | None = None
+) -> str:
+    """
+    Serialize a fitted pipeline to the artifact store.
+
+    Parameters:
+        pipeline (Pipeline): Fitted pipeline.
+        task_id (str): ID of the training task.
+        dataset_hash (str | None): SHA-256 of the training dataset.
+
+    Returns:
+        str: Identifier of the saved model.
+    """
+
+    model_id = make_model_id(task_id, dataset_hash)
+    path = artifact_path(model_id)
+    tmp_path = Path(f'{path}.tmp')
+
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    joblib.dump(pipeline, tmp_path)
+    tmp_path.replace(path)
+
+    return model_id
+
+
+def load_model(model_id: str) -> Pipeline:
+    """
+    Load a pipeline from the artifact store.
+
+    Parameters:
+        model_id (str): Model identifier.
+
+    Returns:
+        Pipeline: The fitted pipeline.
+    """
+
+    return joblib.load(artifact_path(model_id))
+
+
+def discard_model(model_id: str) -> None:
+    """
+    Delete a model from the artifact store, if it is there.
+
+    Parameters:
+        model_id (str): Model identifier.
+    """
+
+    artifact_path(model_id).unlink(missing_ok=True)
+
+
+def predictions_path(predictions_id: str) -> Path:
+    """
+    Return the artifact file of a prediction array.
+
+    Parameters:
+        predictions_id (str): Prediction array identifier.
+
+    Returns:
+        Path: Path to the ``.npy`` file.
+    """
+
+    if not MODEL_ID_PATTERN.fullmatch(predictions_id):
+        raise ValueError(f'Invalid predictions id: {predictions_id}')
+
+    return ARTIFACT_DIR / 'predictions' / f'{predictions_id}.npy'
+
+
+def scores_path(scores_id: str) -> Path:
+    """
+    Return the artifact file of the predictions of a batch scoring request.
+
+    Parameters:
+        scores_id (str): Scored output identifier.
+
+    Returns:
+        Path: Path to the ``.csv`` file.
+    """
+
+    if not MODEL_ID_PATTERN.fullmatch(scores_id):
+        raise ValueError(f'Invalid scores id: {scores_id}')
+
+    return ARTIFACT_DIR / 'scores' / f'{scores_id}.csv'
+
+
+def save_predictions(predictions, task_id: str, model_name: str) -> str:
+    """
+    Store the test-split predictions of a model as a ``.npy`` file.
+
+    Object arrays, such as string class labels, are stored as unicode so the
+    file can be loaded without pickle.
+
+    Parameters:
+        predictions (array-like): Predictions on the test split.
+        task_id (str): ID of the training task.
+        model_name (str): Name of the model that made the predictions.
+
+    Returns:
+        str: Identifier of the saved predictions.
+    """
+
+    predictions = np.asarray(predictions)
+
+    if predictions.dtype == object:
+        predictions = predictions.astype(str)
+
+    predictions_id = f'{task_id}_{model_name}'
+    path = predictions_path(predictions_id)
+    tmp_path = Path(f'{path}.tmp')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(tmp_path, 'wb') as f:
+        np.save(f, predictions, allow_pickle=False)
+
+    tmp_path.replace(path)
+
+    return predictions_id
+
+
+def load_predictions(predictions_id: str) -> np.ndarray:
+    """
+    Load a prediction array from the artifact store.
+
+    Parameters:
+        predictions_id (str): Prediction array identifier.
+
+    Returns:
+        np.ndarray: The predictions.
+    """
+
+    return np.load(predictions_path(predictions_id), allow_pickle=False)
+
+
+def offload_predictions(result: dict, task_id: str) -> dict:
+    """
+    Replace the predictions of a model result by an artifact id and a preview.
+
+    Parameters:
+        result (dict): Result of ``train_single_model``.
+        task_id (str): ID of the training task.
+
+    Returns:
+        dict: The same result, with ``predictions_id`` and
+            ``predictions_preview`` instead of ``predictions``.
+    """
+
+    predictions = result.pop('predictions')
+
+    result['predictions_id'] = save_predictions(
+        predictions, task_id, result['model_name']
+    )
+    result['predictions_preview'] = np.asarray(predictions)[
+        :PREDICTION_PREVIEW_ROWS
+    ].tolist()
+
+    return result
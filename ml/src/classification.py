@@ -1,174 +1,175 @@
-import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 
-import pandas as pd
 from lightgbm import LGBMClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import RandomizedSearchCV
-from sklearn.pipeline import Pipeline
 from sklearn.tree import DecisionTreeClassifier
 from xgboost import XGBClassifier
 
-from ml.src.data_preprocessing import build_column_transformer, split_dataset
+from ml.src.artifacts import build_pipeline
+from ml.src.search import (
+    MAX_BOOSTING_ROUNDS,
+    FoldCache,
+    best_iteration,
+    native_categorical,
+    progressive_sample_size,
+    run_search,
+)
+
+# Scorer of the searches and of the drift check of incremental updates.
+SCORING = 'f1'
+
+# Whether train/test and CV splits preserve the class proportions.
+STRATIFY = True
+
+GRID_PARAMS = {
+    'LogisticRegression': {
+        'model__penalty': ['l1', 'l2'],
+        'model__C': [0.01, 0.1, 1, 10, 100],
+        'model__solver': ['liblinear', 'saga'],
+    },
+    'RandomForest': {
+        'model__n_estimators': [100, 200],
+        'model__max_depth': [None, 10, 20],
+        'model__min_samples_split': [2, 5],
+    },
+    'XGBoost': {
+        'model__max_depth': [3, 6],
+        'model__learning_rate': [0.01, 0.1],
+    },
+    'DesicionTree': {
+        'model__max_depth': [None, 4, 6, 8],
+        'model__min_samples_split': [2, 5, 10],
+        'model__min_samples_leaf': [1, 2, 4],
+    },
+    'LightGBM': {
+        'model__learning_rate': [0.01, 0.03, 0.05, 0.1],
+        'model__num_leaves': [20, 31, 50, 70, 100],
+        'model__max_depth': [-1, 5, 10, 20, 30],
+        'model__min_child_samples': [5, 10, 20, 50],
+        'model__subsample': [0.6, 0.8, 1.0],
+        'model__colsample_bytree': [0.6, 0.8, 1.0],
+        'model__reg_alpha': [0, 0.01, 0.1, 1],
+        'model__reg_lambda': [0, 0.01, 0.1, 1],
+    },
+}
+
+
+def build_models() -> dict:
+    """
+    Create fresh, unfitted instances of every candidate classification model.
+
+    Returns:
+        dict: Mapping of model name to estimator.
+    """
+
+    return {
+        'LogisticRegression': LogisticRegression(),
+        'DesicionTree': DecisionTreeClassifier(),
+        'RandomForest': RandomForestClassifier(),
+        'XGBoost': XGBClassifier(n_estimators=MAX_BOOSTING_ROUNDS),
+        'LightGBM': LGBMClassifier(
+            n_estimators=MAX_BOOSTING_ROUNDS, force_col_wise=True
+        ),
+    }
 
 
 def train_single_model(
-    model_name,
+    model_name: str,
     model_class,
-    params,
-    X_train,
-    X_test,
-    y_train,
-    y_test,
-    preprocessor,
-):
+    params: dict,
+    cache: FoldCache,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    deadline: float | None = None,
+) -> dict:
     """
-    Train and evaluate classification models.
+    Train and evaluate a classification model.
 
     Parameters:
         model_name (str): Name of the model.
         model_class: The model class to instantiate.
-        params (dict): Hyperparameter grid for RandomizedSearchCV.
-        X_train (pd.DataFrame): Training features.
-        X_test (pd.DataFrame): Testing features.
-        y_train (pd.Series): Training target.
-        y_test (pd.Series): Testing target.
-        preprocessor (ColumnTransformer): Preprocessing pipeline.
+        params (dict): Hyperparameter grid for the search.
+        cache (FoldCache): Preprocessed CV folds and train/test matrices.
+        search_mode (str): 'random' or 'halving'.
+        search_budget (float | None): Compute budget for the halving search.
+        deadline (float | None): ``time.time()`` timestamp after which the search
+            stops starting new configurations.
 
     Returns:
-        dict: Dictionary containing model name, best score, predictions, and best parameters.
+        dict: Dictionary containing model name, best score, predictions, best parameters,
+            boosting rounds kept by early stopping, number of training rows used,
+            training duration in seconds, whether the search was cut short by the
+            deadline and the fitted preprocessing + model pipeline.
     """
 
-    pipeline = Pipeline(
-        [
-            ('preprocessor', preprocessor),
-            ('model', model_class),
-        ]
-    )
+    started = time.perf_counter()
 
-    X_test = pd.DataFrame(X_test, columns=X_train.columns)
-
-    if len(X_train) > 50_000 and model_name in ('XGBoost', 'LightGBM'):
-        idx = X_train.sample(50_000, random_state=42).index
-        X_train = X_train.loc[idx]
-        y_train = y_train.loc[idx]
-
-    grid = RandomizedSearchCV(
-        estimator=pipeline,
-        param_distributions=params,
-        n_iter=4,
-        cv=3,
-        scoring='f1',
-        random_state=42,
-        n_jobs=1,
+    model_class = native_categorical(model_class, cache)
+    boosted = model_name in ('XGBoost', 'LightGBM')
+    max_rows = progressive_sample_size(
+        model_class, cache, scoring=SCORING, deadline=deadline
     )
 
-    grid.fit(X_train, y_train)
-    y_pred = grid.predict(X_test)
+    search = run_search(
+        search_mode,
+        model_class,
+        params,
+        cache,
+        scoring=SCORING,
+        budget=search_budget,
+        resource='n_estimators' if boosted else 'n_samples',
+        max_rows=max_rows,
+        deadline=deadline,
+        model_name=model_name,
+    )
+    y_pred = search.best_estimator.predict(cache.X_test)
 
     return {
         'model_name': model_name,
-        'best_score': float(grid.best_score_),
-        'predictions': y_pred.tolist(),
-        'params': {k.replace('model__', ''): v for k, v in grid.best_params_.items()},
+        'best_score': search.best_score,
+        'predictions': y_pred,
+        'params': search.best_params,
+        'best_iteration': best_iteration(search.best_estimator),
+        'sample_size': search.sample_size,
+        'partial': search.partial,
+        'duration': time.perf_counter() - started,
+        'pipeline': build_pipeline(cache.preprocessor, search.best_estimator),
     }
 
 
-def classification_training(task, df_path: str, target: str) -> list:
+def train_model(
+    model_name: str,
+    cache: FoldCache,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    deadline: float | None = None,
+) -> dict:
     """
-    Train and evaluate classification models.
+    Train one classification model on the preprocessed folds of its job.
+
+    Each model of a job runs in its own Celery subtask, possibly on another
+    worker node. The job splits the dataset and preprocesses the CV folds once
+    per categorical encoding, and every subtask loads the cache of its model.
 
     Parameters:
-        df_path (str): Path to the dataset CSV file.
-        target (str): Target column name.
+        model_name (str): Name of the model, a key of ``build_models``.
+        cache (FoldCache): Preprocessed CV folds and train/test split.
+        search_mode (str): 'random' or 'halving' hyperparameter search.
+        search_budget (float | None): Compute budget for the halving search.
+        deadline (float | None): ``time.time()`` timestamp after which the search
+            stops starting new configurations.
 
     Returns:
-        list: List of dictionaries containing model results.
+        dict: Model result, in the format of ``train_single_model``.
     """
 
-    MODELS = {
-        'LogisticRegression': LogisticRegression(),
-        'DesicionTree': DecisionTreeClassifier(),
-        'RandomForest': RandomForestClassifier(),
-        'XGBoost': XGBClassifier(),
-        'LightGBM': LGBMClassifier(force_col_wise=True),
-    }
-
-    grid_params = {
-        'LogisticRegression': {
-            'model__penalty': ['l1', 'l2'],
-            'model__C': [0.01, 0.1, 1, 10, 100],
-            'model__solver': ['liblinear', 'saga'],
-        },
-        'RandomForest': {
-            'model__n_estimators': [100, 200],
-            'model__max_depth': [None, 10, 20],
-            'model__min_samples_split': [2, 5],
-        },
-        'XGBoost': {
-            'model__n_estimators': [100, 200],
-            'model__max_depth': [3, 6],
-            'model__learning_rate': [0.01, 0.1],
-        },
-        'DesicionTree': {
-            'model__max_depth': [None, 4, 6, 8],
-            'model__min_samples_split': [2, 5, 10],
-            'model__min_samples_leaf': [1, 2, 4],
-        },
-        'LightGBM': {
-            'model__n_estimators': [100, 300, 500, 1000],
-            'model__learning_rate': [0.01, 0.03, 0.05, 0.1],
-            'model__num_leaves': [20, 31, 50, 70, 100],
-            'model__max_depth': [-1, 5, 10, 20, 30],
-            'model__min_child_samples': [5, 10, 20, 50],
-            'model__subsample': [0.6, 0.8, 1.0],
-            'model__colsample_bytree': [0.6, 0.8, 1.0],
-            'model__reg_alpha': [0, 0.01, 0.1, 1],
-            'model__reg_lambda': [0, 0.01, 0.1, 1],
-        },
-    }
-
-    df = pd.read_csv(df_path)
-
-    X_train, X_test, y_train, y_test = split_dataset(df, target)
-    preprocessor = build_column_transformer(X_train)
-
-    tasks = []
-    results = []
-
-    total = len(MODELS)
-    max_workers = min(len(MODELS), max(1, multiprocessing.cpu_count() - 1))
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for i, (model_name, model_class) in enumerate(MODELS.items(), start=1):
-            params = grid_params.get(model_name)
-
-            task.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': i,
-                    'total': total,
-                    'model': model_name,
-                    'step': 'training',
-                },
-            )
-
-            tasks.append(
-                executor.submit(
-                    train_single_model,
-                    model_name,
-                    model_class,
-                    params,
-                    X_train,
-                    X_test,
-                    y_train,
-                    y_test,
-                    preprocessor,
-                )
-            )
-
-        for future in as_completed(tasks):
-            results.append(future.result())
-
-    return results
+    return train_single_model(
+        model_name,
+        build_models()[model_name],
+        GRID_PARAMS.get(model_name),
+        cache,
+        search_mode,
+        search_budget,
+        deadline,
+    )
@@ -1,11 +1,31 @@
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+ENCODINGS = ('onehot', 'ordinal')
+
+# How each model family sees categorical columns. Linear models need one-hot
+# columns; trees split on integer codes just as well, and the boosters treat
+# the codes as native categories, so neither pays for a one-hot matrix whose
+# width grows with the cardinality.
+MODEL_ENCODINGS = {
+    'LogisticRegression': 'onehot',
+    'LinearRegression': 'onehot',
+    'Ridge': 'onehot',
+    'DesicionTree': 'ordinal',
+    'RandomForest': 'ordinal',
+    'XGBoost': 'ordinal',
+    'LightGBM': 'ordinal',
+}
+
+# One-hot columns per categorical feature; rarer categories share one column.
+MAX_ONEHOT_CATEGORIES = 50
 
 
 def split_dataset(
@@ -28,33 +48,79 @@ def split_dataset(
     return train_test_split(X, y, test_size=0.2, random_state=42)
 
 
-def build_column_transformer(df: pd.DataFrame) -> ColumnTransformer:
+def build_cv_splits(
+    X: pd.DataFrame, y: pd.Series, stratify: bool, n_splits: int = 3
+) -> list:
+    """
+    Compute the cross-validation splits once for a whole training job.
+
+    Parameters:
+        X (pd.DataFrame): Training features.
+        y (pd.Series): Training target.
+        stratify (bool): Preserve class proportions in every fold.
+        n_splits (int): Number of folds.
+
+    Returns:
+        list: (train_indices, validation_indices) pairs.
+    """
+
+    cv = StratifiedKFold(n_splits) if stratify else KFold(n_splits)
+
+    return list(cv.split(X, y))
+
+
+def build_column_transformer(
+    df: pd.DataFrame, encoding: str = 'onehot'
+) -> ColumnTransformer:
     """
     Build a column transformer for preprocessing.
 
+    With 'onehot' encoding numeric columns are standardized and categorical
+    ones one-hot encoded, keeping at most ``MAX_ONEHOT_CATEGORIES`` columns per
+    feature. With 'ordinal' encoding numeric columns are only imputed and
+    categorical ones replaced by integer codes, with missing and unseen
+    categories left as NaN.
+
     Parameters:
         df (pd.DataFrame): Input dataframe.
+        encoding (str): One of ``ENCODINGS``.
 
     Returns:
         ColumnTransformer: Preprocessing pipeline.
     """
 
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-    cat_cols = df.select_dtypes(include=['string', 'category']).columns
+    if encoding not in ENCODINGS:
+        raise ValueError(f'Unknown encoding: {encoding}')
 
-    numeric_transformer = Pipeline(
-        [
-            ('imputer', SimpleImputer(strategy='mean')),
-            ('scaler', StandardScaler()),
-        ]
-    )
+    # Any width, so the int8-int32/float32 columns of downcast datasets count too.
+    numeric_cols = df.select_dtypes(include=['number']).columns
+    cat_cols = df.select_dtypes(include=['string', 'category']).columns
 
-    categorical_transformer = Pipeline(
-        [
-            ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('encoder', OneHotEncoder(handle_unknown='ignore')),
-        ]
-    )
+    if encoding == 'onehot':
+        numeric_transformer = Pipeline(
+            [
+                ('imputer', SimpleImputer(strategy='mean')),
+                ('scaler', StandardScaler()),
+            ]
+        )
+
+        categorical_transformer = Pipeline(
+            [
+                ('imputer', SimpleImputer(strategy='most_frequent')),
+                (
+                    'encoder',
+                    OneHotEncoder(
+                        handle_unknown='infrequent_if_exist',
+                        max_categories=MAX_ONEHOT_CATEGORIES,
+                    ),
+                ),
+            ]
+        )
+    else:
+        numeric_transformer = SimpleImputer(strategy='mean')
+        categorical_transformer = OrdinalEncoder(
+            handle_unknown='use_encoded_value', unknown_value=np.nan
+        )
 
     preprocessor = ColumnTransformer(
         [
@@ -64,3 +130,36 @@ def build_column_transformer(df: pd.DataFrame) -> ColumnTransformer:
     )
 
     return preprocessor
+
+
+def model_encoding(model_name: str) -> str:
+    """
+    Return the categorical encoding a model is trained on.
+
+    Parameters:
+        model_name (str): Name of the model.
+
+    Returns:
+        str: One of ``ENCODINGS``.
+    """
+
+    return MODEL_ENCODINGS.get(model_name, 'onehot')
+
+
+def categorical_features(preprocessor: ColumnTransformer) -> list[int]:
+    """
+    Positions of the ordinal-coded categorical columns in a fitted transformer.
+
+    Parameters:
+        preprocessor (ColumnTransformer): Fitted column transformer.
+
+    Returns:
+        list[int]: Output column positions, empty for one-hot encoding.
+    """
+
+    if not isinstance(preprocessor.named_transformers_['cat'], OrdinalEncoder):
+        return []
+
+    indices = preprocessor.output_indices_['cat']
+
+    return list(range(indices.start, indices.stop))
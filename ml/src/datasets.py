@@ -0,0 +1,251 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+import pyarrow as pa
+from pyarrow import csv, feather
+
+from core.dataset_store import DatasetStore, find_store
+
+COLUMNAR_CACHE_DIR = Path(os.getenv('COLUMNAR_CACHE_DIR', 'storage/columnar'))
+COLUMNAR_CACHE_MAX_MB = int(os.getenv('COLUMNAR_CACHE_MAX_MB', 4_096))
+COLUMNAR_SUFFIXES = ('.feather', '.arrow')
+
+# Bytes of CSV text parsed per record batch while converting, large enough for
+# the column types inferred on the first batch to hold for the rest of the file.
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Empty cells are missing values, as with ``pd.read_csv``.
+CSV_CONVERT_OPTIONS = csv.ConvertOptions(strings_can_be_null=True)
+
+# String columns with at most this share of distinct values become categories.
+MAX_CATEGORY_RATIO = 0.5
+
+
+_columnar_cache = None
+
+
+def get_columnar_cache() -> DatasetStore:
+    """
+    Return the cache of columnar copies of CSV files outside the dataset store.
+    """
+
+    global _columnar_cache
+
+    if _columnar_cache is None:
+        _columnar_cache = DatasetStore(
+            COLUMNAR_CACHE_DIR, COLUMNAR_CACHE_MAX_MB * 2**20
+        )
+
+    return _columnar_cache
+
+
+def save_dataset_as_feather(df: pd.DataFrame, path: str | Path) -> str:
+    """
+    Persist a dataframe in the uncompressed Arrow IPC (Feather v2) format.
+
+    Uncompressed files can be memory-mapped by the workers without decoding.
+
+    Parameters:
+        df (pd.DataFrame): Dataframe to save.
+        path (str | Path): Destination path.
+
+    Returns:
+        str: Path to the saved file.
+    """
+
+    df.to_feather(path, compression='uncompressed')
+
+    return str(path)
+
+
+def convert_csv_to_feather(csv_path: str | Path, feather_path: str | Path) -> str:
+    """
+    Convert a CSV file to Feather one record batch at a time.
+
+    Memory stays bounded by ``CSV_BLOCK_SIZE`` regardless of the file size. If
+    a later batch does not fit the types inferred from the first one, the file
+    is converted again in a single pass so types are inferred from all rows.
+
+    Parameters:
+        csv_path (str | Path): Source CSV file.
+        feather_path (str | Path): Destination Feather file.
+
+    Returns:
+        str: Path to the Feather file.
+    """
+
+    tmp_path = Path(f'{feather_path}.tmp')
+
+    try:
+        reader = csv.open_csv(
+            csv_path,
+            read_options=csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=CSV_CONVERT_OPTIONS,
+        )
+
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+    except pa.ArrowInvalid:
+        table = csv.read_csv(csv_path, convert_options=CSV_CONVERT_OPTIONS)
+        feather.write_feather(table, str(tmp_path), compression='uncompressed')
+
+    tmp_path.replace(feather_path)
+
+    return str(feather_path)
+
+
+def ensure_columnar(df_path: str | Path) -> str:
+    """
+    Return a columnar copy of a dataset, converting a CSV only the first time.
+
+    The copy of a CSV held by the dataset store or a worker cache is kept next
+    to it, so it is evicted with it. Other CSV files are converted into
+    ``COLUMNAR_CACHE_DIR`` under a key derived from the source path, size and
+    modification time, and that cache evicts its least recently used copies
+    beyond ``COLUMNAR_CACHE_MAX_MB``.
+
+    Parameters:
+        df_path (str | Path): Path to a CSV or Feather dataset.
+
+    Returns:
+        str: Path to the Feather file.
+    """
+
+    path = Path(df_path)
+
+    if path.suffix in COLUMNAR_SUFFIXES:
+        return str(path)
+
+    store = find_store(path)
+
+    if store is not None:
+        name = path.stem
+        feather_path = store.columnar_path(name)
+    else:
+        stat = path.stat()
+        fingerprint = f'{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}'
+        name = hashlib.sha256(fingerprint.encode()).hexdigest()
+
+        store = get_columnar_cache()
+        feather_path = store.get(name) or store.path(name, '.feather')
+
+    if not feather_path.exists():
+        store.root.mkdir(parents=True, exist_ok=True)
+        convert_csv_to_feather(path, feather_path)
+        store.evict(keep=name)
+
+    return str(feather_path)
+
+
+def downcast_dtypes(
+    df: pd.DataFrame, categorical: list[str], keep: list[str] = ()
+) -> pd.DataFrame:
+    """
+    Shrink every column to the most compact dtype that holds its values.
+
+    Integers become the smallest of int8/16/32/64 (or unsigned), floats become
+    float32, and the ``categorical`` string columns become ``category``.
+
+    Parameters:
+        df (pd.DataFrame): Dataframe to downcast in place.
+        categorical (list[str]): String columns to store as categories.
+        keep (list[str]): Columns left untouched, such as the target.
+
+    Returns:
+        pd.DataFrame: The downcast dataframe.
+    """
+
+    for col in df.columns:
+        series = df[col]
+
+        if col in keep or pd.api.types.is_bool_dtype(series):
+            continue
+
+        if pd.api.types.is_integer_dtype(series):
+            downcast = 'unsigned' if series.min() >= 0 else 'integer'
+            df[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype('float32')
+        elif col in categorical:
+            df[col] = series.astype('category')
+
+    return df
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """
+    Return the memory used by a dataframe in bytes, including string contents.
+    """
+
+    return int(df.memory_usage(deep=True).sum())
+
+
+def load_dataset(
+    df_path: str | Path,
+    columns: list[str] | None = None,
+    keep: list[str] = (),
+) -> pd.DataFrame:
+    """
+    Load a dataset memory-mapped, one record batch at a time, in compact dtypes.
+
+    Only the requested columns are read. Each batch is downcast before the
+    next one is converted, so the uncompressed int64/float64/object copy of
+    the whole dataset never exists in memory. String columns whose number of
+    distinct values in the first batch is at most ``MAX_CATEGORY_RATIO`` of
+    its rows are stored as categories.
+
+    Parameters:
+        df_path (str | Path): Path to a CSV or Feather dataset.
+        columns (list[str] | None): Columns to read, ``None`` reads all of them.
+        keep (list[str]): Columns whose dtype is left as read, such as the target.
+
+    Returns:
+        pd.DataFrame: Loaded dataset.
+    """
+
+    chunks = []
+    categorical = None
+
+    with pa.memory_map(ensure_columnar(df_path)) as source:
+        reader = pa.ipc.open_file(source)
+
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+
+            if columns is not None:
+                batch = batch.select(columns)
+
+            chunk = batch.to_pandas()
+
+            if categorical is None:
+                categorical = [
+                    col
+                    for col in chunk.select_dtypes(
+                        include=['string', 'object', 'category']
+                    )
+                    if col not in keep
+                    and (
+                        isinstance(chunk[col].dtype, pd.CategoricalDtype)
+                        or chunk[col].nunique() <= MAX_CATEGORY_RATIO * len(chunk)
+                    )
+                ]
+
+            chunks.append(downcast_dtypes(chunk, categorical, keep))
+
+    if not chunks:
+        return pd.DataFrame(columns=columns or reader.schema.names)
+
+    # Categories differ between batches, so they are merged separately.
+    df = pd.concat(
+        [chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True
+    )
+
+    for col in categorical:
+        df[col] = union_categoricals([chunk[col] for chunk in chunks])
+
+    return df[list(chunks[0].columns)]
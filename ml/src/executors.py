@@ -0,0 +1,173 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError,
+    as_completed,
+)
+
+from joblib.externals.loky import get_reusable_executor
+
+logger = logging.getLogger(__name__)
+
+# Models already warned about running on threads instead of processes.
+_process_fallbacks = set()
+
+EXECUTOR_BACKENDS = ('thread', 'process', 'inline')
+
+# Which executor the CV folds of each model family are fitted on. Tree
+# ensembles written in Python hold the GIL for most of their fit, so they get
+# their own processes; the boosters release the GIL inside their C++ core and
+# are fine on threads; the linear models are cheap enough that the pool
+# overhead is not worth it.
+MODEL_BACKENDS = {
+    'LogisticRegression': 'thread',
+    'LinearRegression': 'inline',
+    'Ridge': 'inline',
+    'DesicionTree': 'process',
+    'RandomForest': 'process',
+    'XGBoost': 'thread',
+    'LightGBM': 'thread',
+}
+
+
+class InlineExecutor(Executor):
+    """
+    Executor that runs every submitted call synchronously in the caller.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+        return future
+
+
+def resolve_backend(model_name: str) -> str:
+    """
+    Pick the executor backend for a model.
+
+    The ``TRAINING_EXECUTOR`` environment variable forces a single backend for
+    every model, which is handy for benchmarking and debugging.
+
+    Parameters:
+        model_name (str): Name of the model.
+
+    Returns:
+        str: One of ``EXECUTOR_BACKENDS``.
+    """
+
+    backend = os.getenv('TRAINING_EXECUTOR') or MODEL_BACKENDS.get(model_name, 'thread')
+
+    if backend not in EXECUTOR_BACKENDS:
+        raise ValueError(f'Unknown executor backend: {backend}')
+
+    # Celery's prefork workers are daemonic and may not spawn children; the
+    # heavy queue runs the solo pool for that reason.
+    if backend == 'process' and multiprocessing.current_process().daemon:
+        if model_name not in _process_fallbacks:
+            _process_fallbacks.add(model_name)
+            logger.warning(
+                'Process backend is unavailable in a daemonic worker, '
+                'falling back to threads for %s',
+                model_name,
+            )
+
+        return 'thread'
+
+    return backend
+
+
+def get_executor(backend: str, max_workers: int) -> Executor:
+    """
+    Create an executor for the given backend.
+
+    Parameters:
+        backend (str): One of ``EXECUTOR_BACKENDS``.
+        max_workers (int): Maximum number of concurrent workers.
+
+    Returns:
+        Executor: Executor instance.
+    """
+
+    if backend == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    if backend == 'process':
+        return get_reusable_executor(max_workers=max_workers)
+
+    if backend == 'inline':
+        return InlineExecutor()
+
+    raise ValueError(f'Unknown executor backend: {backend}')
+
+
+def fan_out(jobs: list, max_workers: int | None = None, deadline: float | None = None):
+    """
+    Run jobs on their model's executor and yield results as they finish.
+
+    At the ``deadline`` the jobs that have not finished are abandoned: queued
+    ones are cancelled and running ones are left to finish in the background
+    without waiting for them.
+
+    Parameters:
+        jobs (list): ``(model_name, fn, args)`` tuples, such as the CV folds of
+            one configuration.
+        max_workers (int | None): Workers per pool, defaults to ``cpu_count - 1``.
+        deadline (float | None): ``time.time()`` timestamp, ``None`` waits for all jobs.
+
+    Yields:
+        The return value of each job finished in time, in completion order.
+    """
+
+    if max_workers is None:
+        max_workers = min(len(jobs), max(1, multiprocessing.cpu_count() - 1))
+
+    executors = {}
+    futures = []
+    finished = False
+
+    try:
+        # Inline jobs run at submission time, so submit them after the pooled ones.
+        backends = [resolve_backend(model_name) for model_name, _, _ in jobs]
+        order = sorted(range(len(jobs)), key=lambda i: backends[i] == 'inline')
+
+        for i in order:
+            _, fn, args = jobs[i]
+            backend = backends[i]
+
+            if backend not in executors:
+                executors[backend] = get_executor(backend, max_workers)
+
+            futures.append(executors[backend].submit(fn, *args))
+
+        timeout = None if deadline is None else max(0.0, deadline - time.time())
+
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                yield future.result()
+
+            finished = True
+        except TimeoutError:
+            logger.warning(
+                'Abandoning %d training jobs that missed the deadline',
+                sum(not future.done() for future in futures),
+            )
+    finally:
+        for future in futures:
+            future.cancel()
+
+        for backend, executor in executors.items():
+            # The loky executor is reused across jobs and shut down by loky
+            # itself. Jobs cut short, by the deadline or by an exception such
+            # as the task's time limit, are not waited for.
+            if backend != 'process':
+                executor.shutdown(wait=finished)
@@ -0,0 +1,144 @@
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import joblib
+
+from ml.src.data_preprocessing import model_encoding
+
+# Directory of the preprocessed CV folds of running jobs. It need not be shared
+# between nodes: a subtask that finds no cache rebuilds it from the dataset.
+FOLD_CACHE_DIR = Path(os.getenv('FOLD_CACHE_DIR', 'storage/folds'))
+FOLD_CACHE_MAX_MB = int(os.getenv('FOLD_CACHE_MAX_MB', 4_096))
+
+CACHE_ID_PATTERN = re.compile(r'[0-9A-Za-z-]+_[0-9A-Za-z-]+')
+
+
+def fold_cache_path(task_id: str, encoding: str) -> Path:
+    """
+    Return the file of a job's fold cache for one categorical encoding.
+
+    Parameters:
+        task_id (str): ID of the training task.
+        encoding (str): Categorical encoding of the cache.
+
+    Returns:
+        Path: Path to the serialized ``FoldCache``.
+    """
+
+    cache_id = f'{task_id}_{encoding}'
+
+    if not CACHE_ID_PATTERN.fullmatch(cache_id):
+        raise ValueError(f'Invalid fold cache id: {cache_id}')
+
+    return FOLD_CACHE_DIR / f'{cache_id}.joblib'
+
+
+def save_fold_caches(caches: dict, task_id: str) -> None:
+    """
+    Store the fold caches of a job on this node, once per categorical encoding.
+
+    The least recently used caches of other jobs are then deleted until the
+    directory fits ``FOLD_CACHE_MAX_MB``.
+
+    Parameters:
+        caches (dict): Mapping of model name to its ``FoldCache``, from
+            ``build_fold_caches``.
+        task_id (str): ID of the training task.
+    """
+
+    FOLD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    for model_name, cache in caches.items():
+        path = fold_cache_path(task_id, model_encoding(model_name))
+
+        if path.exists():
+            continue
+
+        # Subtasks of the same job on one node may build the same cache at once.
+        fd, tmp_path = tempfile.mkstemp(dir=FOLD_CACHE_DIR, suffix='.tmp')
+        os.close(fd)
+
+        try:
+            joblib.dump(cache, tmp_path)
+            Path(tmp_path).replace(path)
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    evict_fold_caches(keep=task_id)
+
+
+def load_fold_cache(task_id: str, model_name: str):
+    """
+    Load the fold cache a model of a job is trained on, if this node has it.
+
+    The arrays are memory-mapped, so subtasks of the same job running on one
+    node share them through the page cache.
+
+    Parameters:
+        task_id (str): ID of the training task.
+        model_name (str): Name of the model.
+
+    Returns:
+        FoldCache | None: The job's cache for the model's categorical encoding,
+            ``None`` if it is not stored here.
+    """
+
+    path = fold_cache_path(task_id, model_encoding(model_name))
+
+    try:
+        cache = joblib.load(path, mmap_mode='r')
+    except FileNotFoundError:
+        return None
+
+    os.utime(path)
+
+    return cache
+
+
+def discard_fold_caches(task_id: str) -> None:
+    """
+    Delete the fold caches of a job stored on this node.
+
+    Parameters:
+        task_id (str): ID of the training task.
+    """
+
+    for path in FOLD_CACHE_DIR.glob(f'{task_id}_*.joblib'):
+        path.unlink(missing_ok=True)
+
+
+def evict_fold_caches(keep: str | None = None) -> None:
+    """
+    Delete the least recently used fold caches until they fit ``FOLD_CACHE_MAX_MB``.
+
+    Caches left behind by jobs that failed, or finished on another node, end
+    up evicted this way. A cache deleted while a subtask uses it stays
+    readable through its memory map; later subtasks rebuild it.
+
+    Parameters:
+        keep (str | None): ID of a training task whose caches are never evicted.
+    """
+
+    files = []
+
+    for path in FOLD_CACHE_DIR.glob('*.joblib'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+
+    for _, size, path in sorted(files):
+        if total <= FOLD_CACHE_MAX_MB * 2**20:
+            break
+
+        if keep is not None and path.name.startswith(f'{keep}_'):
+            continue
+
+        path.unlink(missing_ok=True)
+        total -= size
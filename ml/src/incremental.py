@@ -0,0 +1,328 @@
+import copy
+import hashlib
+import json
+import math
+import time
+from pathlib import Path
+
+import lightgbm
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import get_scorer
+from sklearn.pipeline import Pipeline
+from xgboost import XGBModel
+
+from ml.src import artifacts
+from ml.src.artifacts import build_pipeline, load_model
+from ml.src.data_preprocessing import categorical_features, split_dataset
+from ml.src.search import best_iteration, model_params
+
+# Leading rows hashed to find the earlier upload a dataset may extend. Both
+# uploads must have at least this many rows, so it is kept small; the whole
+# shared prefix is compared afterwards.
+HEAD_ROWS = 10
+
+# Appends smaller than this are retrained from scratch, since their holdout
+# is too small to tell drift from noise.
+MIN_DELTA_ROWS = 100
+
+# Relative drop of the previous model's score on the new rows, compared with
+# its score on its own test split, above which the search is run again.
+DRIFT_TOLERANCE = 0.05
+
+MIN_EXTRA_ROUNDS = 10
+MIN_EXTRA_TREES = 10
+
+
+def lineage_dir() -> Path:
+    return artifacts.ARTIFACT_DIR / 'lineage'
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """
+    Hash the values of a dataframe independently of the dtypes they were loaded in.
+
+    Numbers are hashed as float64 and everything else as strings, so the same
+    rows hash the same whether a column was downcast or stored as category.
+
+    Parameters:
+        df (pd.DataFrame): Rows to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+
+    hasher = hashlib.sha256(','.join(df.columns).encode())
+
+    for col in df.columns:
+        series = df[col]
+
+        if pd.api.types.is_numeric_dtype(series) and not isinstance(
+            series.dtype, pd.CategoricalDtype
+        ):
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+        else:
+            values = series.astype(str).to_numpy(dtype=object)
+
+        hasher.update(pd.util.hash_array(values, categorize=False).tobytes())
+
+    return hasher.hexdigest()
+
+
+def lineage_key(df: pd.DataFrame, target: str, task_type: str) -> str:
+    """
+    Key shared by every upload that starts with the same rows and columns.
+    """
+
+    payload = json.dumps(
+        {
+            'head': frame_hash(df.head(HEAD_ROWS)),
+            'target': target,
+            'task_type': task_type,
+        }
+    )
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def describe_lineage(df: pd.DataFrame, target: str, task_type: str) -> dict:
+    """
+    Describe a training dataset for its lineage record.
+
+    The description is small and JSON-serializable, so it can be computed where
+    the dataset is loaded and saved by whichever task learns the model id.
+
+    Parameters:
+        df (pd.DataFrame): Training dataset.
+        target (str): Target column name.
+        task_type (str): 'classification' or 'regression'.
+
+    Returns:
+        dict: Lineage key, row count and hash of the rows.
+    """
+
+    return {
+        'key': lineage_key(df, target, task_type),
+        'rows': len(df),
+        'prefix_hash': frame_hash(df),
+    }
+
+
+def save_lineage(lineage: dict, model_id: str) -> None:
+    """
+    Remember the dataset a model was trained on, so later appends can extend it.
+
+    Parameters:
+        lineage (dict): Dataset description, from ``describe_lineage``.
+        model_id (str): Identifier of the stored best model.
+    """
+
+    path = lineage_dir() / f'{lineage["key"]}.json'
+    tmp_path = Path(f'{path}.tmp')
+
+    lineage_dir().mkdir(parents=True, exist_ok=True)
+    tmp_path.write_text(
+        json.dumps(
+            {
+                'model_id': model_id,
+                'rows': lineage['rows'],
+                'prefix_hash': lineage['prefix_hash'],
+            }
+        )
+    )
+    tmp_path.replace(path)
+
+
+def find_parent(df: pd.DataFrame, target: str, task_type: str) -> dict | None:
+    """
+    Find the model trained on a dataset this one extends with appended rows.
+
+    Parameters:
+        df (pd.DataFrame): New training dataset.
+        target (str): Target column name.
+        task_type (str): 'classification' or 'regression'.
+
+    Returns:
+        dict | None: Model id and row count of the previous dataset, ``None``
+            if this dataset does not extend a known one by enough rows.
+    """
+
+    path = lineage_dir() / f'{lineage_key(df, target, task_type)}.json'
+
+    if not path.exists():
+        return None
+
+    parent = json.loads(path.read_text())
+
+    if len(df) - parent['rows'] < MIN_DELTA_ROWS:
+        return None
+
+    if frame_hash(df.iloc[: parent['rows']]) != parent['prefix_hash']:
+        return None
+
+    return parent
+
+
+def extra_size(current: int, n_prev: int, n_delta: int, minimum: int) -> int:
+    """
+    Rounds or trees to add, in proportion to the share of new rows.
+    """
+
+    return max(minimum, math.ceil(current * n_delta / n_prev))
+
+
+def update_model(
+    pipeline: Pipeline, X_delta: pd.DataFrame, y_delta: pd.Series, n_prev: int
+) -> Pipeline | None:
+    """
+    Extend a fitted pipeline with new rows without retraining from scratch.
+
+    XGBoost and LightGBM continue boosting from their kept rounds, and random
+    forests grow extra trees, fitted on the new rows only. The number of
+    rounds or trees added is proportional to the number of new rows.
+
+    Parameters:
+        pipeline (Pipeline): Pipeline trained on the previous dataset.
+        X_delta (pd.DataFrame): Features of the new rows.
+        y_delta (pd.Series): Target of the new rows.
+        n_prev (int): Number of rows of the previous dataset.
+
+    Returns:
+        Pipeline | None: Updated pipeline, ``None`` if the model cannot be
+            extended and has to be trained again instead.
+    """
+
+    preprocessor = pipeline['preprocessor']
+    model = pipeline['model']
+    X = preprocessor.transform(X_delta)
+    y = y_delta.to_numpy()
+
+    # Extending a classifier on rows that miss some class would forget it.
+    if hasattr(model, 'classes_') and set(np.unique(y)) != set(model.classes_):
+        return None
+
+    if isinstance(model, XGBModel):
+        rounds = best_iteration(model)
+        updated = clone(model).set_params(
+            n_estimators=extra_size(rounds, n_prev, len(y), MIN_EXTRA_ROUNDS),
+            early_stopping_rounds=None,
+        )
+        updated.fit(X, y, xgb_model=model.get_booster()[:rounds], verbose=False)
+
+    elif isinstance(model, lightgbm.LGBMModel):
+        rounds = best_iteration(model)
+        init_model = lightgbm.Booster(
+            model_str=model.booster_.model_to_string(num_iteration=rounds)
+        )
+        updated = clone(model).set_params(
+            n_estimators=extra_size(rounds, n_prev, len(y), MIN_EXTRA_ROUNDS)
+        )
+        updated.fit(
+            X,
+            y,
+            init_model=init_model,
+            categorical_feature=categorical_features(preprocessor) or 'auto',
+        )
+
+    elif isinstance(model, (RandomForestClassifier, RandomForestRegressor)):
+        updated = copy.deepcopy(model)
+        updated.set_params(
+            warm_start=True,
+            n_estimators=model.n_estimators
+            + extra_size(model.n_estimators, n_prev, len(y), MIN_EXTRA_TREES),
+        )
+        updated.fit(X, y)
+
+    else:
+        return None
+
+    return build_pipeline(preprocessor, updated)
+
+
+def incremental_training(
+    task,
+    df: pd.DataFrame,
+    target: str,
+    parent: dict,
+    models: dict,
+    grid_params: dict,
+    scoring: str,
+) -> dict | None:
+    """
+    Retrain the previous best model on a dataset extended with appended rows.
+
+    The new rows are split into train and test rows. If the previous model
+    scores clearly worse on the new test rows than on its own test split, the
+    data has drifted and ``None`` is returned so the full search runs again.
+    Otherwise boosters and forests are extended with the new training rows, at
+    a cost that grows with the new rows only. Linear models and decision trees
+    cannot be extended; refitting them on all the rows would cost as much as
+    training them again, so ``None`` is returned for them too and the job
+    runs the normal search, within its search mode and time budget.
+
+    Parameters:
+        task: The bound Celery task, used for progress updates.
+        df (pd.DataFrame): Extended dataset.
+        target (str): Target column name.
+        parent (dict): Lineage of the previous dataset, from ``find_parent``.
+        models (dict): Mapping of model name to estimator, to name the model.
+        grid_params (dict): Hyperparameter grids, to report the searched values.
+        scoring (str): Scikit-learn scorer name.
+
+    Returns:
+        dict | None: Result in the format of ``train_single_model``, or ``None``
+            when the full search has to run again.
+    """
+
+    started = time.perf_counter()
+
+    try:
+        pipeline = load_model(parent['model_id'])
+    except FileNotFoundError:
+        return None
+
+    scorer = get_scorer(scoring)
+    n_prev = parent['rows']
+
+    task.update_state(
+        state='PROGRESS',
+        meta={'step': 'incremental update', 'new_rows': len(df) - n_prev},
+    )
+
+    _, X_prev_test, _, y_prev_test = split_dataset(df.iloc[:n_prev], target)
+    X_delta_train, X_delta_test, y_delta_train, y_delta_test = split_dataset(
+        df.iloc[n_prev:], target
+    )
+
+    baseline = scorer(pipeline, X_prev_test, y_prev_test)
+    current = scorer(pipeline, X_delta_test, y_delta_test)
+
+    if current < baseline - DRIFT_TOLERANCE * abs(baseline):
+        return None
+
+    updated = update_model(pipeline, X_delta_train, y_delta_train, n_prev)
+
+    if updated is None:
+        return None
+
+    model = updated['model']
+    model_name = next(
+        name for name, estimator in models.items() if type(estimator) is type(model)
+    )
+    searched = model_params(grid_params.get(model_name) or {})
+    score = scorer(updated, X_delta_test, y_delta_test)
+
+    return {
+        'model_name': model_name,
+        'best_score': -score if scoring.startswith('neg_') else score,
+        'predictions': updated.predict(X_delta_test),
+        'params': {k: v for k, v in model.get_params().items() if k in searched},
+        'best_iteration': best_iteration(model),
+        'sample_size': len(y_delta_train),
+        'incremental': True,
+        'partial': False,
+        'duration': time.perf_counter() - started,
+        'pipeline': updated,
+    }
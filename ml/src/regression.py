@@ -1,184 +1,192 @@
-import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 
-import pandas as pd
 from lightgbm import LGBMRegressor
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.metrics import mean_absolute_error
-from sklearn.model_selection import RandomizedSearchCV
-from sklearn.pipeline import Pipeline
 from sklearn.tree import DecisionTreeRegressor
 from xgboost import XGBRegressor
 
-from ml.src.data_preprocessing import build_column_transformer, split_dataset
+from ml.src.artifacts import build_pipeline
+from ml.src.search import (
+    MAX_BOOSTING_ROUNDS,
+    FoldCache,
+    best_iteration,
+    limit_rows,
+    native_categorical,
+    progressive_sample_size,
+    run_search,
+)
+
+# Scorer of the searches and of the drift check of incremental updates.
+SCORING = 'neg_mean_absolute_error'
+
+# Whether train/test and CV splits preserve the class proportions.
+STRATIFY = False
+
+GRID_PARAMS = {
+    'RandomForest': {
+        'model__n_estimators': [100, 200],
+        'model__max_depth': [None, 10, 20],
+        'model__min_samples_split': [2, 5],
+    },
+    'XGBoost': {
+        'model__max_depth': [3, 6],
+        'model__learning_rate': [0.01, 0.1],
+    },
+    'Ridge': {
+        'model__alpha': [0.01, 0.1, 1.0, 10.0],
+    },
+    'DesicionTree': {
+        'model__max_depth': [None, 4, 6, 8],
+        'model__min_samples_split': [2, 5, 10],
+        'model__min_samples_leaf': [1, 2, 4],
+    },
+    'LightGBM': {
+        'model__learning_rate': [0.01, 0.03, 0.05, 0.1],
+        'model__num_leaves': [20, 31, 50, 70, 100],
+        'model__max_depth': [-1, 5, 10, 20, 30],
+        'model__min_child_samples': [5, 10, 20, 50],
+        'model__subsample': [0.6, 0.8, 1.0],
+        'model__colsample_bytree': [0.6, 0.8, 1.0],
+        'model__reg_alpha': [0, 0.01, 0.1, 1],
+        'model__reg_lambda': [0, 0.01, 0.1, 1],
+    },
+}
+
+
+def build_models() -> dict:
+    """
+    Create fresh, unfitted instances of every candidate regression model.
+
+    Returns:
+        dict: Mapping of model name to estimator.
+    """
+
+    return {
+        'LinearRegression': LinearRegression(),
+        'Ridge': Ridge(solver='auto'),
+        'DesicionTree': DecisionTreeRegressor(),
+        'RandomForest': RandomForestRegressor(),
+        'XGBoost': XGBRegressor(n_estimators=MAX_BOOSTING_ROUNDS, n_jobs=1),
+        'LightGBM': LGBMRegressor(
+            n_estimators=MAX_BOOSTING_ROUNDS, n_jobs=1, force_col_wise=True
+        ),
+    }
 
 
 def train_single_model(
-    model_name,
+    model_name: str,
     model_class,
-    params,
-    X_train,
-    X_test,
-    y_train,
-    y_test,
-    preprocessor,
+    params: dict,
+    cache: FoldCache,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    deadline: float | None = None,
 ) -> dict:
     """
-    Train and evaluate classification models.
+    Train and evaluate a regression model.
 
     Parameters:
         model_name (str): Name of the model.
         model_class: The model class to instantiate.
-        params (dict): Hyperparameter grid for RandomizedSearchCV.
-        X_train (pd.DataFrame): Training features.
-        X_test (pd.DataFrame): Testing features.
-        y_train (pd.Series): Training target.
-        y_test (pd.Series): Testing target.
-        preprocessor (ColumnTransformer): Preprocessing pipeline.
+        params (dict): Hyperparameter grid for the search.
+        cache (FoldCache): Preprocessed CV folds and train/test matrices.
+        search_mode (str): 'random' or 'halving'.
+        search_budget (float | None): Compute budget for the halving search.
+        deadline (float | None): ``time.time()`` timestamp after which the search
+            stops starting new configurations.
 
     Returns:
-        dict: Dictionary containing model name, best score, predictions, and best parameters.
+        dict: Dictionary containing model name, best score, predictions, best parameters,
+            boosting rounds kept by early stopping, number of training rows used,
+            training duration in seconds, whether the search was cut short by the
+            deadline and the fitted preprocessing + model pipeline.
     """
 
-    pipeline = Pipeline(
-        [
-            ('preprocessor', preprocessor),
-            ('model', model_class),
-        ]
-    )
-
-    X_test = pd.DataFrame(X_test, columns=X_train.columns)
+    started = time.perf_counter()
 
-    if len(X_train) > 50_000 and model_name in ('XGBoost', 'LightGBM'):
-        idx = X_train.sample(50_000, random_state=42).index
-        X_train = X_train.loc[idx]
-        y_train = y_train.loc[idx]
+    model_class = native_categorical(model_class, cache)
+    boosted = model_name in ('XGBoost', 'LightGBM')
+    max_rows = progressive_sample_size(
+        model_class, cache, scoring=SCORING, deadline=deadline
+    )
 
     if model_name == 'LinearRegression':
-        pipeline.fit(X_train, y_train)
-        y_pred = pipeline.predict(X_test)
+        X_train, y_train = limit_rows(cache.X_train, cache.y_train, max_rows)
+        model = clone(model_class).fit(X_train, y_train)
+        y_pred = model.predict(cache.X_test)
 
         return {
             'model_name': model_name,
-            'best_score': mean_absolute_error(y_test, y_pred),
-            'predictions': y_pred.tolist(),
+            'best_score': mean_absolute_error(cache.y_test, y_pred),
+            'predictions': y_pred,
+            'sample_size': X_train.shape[0],
+            'partial': False,
+            'duration': time.perf_counter() - started,
+            'pipeline': build_pipeline(cache.preprocessor, model),
         }
 
-    grid = RandomizedSearchCV(
-        estimator=pipeline,
-        param_distributions=params,
-        n_iter=4,
-        cv=3,
-        scoring='neg_mean_absolute_error',
-        random_state=42,
-        n_jobs=1,
+    search = run_search(
+        search_mode,
+        model_class,
+        params,
+        cache,
+        scoring=SCORING,
+        budget=search_budget,
+        resource='n_estimators' if boosted else 'n_samples',
+        max_rows=max_rows,
+        deadline=deadline,
+        model_name=model_name,
     )
-
-    grid.fit(X_train, y_train)
-    y_pred = grid.predict(X_test)
+    y_pred = search.best_estimator.predict(cache.X_test)
 
     return {
         'model_name': model_name,
-        'best_score': float(-grid.best_score_),
-        'predictions': y_pred.tolist(),
-        'params': {k.replace('model__', ''): v for k, v in grid.best_params_.items()},
+        'best_score': -search.best_score,
+        'predictions': y_pred,
+        'params': search.best_params,
+        'best_iteration': best_iteration(search.best_estimator),
+        'sample_size': search.sample_size,
+        'partial': search.partial,
+        'duration': time.perf_counter() - started,
+        'pipeline': build_pipeline(cache.preprocessor, search.best_estimator),
     }
 
 
-def regression_training(task, df_path: str, target: str) -> list:
+def train_model(
+    model_name: str,
+    cache: FoldCache,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    deadline: float | None = None,
+) -> dict:
     """
-    Train and evaluate regression models.
+    Train one regression model on the preprocessed folds of its job.
+
+    Each model of a job runs in its own Celery subtask, possibly on another
+    worker node. The job splits the dataset and preprocesses the CV folds once
+    per categorical encoding, and every subtask loads the cache of its model.
 
     Parameters:
-        df_path (str): Path to the dataset CSV file.
-        target (str): Target column name.
+        model_name (str): Name of the model, a key of ``build_models``.
+        cache (FoldCache): Preprocessed CV folds and train/test split.
+        search_mode (str): 'random' or 'halving' hyperparameter search.
+        search_budget (float | None): Compute budget for the halving search.
+        deadline (float | None): ``time.time()`` timestamp after which the search
+            stops starting new configurations.
 
     Returns:
-        list: List of dictionaries containing model results.
+        dict: Model result, in the format of ``train_single_model``.
     """
 
-    MODELS = {
-        'LinearRegression': LinearRegression(),
-        'Ridge': Ridge(solver='auto'),
-        'DesicionTree': DecisionTreeRegressor(),
-        'RandomForest': RandomForestRegressor(),
-        'XGBoost': XGBRegressor(n_jobs=1),
-        'LightGBM': LGBMRegressor(n_jobs=1, force_col_wise=True),
-    }
-
-    grid_params = {
-        'RandomForest': {
-            'model__n_estimators': [100, 200],
-            'model__max_depth': [None, 10, 20],
-            'model__min_samples_split': [2, 5],
-        },
-        'XGBoost': {
-            'model__n_estimators': [100, 200],
-            'model__max_depth': [3, 6],
-            'model__learning_rate': [0.01, 0.1],
-        },
-        'Ridge': {
-            'model__alpha': [0.01, 0.1, 1.0, 10.0],
-        },
-        'DesicionTree': {
-            'model__max_depth': [None, 4, 6, 8],
-            'model__min_samples_split': [2, 5, 10],
-            'model__min_samples_leaf': [1, 2, 4],
-        },
-        'LightGBM': {
-            'model__n_estimators': [100, 300, 500, 1000],
-            'model__learning_rate': [0.01, 0.03, 0.05, 0.1],
-            'model__num_leaves': [20, 31, 50, 70, 100],
-            'model__max_depth': [-1, 5, 10, 20, 30],
-            'model__min_child_samples': [5, 10, 20, 50],
-            'model__subsample': [0.6, 0.8, 1.0],
-            'model__colsample_bytree': [0.6, 0.8, 1.0],
-            'model__reg_alpha': [0, 0.01, 0.1, 1],
-            'model__reg_lambda': [0, 0.01, 0.1, 1],
-        },
-    }
-
-    df = pd.read_csv(df_path)
-
-    X_train, X_test, y_train, y_test = split_dataset(df, target)
-    preprocessor = build_column_transformer(X_train)
-
-    tasks = []
-    results = []
-
-    total = len(MODELS)
-    max_workers = min(len(MODELS), max(1, multiprocessing.cpu_count() - 1))
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for i, (model_name, model_class) in enumerate(MODELS.items(), start=1):
-            params = grid_params.get(model_name)
-
-            task.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': i,
-                    'total': total,
-                    'model': model_name,
-                    'step': 'training',
-                },
-            )
-
-            tasks.append(
-                executor.submit(
-                    train_single_model,
-                    model_name,
-                    model_class,
-                    params,
-                    X_train,
-                    X_test,
-                    y_train,
-                    y_test,
-                    preprocessor,
-                )
-            )
-
-        for future in as_completed(tasks):
-            results.append(future.result())
-
-    return results
+    return train_single_model(
+        model_name,
+        build_models()[model_name],
+        GRID_PARAMS.get(model_name),
+        cache,
+        search_mode,
+        search_budget,
+        deadline,
+    )
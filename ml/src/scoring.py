@@ -0,0 +1,180 @@
+import logging
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+
+from ml.src.datasets import COLUMNAR_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+# Rows read, transformed and predicted at a time; memory use is bounded by
+# one chunk whatever the size of the input file.
+SCORING_CHUNK_ROWS = 100_000
+
+
+def iter_chunks(
+    df_path: str | Path, chunk_rows: int = SCORING_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Feather dataset a chunk of rows at a time.
+
+    Parameters:
+        df_path (str | Path): Path to the dataset.
+        chunk_rows (int): Rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: Consecutive chunks of the dataset.
+    """
+
+    if Path(df_path).suffix not in COLUMNAR_SUFFIXES:
+        yield from pd.read_csv(df_path, chunksize=chunk_rows)
+        return
+
+    with pa.memory_map(str(df_path)) as source:
+        reader = pa.ipc.open_file(source)
+
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows).to_pandas()
+
+
+def read_columns(df_path: str | Path) -> list[str]:
+    """
+    Read the column names of a CSV or Feather dataset without loading its rows.
+    """
+
+    if Path(df_path).suffix not in COLUMNAR_SUFFIXES:
+        return list(pd.read_csv(df_path, nrows=0).columns)
+
+    with pa.memory_map(str(df_path)) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def check_columns(pipeline, df_path: str | Path) -> None:
+    """
+    Check that a dataset has every column a pipeline was fitted on, raising
+    ``ValueError`` otherwise.
+
+    Parameters:
+        pipeline (Pipeline): Fitted preprocessing + model pipeline.
+        df_path (str | Path): Path to the dataset to score.
+    """
+
+    expected = getattr(pipeline, 'feature_names_in_', None)
+
+    if expected is None:
+        return
+
+    missing = sorted(set(expected) - set(read_columns(df_path)))
+
+    if missing:
+        raise ValueError(f'Dataset is missing columns: {", ".join(missing)}')
+
+
+def score_chunks(
+    pipeline, df_path: str | Path, chunk_rows: int = SCORING_CHUNK_ROWS
+) -> Iterator[pd.Series]:
+    """
+    Score a dataset chunk by chunk.
+
+    Throughput is logged once the whole file has been scored.
+
+    Parameters:
+        pipeline (Pipeline): Fitted preprocessing + model pipeline.
+        df_path (str | Path): Path to the dataset to score.
+        chunk_rows (int): Rows per chunk.
+
+    Returns:
+        Iterator[pd.Series]: Predictions, one series per chunk.
+    """
+
+    started = time.perf_counter()
+    rows = 0
+
+    for chunk in iter_chunks(df_path, chunk_rows):
+        predictions = pd.Series(pipeline.predict(chunk), name='prediction')
+        rows += len(predictions)
+
+        yield predictions
+
+    seconds = time.perf_counter() - started
+    logger.info(
+        'Scored %d rows of %s in %.2fs (%.0f rows/s)',
+        rows,
+        df_path,
+        seconds,
+        rows / max(seconds, 1e-9),
+    )
+
+
+def iter_scored_csv(
+    pipeline, df_path: str | Path, chunk_rows: int = SCORING_CHUNK_ROWS
+) -> Iterator[str]:
+    """
+    Score a dataset chunk by chunk and yield the predictions as CSV text.
+
+    Parameters:
+        pipeline (Pipeline): Fitted preprocessing + model pipeline.
+        df_path (str | Path): Path to the dataset to score.
+        chunk_rows (int): Rows per chunk.
+
+    Returns:
+        Iterator[str]: The CSV header, then one piece of CSV text per chunk.
+    """
+
+    yield 'prediction\n'
+
+    for predictions in score_chunks(pipeline, df_path, chunk_rows):
+        yield predictions.to_csv(index=False, header=False)
+
+
+def score_file(
+    pipeline,
+    df_path: str | Path,
+    output_path: str | Path,
+    chunk_rows: int = SCORING_CHUNK_ROWS,
+) -> dict:
+    """
+    Score a dataset chunk by chunk, appending the predictions to a CSV file.
+
+    The file is deleted if scoring fails part way.
+
+    Parameters:
+        pipeline (Pipeline): Fitted preprocessing + model pipeline.
+        df_path (str | Path): Path to the dataset to score.
+        output_path (str | Path): Destination CSV file.
+        chunk_rows (int): Rows per chunk.
+
+    Returns:
+        dict: Output path, number of rows scored, duration and rows per second.
+    """
+
+    started = time.perf_counter()
+    rows = 0
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(output_path, 'w') as f:
+            f.write('prediction\n')
+
+            for predictions in score_chunks(pipeline, df_path, chunk_rows):
+                predictions.to_csv(f, index=False, header=False)
+                rows += len(predictions)
+    except BaseException:
+        Path(output_path).unlink(missing_ok=True)
+        raise
+
+    seconds = time.perf_counter() - started
+
+    return {
+        'output_path': str(output_path),
+        'rows': rows,
+        'duration': seconds,
+        'rows_per_sec': rows / max(seconds, 1e-9),
+    }
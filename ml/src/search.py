@@ -0,0 +1,785 @@
+import time
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMModel, early_stopping
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import (
+    ParameterGrid,
+    ParameterSampler,
+    train_test_split,
+)
+from xgboost import XGBModel
+
+from ml.src.data_preprocessing import (
+    build_column_transformer,
+    categorical_features,
+    model_encoding,
+)
+from ml.src.executors import fan_out
+
+SEARCH_MODES = ('random', 'halving')
+HALVING_RESOURCES = ('n_samples', 'n_estimators')
+
+DEFAULT_HALVING_BUDGET = 8
+MIN_HALVING_ROWS = 1_000
+MIN_HALVING_ESTIMATORS = 25
+
+SAMPLE_START_ROWS = 10_000
+SAMPLE_GROWTH = 4
+SAMPLE_MIN_IMPROVEMENT = 0.005
+
+# Boosters stop adding rounds once the inner validation loss has not improved
+# for this many rounds; ``n_estimators`` is only an upper bound.
+MAX_BOOSTING_ROUNDS = 1_000
+EARLY_STOPPING_ROUNDS = 20
+EARLY_STOPPING_FRACTION = 0.1
+
+
+class FoldCache:
+    """
+    Preprocessed train/validation matrices for every CV fold of a job.
+
+    The preprocessor is fitted once per fold and once on the full training
+    split, and the transformed matrices are shared by every candidate model
+    and every sampled hyperparameter configuration. ``stratify`` makes every
+    row subsample taken from the cache preserve the class proportions, and
+    ``categorical_features`` lists the ordinal-coded output columns.
+    """
+
+    def __init__(
+        self,
+        preprocessor,
+        X_train: pd.DataFrame,
+        X_test: pd.DataFrame,
+        y_train: pd.Series,
+        y_test: pd.Series,
+        cv_splits: list,
+        stratify: bool = False,
+    ):
+        self.stratify = stratify
+        self.folds = []
+
+        for train_idx, val_idx in cv_splits:
+            fold_preprocessor = clone(preprocessor)
+
+            self.folds.append(
+                (
+                    fold_preprocessor.fit_transform(X_train.iloc[train_idx]),
+                    y_train.iloc[train_idx].to_numpy(),
+                    fold_preprocessor.transform(X_train.iloc[val_idx]),
+                    y_train.iloc[val_idx].to_numpy(),
+                )
+            )
+
+        self.preprocessor = clone(preprocessor)
+        self.X_train = self.preprocessor.fit_transform(X_train)
+        self.y_train = y_train.to_numpy()
+        self.X_test = self.preprocessor.transform(X_test)
+        self.y_test = y_test.to_numpy()
+        self.categorical_features = categorical_features(self.preprocessor)
+
+
+def build_fold_caches(
+    model_names,
+    X_train: pd.DataFrame,
+    X_test: pd.DataFrame,
+    y_train: pd.Series,
+    y_test: pd.Series,
+    cv_splits: list,
+    stratify: bool = False,
+) -> dict:
+    """
+    Build one fold cache per categorical encoding used by the given models.
+
+    Models sharing an encoding share the same cache.
+
+    Parameters:
+        model_names: Names of the candidate models.
+        X_train (pd.DataFrame): Training features.
+        X_test (pd.DataFrame): Test features.
+        y_train (pd.Series): Training target.
+        y_test (pd.Series): Test target.
+        cv_splits (list): (train_indices, validation_indices) pairs.
+        stratify (bool): Preserve class proportions in row subsamples.
+
+    Returns:
+        dict: Mapping of model name to its ``FoldCache``.
+    """
+
+    encodings = {name: model_encoding(name) for name in model_names}
+    caches = {
+        encoding: FoldCache(
+            build_column_transformer(X_train, encoding),
+            X_train,
+            X_test,
+            y_train,
+            y_test,
+            cv_splits,
+            stratify=stratify,
+        )
+        for encoding in set(encodings.values())
+    }
+
+    return {name: caches[encoding] for name, encoding in encodings.items()}
+
+
+def native_categorical(model, cache: FoldCache):
+    """
+    Configure XGBoost to treat the ordinal-coded columns as categories.
+
+    LightGBM receives them at fit time instead, see ``fit_estimator``. Other
+    estimators, and caches without ordinal-coded columns, are returned as is.
+
+    Parameters:
+        model: Unfitted estimator.
+        cache (FoldCache): Preprocessed CV folds the model is trained on.
+
+    Returns:
+        The configured estimator.
+    """
+
+    categorical = cache.categorical_features
+
+    if not categorical:
+        return model
+
+    if isinstance(model, XGBModel):
+        feature_types = [
+            'c' if i in categorical else 'q' for i in range(cache.X_train.shape[1])
+        ]
+        return clone(model).set_params(
+            enable_categorical=True, feature_types=feature_types
+        )
+
+    return model
+
+
+@dataclass
+class SearchResult:
+    best_estimator: object
+    best_score: float
+    best_params: dict
+    partial: bool = False
+    # Training rows the best estimator was refitted on.
+    sample_size: int | None = None
+
+
+def model_params(params: dict) -> dict:
+    """
+    Strip the ``model__`` pipeline prefix from hyperparameter names.
+
+    Parameters:
+        params (dict): Hyperparameters as written in the grids.
+
+    Returns:
+        dict: Hyperparameters accepted by the bare estimator.
+    """
+
+    return {k.replace('model__', ''): v for k, v in params.items()}
+
+
+# Fields of a model result published with the task progress; predictions and
+# the fitted pipeline are too large, or not serializable, to go in task meta.
+SUMMARY_FIELDS = ('model_name', 'best_score', 'params', 'duration', 'partial')
+
+
+def model_summary(result: dict) -> dict:
+    """
+    Keep the fields of a model result that are reported while training runs.
+
+    Parameters:
+        result (dict): Result of ``train_single_model``.
+
+    Returns:
+        dict: Model name, score, hyperparameters, duration and partial flag.
+    """
+
+    return {field: result.get(field) for field in SUMMARY_FIELDS}
+
+
+def limit_rows(
+    X, y, max_rows: int | None, stratify: bool = False, random_state: int = 42
+):
+    """
+    Randomly keep at most ``max_rows`` rows of a training matrix.
+
+    Parameters:
+        X: Feature matrix (dense or sparse).
+        y (np.ndarray): Target values.
+        max_rows (int | None): Row limit, ``None`` keeps everything.
+        stratify (bool): Preserve the class proportions of ``y``.
+        random_state (int): Random seed.
+
+    Returns:
+        tuple: The limited X and y.
+    """
+
+    if max_rows is None or X.shape[0] <= max_rows:
+        return X, y
+
+    idx, _ = split_indices(y, max_rows, stratify, random_state)
+
+    return X[idx], y[idx]
+
+
+def split_indices(y, train_size, stratify: bool = False, random_state: int = 42):
+    """
+    Randomly split row positions in two, optionally preserving class proportions.
+
+    Parameters:
+        y (np.ndarray): Target values.
+        train_size (int | float): Size of the first part, as a count or a fraction.
+        stratify (bool): Preserve the class proportions of ``y``.
+        random_state (int): Random seed.
+
+    Returns:
+        tuple: Sorted row positions of both parts.
+    """
+
+    rows = np.arange(len(y))
+
+    try:
+        first, second = train_test_split(
+            rows,
+            train_size=train_size,
+            stratify=y if stratify else None,
+            random_state=random_state,
+        )
+    except ValueError:
+        # Classes too rare to stratify; fall back to a plain random split.
+        first, second = train_test_split(
+            rows, train_size=train_size, random_state=random_state
+        )
+
+    return np.sort(first), np.sort(second)
+
+
+def fit_estimator(
+    estimator,
+    X,
+    y,
+    stratify: bool = False,
+    categorical: list[int] = (),
+    random_state: int = 42,
+):
+    """
+    Fit an estimator, with early stopping for XGBoost and LightGBM.
+
+    Boosters hold out ``EARLY_STOPPING_FRACTION`` of the rows as an inner
+    validation split and stop after ``EARLY_STOPPING_ROUNDS`` rounds without
+    improvement; other estimators are fitted on all rows.
+
+    Parameters:
+        estimator: Unfitted estimator.
+        X: Feature matrix (dense or sparse).
+        y (np.ndarray): Target values.
+        stratify (bool): Preserve the class proportions in the inner split.
+        categorical (list[int]): Ordinal-coded columns LightGBM treats as categories.
+        random_state (int): Random seed.
+
+    Returns:
+        The fitted estimator.
+    """
+
+    if not isinstance(estimator, (XGBModel, LGBMModel)):
+        return estimator.fit(X, y)
+
+    fit_idx, val_idx = split_indices(
+        y, 1 - EARLY_STOPPING_FRACTION, stratify, random_state
+    )
+    eval_set = [(X[val_idx], y[val_idx])]
+
+    if isinstance(estimator, XGBModel):
+        estimator.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+        return estimator.fit(X[fit_idx], y[fit_idx], eval_set=eval_set, verbose=False)
+
+    return estimator.fit(
+        X[fit_idx],
+        y[fit_idx],
+        eval_set=eval_set,
+        categorical_feature=list(categorical) or 'auto',
+        callbacks=[early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+
+
+def best_iteration(estimator) -> int | None:
+    """
+    Number of boosting rounds a booster predicts with, ``None`` for other models.
+    """
+
+    if isinstance(estimator, XGBModel):
+        try:
+            return int(estimator.best_iteration) + 1
+        except AttributeError:
+            # Trained without early stopping, e.g. when continued on new rows.
+            return estimator.get_booster().num_boosted_rounds()
+
+    if isinstance(estimator, LGBMModel):
+        return int(estimator.best_iteration_ or estimator.booster_.current_iteration())
+
+    return None
+
+
+def progressive_sample_size(
+    model,
+    cache: FoldCache,
+    scoring: str,
+    start: int = SAMPLE_START_ROWS,
+    growth: int = SAMPLE_GROWTH,
+    tol: float = SAMPLE_MIN_IMPROVEMENT,
+    deadline: float | None = None,
+) -> int | None:
+    """
+    Find how many training rows a model needs before its learning curve flattens.
+
+    The model is trained with its default hyperparameters on the first fold
+    with samples of ``start``, ``start * growth``, ... rows. Growing stops as
+    soon as a larger sample improves the validation score by less than
+    ``tol`` (relative), and the smaller sample size is kept.
+
+    Parameters:
+        model: Unfitted estimator.
+        cache (FoldCache): Preprocessed CV folds.
+        scoring (str): Scikit-learn scorer name.
+        start (int): Size of the first sample.
+        growth (int): Factor between consecutive sample sizes.
+        tol (float): Minimum relative score improvement to keep growing.
+        deadline (float | None): ``time.time()`` timestamp after which growing stops.
+
+    Returns:
+        int | None: Training row limit, ``None`` when all rows are needed.
+    """
+
+    scorer = get_scorer(scoring)
+    X_fold, y_fold, X_val, y_val = cache.folds[0]
+    n_rows = X_fold.shape[0]
+
+    size = start
+    previous = None
+
+    while size < n_rows:
+        # Out of time: settle for the largest sample already tried.
+        if previous is not None and deadline is not None and time.time() > deadline:
+            return size // growth
+
+        X_sample, y_sample = limit_rows(X_fold, y_fold, size, cache.stratify)
+        estimator = fit_estimator(
+            clone(model), X_sample, y_sample, cache.stratify, cache.categorical_features
+        )
+        score = scorer(estimator, X_val, y_val)
+
+        if previous is not None:
+            improvement = (score - previous) / max(abs(previous), 1e-12)
+
+            if improvement < tol:
+                return size // growth
+
+        previous = score
+        size *= growth
+
+    return None
+
+
+def score_fold(
+    model,
+    candidate: dict,
+    fold: tuple,
+    scorer,
+    max_rows: int | None = None,
+    stratify: bool = False,
+    categorical: list[int] = (),
+) -> float:
+    """
+    Validation score of one configuration on one cached fold.
+
+    Parameters:
+        model: Unfitted estimator.
+        candidate (dict): Hyperparameters for the estimator.
+        fold (tuple): ``(X_fold, y_fold, X_val, y_val)`` from a ``FoldCache``.
+        scorer: Scikit-learn scorer callable.
+        max_rows (int | None): Training row limit.
+        stratify (bool): Preserve class proportions in row subsamples.
+        categorical (list[int]): Ordinal-coded columns LightGBM treats as categories.
+
+    Returns:
+        float: Fold score, NaN if the fit failed.
+    """
+
+    X_fold, y_fold, X_val, y_val = fold
+    X_fold, y_fold = limit_rows(X_fold, y_fold, max_rows, stratify)
+    estimator = clone(model).set_params(**candidate)
+
+    try:
+        fit_estimator(estimator, X_fold, y_fold, stratify, categorical)
+        return scorer(estimator, X_val, y_val)
+    except Exception as exc:
+        warnings.warn(f'Fit failed for {candidate}: {exc}')
+        return np.nan
+
+
+def cross_validate(
+    model,
+    candidate: dict,
+    cache: FoldCache,
+    scorer,
+    max_rows: int | None = None,
+    model_name: str | None = None,
+    deadline: float | None = None,
+) -> float:
+    """
+    Mean validation score of one configuration over the cached folds.
+
+    The folds are fitted in parallel on the executor backend of the model
+    family, see ``resolve_backend``.
+
+    Parameters:
+        model: Unfitted estimator.
+        candidate (dict): Hyperparameters for the estimator.
+        cache (FoldCache): Preprocessed CV folds.
+        scorer: Scikit-learn scorer callable.
+        max_rows (int | None): Training row limit per fold.
+        model_name (str | None): Name of the model, picks the executor backend.
+        deadline (float | None): ``time.time()`` timestamp by which every fold
+            must be scored, ``TimeoutError`` is raised otherwise.
+
+    Returns:
+        float: Mean fold score, NaN if any fit failed.
+    """
+
+    jobs = [
+        (
+            model_name,
+            score_fold,
+            (
+                model,
+                candidate,
+                fold,
+                scorer,
+                max_rows,
+                cache.stratify,
+                cache.categorical_features,
+            ),
+        )
+        for fold in cache.folds
+    ]
+    fold_scores = list(fan_out(jobs, deadline=deadline))
+
+    if len(fold_scores) < len(jobs):
+        raise TimeoutError(f'Folds of {candidate} did not finish in time')
+
+    return float(np.mean(fold_scores))
+
+
+def refit_best(
+    model,
+    candidates: list,
+    scores: list,
+    cache: FoldCache,
+    max_rows: int | None,
+    partial: bool = False,
+) -> SearchResult:
+    """
+    Refit the best scoring configuration on the full training split, or on
+    the first ``max_rows`` rows of it.
+
+    Parameters:
+        model: Unfitted estimator.
+        candidates (list): Evaluated hyperparameter configurations.
+        scores (list): Mean CV score of each configuration.
+        cache (FoldCache): Preprocessed CV folds.
+        max_rows (int | None): Training row limit.
+        partial (bool): Whether the search stopped early at its deadline.
+
+    Returns:
+        SearchResult: Refitted best estimator, its mean CV score, parameters and
+            the number of rows it was refitted on.
+    """
+
+    if np.all(np.isnan(scores)):
+        raise ValueError(f'All {len(candidates)} fits failed for {model!r}')
+
+    best = int(np.nanargmax(scores))
+
+    X_train, y_train = limit_rows(
+        cache.X_train, cache.y_train, max_rows, cache.stratify
+    )
+    best_estimator = clone(model).set_params(**candidates[best])
+    fit_estimator(
+        best_estimator, X_train, y_train, cache.stratify, cache.categorical_features
+    )
+
+    return SearchResult(
+        best_estimator,
+        float(scores[best]),
+        candidates[best],
+        partial,
+        sample_size=X_train.shape[0],
+    )
+
+
+def evaluate_until(candidates: list, evaluate, deadline: float | None) -> list:
+    """
+    Score candidates in order until the next one would not finish in time.
+
+    The first candidate is always scored. A candidate is only started if
+    there is time left for it and for the final refit, each estimated from
+    the mean duration of the candidates scored so far; one still running at
+    the deadline is dropped.
+
+    Parameters:
+        candidates (list): Hyperparameter configurations.
+        evaluate: Callable returning the score of one configuration, given the
+            configuration and the deadline it must finish by.
+        deadline (float | None): ``time.time()`` timestamp, ``None`` scores all.
+
+    Returns:
+        list: Scores of the leading candidates that were evaluated.
+    """
+
+    scores = []
+    started = time.time()
+
+    for candidate in candidates:
+        if scores and deadline is not None:
+            per_candidate = (time.time() - started) / len(scores)
+
+            if time.time() + 2 * per_candidate > deadline:
+                break
+
+        try:
+            scores.append(evaluate(candidate, deadline if scores else None))
+        except TimeoutError:
+            break
+
+    return scores
+
+
+def random_search(
+    model,
+    params: dict,
+    cache: FoldCache,
+    scoring: str,
+    n_iter: int = 4,
+    max_rows: int | None = None,
+    random_state: int = 42,
+    deadline: float | None = None,
+    model_name: str | None = None,
+) -> SearchResult:
+    """
+    Randomized hyperparameter search over the cached CV folds.
+
+    Mirrors ``RandomizedSearchCV``: configurations that fail to fit score NaN,
+    and the best configuration is refitted on the full training split.
+
+    Parameters:
+        model: Unfitted estimator.
+        params (dict): Hyperparameter distributions.
+        cache (FoldCache): Preprocessed CV folds.
+        scoring (str): Scikit-learn scorer name.
+        n_iter (int): Number of sampled configurations.
+        max_rows (int | None): Training row limit per fit.
+        random_state (int): Random seed.
+        deadline (float | None): ``time.time()`` timestamp after which no new
+            configuration is started.
+        model_name (str | None): Name of the model, picks the executor backend.
+
+    Returns:
+        SearchResult: Refitted best estimator, its mean CV score and parameters.
+    """
+
+    scorer = get_scorer(scoring)
+    candidates = [
+        model_params(c)
+        for c in ParameterSampler(params, n_iter=n_iter, random_state=random_state)
+    ]
+    scores = evaluate_until(
+        candidates,
+        lambda candidate, until: cross_validate(
+            model, candidate, cache, scorer, max_rows, model_name, until
+        ),
+        deadline,
+    )
+    partial = len(scores) < len(candidates)
+
+    return refit_best(
+        model, candidates[: len(scores)], scores, cache, max_rows, partial
+    )
+
+
+def halving_search(
+    model,
+    params: dict,
+    cache: FoldCache,
+    scoring: str,
+    budget: float = DEFAULT_HALVING_BUDGET,
+    resource: str = 'n_samples',
+    factor: int = 3,
+    max_rows: int | None = None,
+    random_state: int = 42,
+    deadline: float | None = None,
+    model_name: str | None = None,
+) -> SearchResult:
+    """
+    Successive-halving hyperparameter search over the cached CV folds.
+
+    Many configurations are first evaluated on a small resource (training
+    rows or boosting rounds); only the best ``1 / factor`` of each round are
+    promoted to a ``factor`` times larger resource, until the survivors run on
+    the full resource.
+
+    Every round costs about the same, so the total compute is
+    ``budget`` full-resource cross-validations spread across the rounds.
+
+    Parameters:
+        model: Unfitted estimator.
+        params (dict): Hyperparameter distributions.
+        cache (FoldCache): Preprocessed CV folds.
+        scoring (str): Scikit-learn scorer name.
+        budget (float): Total compute, in full-resource cross-validations.
+        resource (str): 'n_samples' or 'n_estimators'.
+        factor (int): Promotion ratio between rounds.
+        max_rows (int | None): Training row limit per fit.
+        random_state (int): Random seed.
+        deadline (float | None): ``time.time()`` timestamp after which no new
+            configuration is started; the best one of the current round wins.
+        model_name (str | None): Name of the model, picks the executor backend.
+
+    Returns:
+        SearchResult: Refitted best estimator, its mean CV score and parameters.
+    """
+
+    if resource not in HALVING_RESOURCES:
+        raise ValueError(f'Unknown halving resource: {resource}')
+
+    scorer = get_scorer(scoring)
+    params = dict(params)
+
+    if resource == 'n_samples':
+        fold_rows = min(X_fold.shape[0] for X_fold, _, _, _ in cache.folds)
+        max_resource = min(fold_rows, max_rows or fold_rows)
+        min_resource = min(max_resource, MIN_HALVING_ROWS)
+    else:
+        default = model.get_params()['n_estimators']
+        max_resource = max(params.pop('model__n_estimators', [default]))
+        min_resource = min(max_resource, MIN_HALVING_ESTIMATORS)
+
+    n_rounds = 1 + int(np.log(max_resource / min_resource) // np.log(factor))
+    n_candidates = max(1, int(budget * factor ** (n_rounds - 1) / n_rounds))
+
+    if all(isinstance(v, list) for v in params.values()):
+        n_candidates = min(n_candidates, len(ParameterGrid(params)))
+
+    # A small grid is exhausted quickly; drop the rounds it cannot fill.
+    sampler = ParameterSampler(params, n_iter=n_candidates, random_state=random_state)
+    candidates = [model_params(c) for c in sampler]
+    n_rounds = min(n_rounds, 1 + int(np.log(len(candidates)) // np.log(factor)))
+
+    partial = False
+
+    for round_ in range(n_rounds):
+        size = int(max_resource / factor ** (n_rounds - 1 - round_))
+
+        if resource == 'n_samples':
+            scores = evaluate_until(
+                candidates,
+                lambda c, until: cross_validate(
+                    model, c, cache, scorer, size, model_name, until
+                ),
+                deadline,
+            )
+        else:
+            scores = evaluate_until(
+                candidates,
+                lambda c, until: cross_validate(
+                    model,
+                    {**c, 'n_estimators': size},
+                    cache,
+                    scorer,
+                    max_rows,
+                    model_name,
+                    until,
+                ),
+                deadline,
+            )
+
+        if len(scores) < len(candidates):
+            candidates = candidates[: len(scores)]
+            partial = True
+            break
+
+        if round_ < n_rounds - 1:
+            keep = max(1, int(np.ceil(len(candidates) / factor)))
+            order = np.argsort(np.nan_to_num(scores, nan=-np.inf))[::-1][:keep]
+            candidates = [candidates[i] for i in order]
+
+    # A search cut short refits on the resource it reached, to stay in time.
+    if resource == 'n_samples' and partial:
+        max_rows = size
+    elif resource == 'n_estimators':
+        n_estimators = size if partial else max_resource
+        candidates = [{**c, 'n_estimators': n_estimators} for c in candidates]
+
+    return refit_best(model, candidates, scores, cache, max_rows, partial)
+
+
+def run_search(
+    mode: str,
+    model,
+    params: dict,
+    cache: FoldCache,
+    scoring: str,
+    budget: float | None = None,
+    resource: str = 'n_samples',
+    max_rows: int | None = None,
+    deadline: float | None = None,
+    model_name: str | None = None,
+) -> SearchResult:
+    """
+    Run the hyperparameter search selected for a training job.
+
+    Parameters:
+        mode (str): One of ``SEARCH_MODES``.
+        model: Unfitted estimator.
+        params (dict): Hyperparameter distributions.
+        cache (FoldCache): Preprocessed CV folds.
+        scoring (str): Scikit-learn scorer name.
+        budget (float | None): Compute budget for the halving search.
+        resource (str): Halving resource, 'n_samples' or 'n_estimators'.
+        max_rows (int | None): Training row limit per fit.
+        deadline (float | None): ``time.time()`` timestamp after which no new
+            configuration is started.
+        model_name (str | None): Name of the model, picks the executor backend.
+
+    Returns:
+        SearchResult: Refitted best estimator, its mean CV score and parameters.
+    """
+
+    if mode == 'random':
+        return random_search(
+            model,
+            params,
+            cache,
+            scoring,
+            max_rows=max_rows,
+            deadline=deadline,
+            model_name=model_name,
+        )
+
+    if mode == 'halving':
+        return halving_search(
+            model,
+            params,
+            cache,
+            scoring,
+            budget=budget or DEFAULT_HALVING_BUDGET,
+            resource=resource,
+            max_rows=max_rows,
+            deadline=deadline,
+            model_name=model_name,
+        )
+
+    raise ValueError(f'Unknown search mode: {mode}')
@@ -1,17 +1,30 @@
 from core.celery_app import celery_app
-from ml.src.regression import regression_training
+from ml.src.tasks.training import dispatch_training
 
 
 @celery_app.task(bind=True)
-def regression_task(self, df_path: str, target: str):
+def regression_task(
+    self,
+    df_path: str | None,
+    target: str,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    features: list[str] | None = None,
+    time_budget_s: float | None = None,
+    cache_key: str | None = None,
+    dataset_hash: str | None = None,
+):
     self.update_state(state='PROGRESS', meta={'step': 'loading data'})
 
-    results = regression_training(self, df_path, target)
-
-    best = min(results, key=lambda x: x['best_score'])
-
-    return {
-        'status': 'done',
-        'best_model': best,
-        'all_results': results,
-    }
+    return dispatch_training(
+        self,
+        'regression',
+        df_path,
+        target,
+        search_mode,
+        search_budget,
+        features,
+        time_budget_s,
+        cache_key,
+        dataset_hash,
+    )
@@ -0,0 +1,454 @@
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from celery import chord
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.result import allow_join_result
+
+from core.celery_app import celery_app
+from core.dataset_store import fetch_dataset
+from core.result_cache import get_result_cache
+from core.training_events import publish_training_event
+from ml.src import classification, regression
+from ml.src.artifacts import discard_model, offload_predictions, save_model
+from ml.src.data_preprocessing import build_cv_splits, split_dataset
+from ml.src.datasets import load_dataset, memory_footprint
+from ml.src.fold_caches import (
+    discard_fold_caches,
+    load_fold_cache,
+    save_fold_caches,
+)
+from ml.src.incremental import (
+    describe_lineage,
+    find_parent,
+    incremental_training,
+    save_lineage,
+)
+from ml.src.search import build_fold_caches
+
+TRAINERS = {
+    'classification': classification,
+    'regression': regression,
+}
+
+HEAVY_QUEUE = 'heavy'
+LIGHT_QUEUE = 'light'
+
+# Queue each model's subtask is routed to, so workers for the slow ensembles
+# can be scaled apart from those running the cheap models.
+MODEL_QUEUES = {
+    'LogisticRegression': LIGHT_QUEUE,
+    'LinearRegression': LIGHT_QUEUE,
+    'Ridge': LIGHT_QUEUE,
+    'DesicionTree': LIGHT_QUEUE,
+    'RandomForest': HEAVY_QUEUE,
+    'XGBoost': HEAVY_QUEUE,
+    'LightGBM': HEAVY_QUEUE,
+}
+
+
+def abandoned(model_name: str) -> dict:
+    """
+    Result of a model abandoned at the time budget.
+    """
+
+    return {'model_name': model_name, 'partial': True, 'abandoned': True}
+
+
+@contextmanager
+def deadline_alarm(deadline: float | None):
+    """
+    Raise ``SoftTimeLimitExceeded`` in the current task once the deadline passes.
+
+    The alarm counts from the deadline itself, so a subtask that waited in its
+    queue only gets the time the job has left. Signals are only delivered to
+    the main thread; elsewhere, as in a thread pool worker, the search still
+    stops starting new configurations at the deadline.
+
+    Parameters:
+        deadline (float | None): ``time.time()`` timestamp, ``None`` for no alarm.
+    """
+
+    if deadline is None or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise SoftTimeLimitExceeded()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, max(deadline - time.time(), 1e-3))
+
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def resolve_dataset(df_path: str | None, dataset_hash: str | None) -> str:
+    """
+    Local path of a job's dataset, fetched from the dataset store by hash when
+    the request gave no path.
+    """
+
+    return df_path if df_path is not None else fetch_dataset(dataset_hash)
+
+
+def prepare_fold_caches(
+    task_type: str, job_id: str, df, target: str, model_names
+) -> None:
+    """
+    Split a dataset and store its preprocessed CV folds on this node.
+
+    The split and the folds are deterministic, so a node rebuilding the
+    caches of a job ends up with the same folds as the one that dispatched it.
+
+    Parameters:
+        task_type (str): 'classification' or 'regression'.
+        job_id (str): ID of the training task.
+        df (pd.DataFrame): Dataset, features and target.
+        target (str): Target column name.
+        model_names: Names of the models the caches are built for.
+    """
+
+    stratify = TRAINERS[task_type].STRATIFY
+    X_train, X_test, y_train, y_test = split_dataset(df, target)
+    cv_splits = build_cv_splits(X_train, y_train, stratify=stratify)
+
+    save_fold_caches(
+        build_fold_caches(
+            model_names,
+            X_train,
+            X_test,
+            y_train,
+            y_test,
+            cv_splits,
+            stratify=stratify,
+        ),
+        job_id,
+    )
+
+
+def store_model_result(result: dict, job_id: str, dataset_hash: str | None) -> dict:
+    """
+    Move the pipeline and predictions of a model result to the artifact store.
+
+    Parameters:
+        result (dict): Result of ``train_single_model``.
+        job_id (str): ID of the training task the model belongs to.
+        dataset_hash (str | None): SHA-256 of the dataset file, part of the model id.
+
+    Returns:
+        dict: The same result, JSON-serializable, with a ``model_id``.
+    """
+
+    pipeline = result.pop('pipeline')
+
+    offload_predictions(result, job_id)
+    result['model_id'] = save_model(
+        pipeline, f'{job_id}-{result["model_name"]}', dataset_hash
+    )
+
+    return result
+
+
+def pick_best(results: list, scoring: str) -> dict:
+    """
+    Pick the best of the finished model results.
+
+    Scores are stored positive, so a ``neg_`` scorer such as MAE is better
+    when lower and every other one, such as F1, when higher.
+
+    Parameters:
+        results (list): Finished model results.
+        scoring (str): Scorer the models were searched with, the trainer's ``SCORING``.
+
+    Returns:
+        dict: The result with the best score.
+    """
+
+    if scoring.startswith('neg_'):
+        return min(results, key=lambda x: x['best_score'])
+
+    return max(results, key=lambda x: x['best_score'])
+
+
+def finish_training(
+    task_type: str,
+    job_id: str,
+    results: list,
+    lineage: dict,
+    cache_key: str | None = None,
+    time_budget_s: float | None = None,
+) -> dict:
+    """
+    Pick the best model of a job and build the task result.
+
+    The models that were not picked are deleted from the artifact store.
+
+    Parameters:
+        task_type (str): 'classification' or 'regression'.
+        job_id (str): ID of the training task.
+        results (list): Stored model results, from ``store_model_result``.
+        lineage (dict): Dataset description, from ``describe_lineage``.
+        cache_key (str | None): Result cache key of the request.
+        time_budget_s (float | None): Time budget of the job, for the error message.
+
+    Returns:
+        dict: Status, whether the result is partial, the best model and all results.
+    """
+
+    finished = [r for r in results if not r.get('abandoned')]
+
+    if not finished:
+        raise TimeoutError(f'No model finished within {time_budget_s}s')
+
+    best = pick_best(finished, TRAINERS[task_type].SCORING)
+
+    for r in finished:
+        if r is not best:
+            discard_model(r.pop('model_id'))
+
+    save_lineage(lineage, best['model_id'])
+
+    result = {
+        'status': 'done',
+        'partial': any(r['partial'] for r in results),
+        'best_model': best,
+        'all_results': results,
+    }
+
+    # A result cut short by the time budget is not worth serving again.
+    if cache_key is not None and not result['partial']:
+        get_result_cache().set(cache_key, {'task_id': job_id, 'result': result})
+
+    return result
+
+
+@celery_app.task(bind=True)
+def train_model_task(
+    self,
+    task_type: str,
+    job_id: str,
+    model_name: str,
+    df_path: str | None = None,
+    target: str | None = None,
+    features: list[str] | None = None,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    deadline: float | None = None,
+    dataset_hash: str | None = None,
+):
+    if deadline is not None and time.time() >= deadline:
+        return abandoned(model_name)
+
+    try:
+        with deadline_alarm(deadline):
+            cache = load_fold_cache(job_id, model_name)
+
+            if cache is None:
+                # Fold caches stay on the node that built them; elsewhere the
+                # subtask rebuilds the one of its model from the dataset.
+                columns = None if features is None else [*features, target]
+                df = load_dataset(
+                    resolve_dataset(df_path, dataset_hash),
+                    columns=columns,
+                    keep=[target],
+                )
+                prepare_fold_caches(task_type, job_id, df, target, [model_name])
+                del df
+
+                cache = load_fold_cache(job_id, model_name)
+
+            result = TRAINERS[task_type].train_model(
+                model_name, cache, search_mode, search_budget, deadline
+            )
+    except SoftTimeLimitExceeded:
+        return abandoned(model_name)
+    except Exception:
+        # The chord never reaches its reducer, so announce the failure here.
+        publish_training_event(job_id, 'FAILURE')
+        raise
+
+    return store_model_result(result, job_id, dataset_hash)
+
+
+@celery_app.task(bind=True)
+def select_best_task(
+    self,
+    results: list,
+    task_type: str,
+    lineage: dict,
+    cache_key: str | None = None,
+    time_budget_s: float | None = None,
+):
+    # The chord replaced the training task, so the reducer runs under its ID.
+    try:
+        result = finish_training(
+            task_type, self.request.id, results, lineage, cache_key, time_budget_s
+        )
+    except Exception:
+        publish_training_event(self.request.id, 'FAILURE')
+        raise
+    else:
+        publish_training_event(self.request.id, 'SUCCESS', result)
+
+        return result
+    finally:
+        discard_fold_caches(self.request.id)
+
+        if cache_key is not None:
+            get_result_cache().release(cache_key)
+
+
+def dispatch_training(
+    task,
+    task_type: str,
+    df_path: str | None,
+    target: str,
+    search_mode: str = 'random',
+    search_budget: float | None = None,
+    features: list[str] | None = None,
+    time_budget_s: float | None = None,
+    cache_key: str | None = None,
+    dataset_hash: str | None = None,
+):
+    """
+    Run a training job as a chord of one subtask per model.
+
+    Datasets extending an earlier upload whose best model is a booster or a
+    forest are first tried as an incremental update, finished here within the
+    time budget. Otherwise the dataset is split and its CV folds
+    preprocessed here, once per categorical encoding, and stored on this
+    node for the job; subtasks running on other nodes rebuild them from the
+    dataset. Each model is then trained by its own subtask,
+    routed to the heavy or light queue, and ``select_best_task`` reduces
+    their results. The task is replaced by the chord, so its ID ends up
+    holding the reduced result; meanwhile its progress meta lists the subtask
+    IDs. The end of the job, either way, is published as a training event
+    under the same ID.
+
+    Parameters:
+        task: The bound Celery training task.
+        task_type (str): 'classification' or 'regression'.
+        df_path (str | None): Path to the dataset CSV or Feather file, ``None``
+            to fetch it from the dataset store by ``dataset_hash``.
+        target (str): Target column name.
+        search_mode (str): 'random' or 'halving' hyperparameter search.
+        search_budget (float | None): Compute budget for the halving search.
+        features (list[str] | None): Feature columns to read, ``None`` uses all of them.
+        time_budget_s (float | None): Seconds after which models still training are
+            abandoned and listed with ``abandoned`` set.
+        cache_key (str | None): Result cache key of the request.
+        dataset_hash (str | None): SHA-256 of the dataset file, part of the model id.
+
+    Returns:
+        dict: The task result, from ``finish_training``.
+    """
+
+    trainer = TRAINERS[task_type]
+    deadline = None if time_budget_s is None else time.time() + time_budget_s
+    job_id = task.request.id
+    handed_over = False
+
+    try:
+        columns = None if features is None else [*features, target]
+        df = load_dataset(
+            resolve_dataset(df_path, dataset_hash), columns=columns, keep=[target]
+        )
+
+        task.update_state(
+            state='PROGRESS',
+            meta={
+                'step': 'loading data',
+                'memory_mb': round(memory_footprint(df) / 2**20, 1),
+            },
+        )
+
+        lineage = describe_lineage(df, target, task_type)
+        parent = find_parent(df, target, task_type)
+
+        if parent is not None:
+            try:
+                with deadline_alarm(deadline):
+                    result = incremental_training(
+                        task,
+                        df,
+                        target,
+                        parent,
+                        trainer.build_models(),
+                        trainer.GRID_PARAMS,
+                        scoring=trainer.SCORING,
+                    )
+            except SoftTimeLimitExceeded:
+                raise TimeoutError(
+                    f'Incremental update not finished within {time_budget_s}s'
+                ) from None
+
+            if result is not None:
+                store_model_result(result, job_id, dataset_hash)
+                result = finish_training(
+                    task_type, job_id, [result], lineage, cache_key, time_budget_s
+                )
+                publish_training_event(job_id, 'SUCCESS', result)
+
+                return result
+
+        models = trainer.build_models()
+
+        # Split and preprocess once per categorical encoding for the whole
+        # job; every subtask on this node loads the cache of its model.
+        prepare_fold_caches(task_type, job_id, df, target, models)
+        del df
+
+        header = []
+
+        for model_name in models:
+            signature = train_model_task.si(
+                task_type,
+                job_id,
+                model_name,
+                df_path,
+                target,
+                features,
+                search_mode,
+                search_budget,
+                deadline,
+                dataset_hash,
+            ).set(queue=MODEL_QUEUES.get(model_name, LIGHT_QUEUE))
+
+            signature.freeze()
+            header.append(signature)
+
+        task.update_state(
+            state='PROGRESS',
+            meta={
+                'step': 'training',
+                'total': len(header),
+                'jobs': {s.args[2]: s.id for s in header},
+            },
+        )
+
+        handed_over = True
+
+        # In eager mode the chord runs inline and its result is joined here,
+        # which Celery otherwise refuses inside a task.
+        with allow_join_result():
+            return task.replace(
+                chord(
+                    header,
+                    select_best_task.s(task_type, lineage, cache_key, time_budget_s),
+                )
+            )
+    except Exception:
+        if not handed_over:
+            discard_fold_caches(job_id)
+            publish_training_event(job_id, 'FAILURE')
+
+        raise
+    finally:
+        if cache_key is not None and not handed_over:
+            get_result_cache().release(cache_key)
@@ -1,8 +1,11 @@
 import pytest
+import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from api.db.db_config import Base
+from core.known_users import get_known_users
 
 SQLALCHEMY_DATABASE_URL = 'sqlite:///./test.db'
 
@@ -21,3 +24,17 @@ def db():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+
+
+@pytest_asyncio.fixture()
+async def async_db(tmp_path):
+    get_known_users().clear()
+    async_engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/test.db')
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+        yield session
+
+    await async_engine.dispose()
@@ -0,0 +1,50 @@
+import pytest
+
+from api.db.crud.predictions import (
+    create_new_prediction_async,
+    get_user_predictions_page_async,
+)
+from api.db.crud.users import get_or_create_user_async, get_user_profile_async
+from api.db.db_config import async_database_url
+
+
+@pytest.mark.asyncio
+async def test_async_user_and_predictions(async_db):
+    user = await get_or_create_user_async(async_db, tg_id=1234, username='User')
+
+    assert await get_or_create_user_async(async_db, tg_id=1234, username='User') == user
+    assert (await get_user_profile_async(async_db, tg_id=1234)).username == 'User'
+
+    for metric in (0.5, 0.7):
+        await create_new_prediction_async(
+            async_db, 1234, 'classification', 'LinReg', 'Survived', metric, 'hash'
+        )
+
+    predictions, _ = await get_user_predictions_page_async(async_db, 1234)
+
+    assert sorted(p.metric for p in predictions) == [0.5, 0.7]
+
+
+def test_async_database_url_swaps_the_driver():
+    assert (
+        async_database_url('postgresql://user:secret@db:5432/automl')
+        == 'postgresql+asyncpg://user:secret@db:5432/automl'
+    )
+    assert (
+        async_database_url('postgresql+psycopg2://user:secret@db/automl')
+        == 'postgresql+asyncpg://user:secret@db/automl'
+    )
+    assert async_database_url('sqlite:///./test.db') == 'sqlite+aiosqlite:///./test.db'
+
+
+@pytest.mark.asyncio
+async def test_user_upsert_updates_username_and_caches_the_user(async_db):
+    user = await get_or_create_user_async(async_db, tg_id=1234, username='old')
+    renamed = await get_or_create_user_async(async_db, tg_id=1234, username='new')
+
+    assert renamed.id == user.id
+    assert renamed.username == 'new'
+
+    # Known users are served without touching the database.
+    assert (await get_or_create_user_async(None, tg_id=1234, username='new')) is renamed
+    assert (await get_user_profile_async(None, tg_id=1234)) is renamed
@@ -0,0 +1,65 @@
+import hashlib
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from sklearn.linear_model import LogisticRegression
+
+from api.db.schemas import BatchScoringRequest
+from api.v2 import datasets, models
+from core.dataset_store import DatasetStore
+from ml.src import artifacts
+from ml.src.artifacts import build_pipeline
+from ml.src.data_preprocessing import build_column_transformer
+
+DATASET = 'tests/data/Titanic-Dataset.csv'
+
+
+@pytest.fixture()
+def store(tmp_path, monkeypatch):
+    store = DatasetStore(tmp_path / 'store', max_bytes=2**30)
+    monkeypatch.setattr(datasets, 'get_dataset_store', lambda: store)
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path / 'artifacts')
+
+    df = pd.read_csv(DATASET)
+    X = df.drop(columns=['Survived'])
+    preprocessor = build_column_transformer(X).fit(X)
+    model = LogisticRegression().fit(preprocessor.transform(X), df['Survived'])
+    monkeypatch.setattr(
+        models, 'get_pipeline', lambda model_id: build_pipeline(preprocessor, model)
+    )
+
+    return store
+
+
+def test_saved_scores_are_downloaded_by_id(store):
+    with open(DATASET, 'rb') as f:
+        digest = store.write([f.read()])
+
+    response = models.model_score(
+        'model', BatchScoringRequest(dataset_hash=digest, save_output=True)
+    )
+    scored = pd.read_csv(models.get_scores(response['scores_id']).path)
+
+    assert response['rows'] == len(scored) == len(pd.read_csv(DATASET))
+    assert 'output_path' not in response
+
+
+def test_missing_columns_are_rejected_before_streaming(store):
+    digest = store.write([pd.read_csv(DATASET).drop(columns=['Age']).to_csv().encode()])
+
+    with pytest.raises(HTTPException) as exc:
+        models.model_score('model', BatchScoringRequest(dataset_hash=digest))
+
+    assert exc.value.status_code == 422
+    assert 'Age' in exc.value.detail
+
+
+def test_unknown_dataset_is_not_found(store):
+    with pytest.raises(HTTPException) as exc:
+        models.model_score(
+            'model',
+            BatchScoringRequest(dataset_hash=hashlib.sha256(b'none').hexdigest()),
+        )
+
+    assert exc.value.status_code == 404
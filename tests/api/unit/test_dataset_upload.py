@@ -0,0 +1,48 @@
+import hashlib
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from api.v2 import datasets
+from core.dataset_store import DatasetStore
+
+
+class FakeRequest:
+    def __init__(self, chunks, disconnect=False):
+        self.chunks = chunks
+        self.disconnect = disconnect
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+        if self.disconnect:
+            raise ClientDisconnect()
+
+
+@pytest.fixture()
+def store(tmp_path, monkeypatch):
+    store = DatasetStore(tmp_path, max_bytes=2**20)
+    monkeypatch.setattr(datasets, 'get_dataset_store', lambda: store)
+
+    return store
+
+
+@pytest.mark.asyncio
+async def test_upload_is_stored_under_its_hash(store):
+    digest = hashlib.sha256(b'a,b\n1,2\n').hexdigest()
+
+    response = await datasets.upload_dataset(digest, FakeRequest([b'a,b\n', b'1,2\n']))
+
+    assert response == {'dataset_hash': digest, 'created': True}
+    assert store.get(digest).read_bytes() == b'a,b\n1,2\n'
+
+
+@pytest.mark.asyncio
+async def test_interrupted_upload_leaves_no_temporary_file(store):
+    digest = hashlib.sha256(b'a,b\n1,2\n').hexdigest()
+
+    with pytest.raises(ClientDisconnect):
+        await datasets.upload_dataset(digest, FakeRequest([b'a,b\n'], disconnect=True))
+
+    assert not list(store.root.iterdir())
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from api.v2 import training
+
+
+async def collect(states, monkeypatch, finished=(), pending_grace=60):
+    monkeypatch.setattr(training, 'read_task', lambda task_id: states.pop(0))
+    monkeypatch.setattr(training, 'read_finished_models', lambda jobs: list(finished))
+
+    return [event async for event in training.iter_task_events('abc', 0, pending_grace)]
+
+
+def parse(event):
+    name, data = event.strip().split('\n')
+
+    return name.removeprefix('event: '), json.loads(data.removeprefix('data: '))
+
+
+def summary(model_name, score):
+    return {
+        'model_name': model_name,
+        'best_score': score,
+        'params': {},
+        'duration': 1.0,
+        'partial': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_each_model_once_then_done(monkeypatch):
+    first = summary('LogisticRegression', 0.7)
+    second = {**summary('XGBoost', 0.8), 'predictions': [1, 0], 'model_id': 'x'}
+    states = [
+        ('PENDING', None),
+        ('PROGRESS', {'step': 'training', 'jobs': {'LogisticRegression': 'a'}}),
+        ('PROGRESS', {'step': 'training', 'jobs': {'LogisticRegression': 'a'}}),
+        (
+            'SUCCESS',
+            {
+                'partial': False,
+                'best_model': second,
+                'all_results': [first, second],
+            },
+        ),
+    ]
+
+    events = [parse(event) for event in await collect(states, monkeypatch, [first])]
+
+    assert [name for name, _ in events] == ['model', 'model', 'done']
+    assert events[0][1] == first
+    assert events[1][1] == summary('XGBoost', 0.8)
+    assert events[2][1]['best_model']['model_id'] == 'x'
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_failure(monkeypatch):
+    states = [('FAILURE', ValueError('bad target'))]
+
+    events = [parse(event) for event in await collect(states, monkeypatch)]
+
+    assert events == [('error', {'state': 'FAILURE', 'detail': 'bad target'})]
+
+
+@pytest.mark.asyncio
+async def test_stream_gives_up_on_a_task_left_pending(monkeypatch):
+    states = [('PENDING', None)] * 3
+
+    events = [
+        parse(event) for event in await collect(states, monkeypatch, pending_grace=0)
+    ]
+
+    assert [name for name, _ in events] == ['error']
+    assert events[0][1]['state'] == 'PENDING'
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v2 import training
+from api.v2.router import router
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix='/v2')
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('task_type', ['classification', 'regression'])
+def test_training_is_enqueued_off_the_event_loop(client, monkeypatch, task_type):
+    calls = []
+
+    def enqueue_training(task, task_type, data):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            calls.append((task.name, task_type, data.target))
+        else:
+            calls.append('event loop')
+
+        return {'task_id': 'job', 'status': 'started'}
+
+    monkeypatch.setattr(training, 'enqueue_training', enqueue_training)
+
+    response = client.post(
+        f'/v2/{task_type}/train/', json={'target': 'Survived', 'dataset_hash': 'a' * 64}
+    )
+
+    assert response.json() == {'task_id': 'job', 'status': 'started'}
+    assert calls == [
+        (f'ml.src.tasks.{task_type}.{task_type}_task', task_type, 'Survived')
+    ]
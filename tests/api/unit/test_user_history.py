@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from api.db.crud.predictions import (
+    create_new_prediction_async,
+    get_user_predictions_page_async,
+)
+from api.db.crud.stats import get_user_stats_async
+from api.db.models import ModelRun, Prediction
+
+
+@pytest.mark.asyncio
+async def test_history_pages_do_not_skip_or_repeat(async_db):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    # Pairs of predictions share a creation time, so the ID breaks the tie.
+    async_db.add_all(
+        Prediction(
+            user_telegram_id=1234,
+            task_type='regression',
+            best_model='Ridge',
+            target='price',
+            metric=float(i),
+            created_at=start + timedelta(seconds=i // 2),
+        )
+        for i in range(7)
+    )
+    await async_db.commit()
+
+    pages, cursor = [], None
+
+    while True:
+        predictions, cursor = await get_user_predictions_page_async(
+            async_db, 1234, limit=3, cursor=cursor
+        )
+        pages.append([p.metric for p in predictions])
+
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sorted(sum(pages, [])) == [float(i) for i in range(7)]
+    assert pages[0][0] == 6.0
+
+
+@pytest.mark.asyncio
+async def test_stats_are_updated_with_each_prediction(async_db):
+    runs = [
+        ('classification', 'XGBoost', 0.8),
+        ('classification', 'LightGBM', 0.9),
+        ('regression', 'LightGBM', 12.0),
+        ('regression', 'Ridge', 10.0),
+        ('classification', 'XGBoost', 0.7),
+        ('classification', 'LightGBM', 0.6),
+    ]
+
+    for task_type, model, metric in runs:
+        await create_new_prediction_async(
+            async_db, 1234, task_type, model, 'target', metric, 'hash'
+        )
+
+    stats = await get_user_stats_async(async_db, 1234)
+
+    assert stats.runs == 6
+    assert stats.best_classification_metric == 0.9
+    assert stats.best_regression_metric == 10.0
+    assert (stats.favourite_model, stats.favourite_model_runs) == ('LightGBM', 3)
+    assert await get_user_stats_async(async_db, 5678) is None
+
+
+@pytest.mark.asyncio
+async def test_every_model_result_is_stored_with_the_prediction(async_db):
+    all_results = [
+        {
+            'model_name': 'Ridge',
+            'best_score': 10.0,
+            'params': {'alpha': 1.0},
+            'duration': 0.2,
+            'partial': False,
+            'model_id': 'job-Ridge',
+        },
+        {
+            'model_name': 'XGBoost',
+            'best_score': 11.5,
+            'params': {'max_depth': 4},
+            'best_iteration': 87,
+            'duration': 3.1,
+            'partial': False,
+        },
+        {'model_name': 'LightGBM', 'partial': True, 'abandoned': True},
+    ]
+
+    prediction = await create_new_prediction_async(
+        async_db,
+        1234,
+        'regression',
+        'Ridge',
+        'price',
+        10.0,
+        'hash',
+        model_id='job-Ridge',
+        model_runs=all_results,
+    )
+
+    runs = {
+        run.model_name: run
+        for run in await async_db.scalars(
+            select(ModelRun).where(ModelRun.prediction_id == prediction.id)
+        )
+    }
+
+    assert set(runs) == {'Ridge', 'XGBoost', 'LightGBM'}
+    assert runs['Ridge'].is_best and runs['Ridge'].model_id == 'job-Ridge'
+    assert runs['XGBoost'].params == {'max_depth': 4}
+    assert runs['XGBoost'].best_iteration == 87
+    assert runs['LightGBM'].abandoned and runs['LightGBM'].score is None
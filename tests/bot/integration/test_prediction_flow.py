@@ -4,6 +4,7 @@ import pytest
 from aiogram import Bot, Dispatcher
 from aiogram.types import Document, Message, Update
 
+from bot.api_client import ApiClient
 from bot.handlers import router
 from core.config import settings
 
@@ -15,7 +16,7 @@ async def test_prediction_flow():
     """
 
     bot = Bot(token=settings.BOT_TOKEN)
-    dp = Dispatcher(bot=bot)
+    dp = Dispatcher(bot=bot, api=ApiClient.from_settings(settings))
     dp.include_router(router)
 
     csv_bytes = b'col1,col2,target\n1,2,0\n3,4,1'
@@ -34,7 +35,11 @@ async def test_prediction_flow():
     )
 
     bot.get_file = AsyncMock(return_value=type('File', (), {'file_path': 'fake_path'}))
-    bot.download_file = AsyncMock(return_value=csv_bytes)
+    bot.download_file = AsyncMock(
+        side_effect=lambda file_path, destination, **kwargs: destination.write(
+            csv_bytes
+        )
+    )
 
     # Create fake document
     fake_document = Document(
@@ -0,0 +1,65 @@
+import httpx
+import pytest
+
+from bot.api_client import ApiClient, ApiUnavailable, CircuitBreaker
+
+
+def make_client(statuses, calls, threshold=5):
+    responses = iter(statuses)
+
+    def handler(request):
+        calls.append(request.method)
+        status = next(responses)
+
+        if status is None:
+            raise httpx.ConnectError('refused', request=request)
+
+        return httpx.Response(status)
+
+    return ApiClient(
+        'http://api',
+        timeout=httpx.Timeout(1),
+        limits=httpx.Limits(max_connections=2),
+        retries=2,
+        backoff=0,
+        breaker=CircuitBreaker(threshold, reset_timeout=60),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_until_the_api_recovers():
+    calls = []
+    api = make_client([503, None, 200], calls)
+
+    response = await api.get('/v2/datasets/abc')
+
+    assert response.status_code == 200
+    assert calls == ['GET'] * 3
+    assert api.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_post_is_retried_only_when_it_was_not_sent():
+    calls = []
+    api = make_client([None, 503], calls)
+
+    response = await api.post('/v2/regression/train/', json={})
+
+    assert response.status_code == 503
+    assert calls == ['POST'] * 2
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    calls = []
+    api = make_client([None] * 3, calls, threshold=3)
+
+    with pytest.raises(ApiUnavailable):
+        await api.get('/v2/datasets/abc')
+
+    with pytest.raises(ApiUnavailable):
+        await api.get('/v2/datasets/abc')
+
+    assert api.breaker.open
+    assert len(calls) == 3
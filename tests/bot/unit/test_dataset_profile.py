@@ -0,0 +1,29 @@
+import hashlib
+import io
+
+from bot.utils import DatasetProfile
+
+CSV = '﻿Age,"Name, full",Survived\n22,"Braund, Owen",0\n38,"Cumings, John",1'.encode()
+
+
+def test_profile_matches_the_whole_file_in_one_pass():
+    sink = io.BytesIO()
+    profile = DatasetProfile(sink)
+
+    for start in range(0, len(CSV), 7):
+        profile.write(CSV[start : start + 7])
+
+    assert sink.getvalue() == CSV
+    assert profile.summary() == {
+        'dataset_hash': hashlib.sha256(CSV).hexdigest(),
+        'columns': ['Age', 'Name, full', 'Survived'],
+        'rows': 2,
+    }
+
+
+def test_trailing_line_break_is_not_a_row():
+    profile = DatasetProfile(io.BytesIO())
+    profile.write(b'a,b\r\n1,2\r\n')
+
+    assert profile.columns == ['a', 'b']
+    assert profile.rows == 1
@@ -0,0 +1,28 @@
+import fakeredis
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.handlers import MakingPrediction
+from bot.storage import build_storage
+from core.config import settings
+
+KEY = StorageKey(bot_id=1, chat_id=123, user_id=123)
+
+
+@pytest.mark.asyncio
+async def test_redis_storage_is_shared_between_replicas():
+    redis_settings = settings.model_copy(update={'FSM_STORAGE': 'redis'})
+    server = fakeredis.FakeServer()
+    first = build_storage(redis_settings, fakeredis.FakeAsyncRedis(server=server))
+    second = build_storage(redis_settings, fakeredis.FakeAsyncRedis(server=server))
+
+    await first.set_state(KEY, MakingPrediction.target)
+    await first.set_data(KEY, {'task_type': 'Regression', 'uploads': {}})
+
+    assert await second.get_state(KEY) == MakingPrediction.target.state
+    assert await second.get_data(KEY) == {'task_type': 'Regression', 'uploads': {}}
+
+
+def test_memory_storage_is_the_default():
+    assert isinstance(build_storage(settings), MemoryStorage)
@@ -0,0 +1,80 @@
+import asyncio
+
+import fakeredis
+import pytest
+import redis.asyncio as redis
+
+from bot import events as bot_events
+from bot.events import TrainingEvents
+from core.serialization import orjson_dumps
+from core.training_events import training_event
+
+
+async def running():
+    return {'state': 'PROGRESS', 'info': {'step': 'training'}}
+
+
+@pytest.mark.asyncio
+async def test_published_event_reaches_every_waiting_chat():
+    client = fakeredis.FakeAsyncRedis()
+    events = TrainingEvents(client)
+    listener = asyncio.create_task(events.run())
+
+    waiting = [asyncio.create_task(events.wait('job', running)) for _ in range(2)]
+    other = asyncio.create_task(events.wait('other', running))
+    await asyncio.sleep(0.1)
+
+    event = training_event('job', 'SUCCESS', {'status': 'done'})
+    await client.publish(events.channel, orjson_dumps(event))
+
+    assert await asyncio.gather(*waiting) == [event, event]
+    assert not other.done()
+    assert list(events.waiters) == ['other']
+
+    other.cancel()
+    listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_listener_survives_bad_messages_and_redis_errors(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    pubsub = client.pubsub
+    failures = iter([redis.TimeoutError('timed out')])
+
+    def flaky_pubsub():
+        for exc in failures:
+            raise exc
+
+        return pubsub()
+
+    monkeypatch.setattr(bot_events, 'RECONNECT_DELAY_S', 0)
+    monkeypatch.setattr(client, 'pubsub', flaky_pubsub)
+
+    events = TrainingEvents(client)
+    listener = asyncio.create_task(events.run())
+    waiting = asyncio.create_task(events.wait('job', running))
+    await asyncio.sleep(0.1)
+
+    event = training_event('job', 'SUCCESS', {'status': 'done'})
+    await client.publish(events.channel, b'not json')
+    await client.publish(events.channel, orjson_dumps({'state': 'SUCCESS'}))
+    await client.publish(events.channel, orjson_dumps(event))
+
+    assert await asyncio.wait_for(waiting, 5) == event
+    assert not listener.done()
+
+    listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_job_ended_before_the_wait_is_read_from_the_api():
+    events = TrainingEvents(fakeredis.FakeAsyncRedis(), reconcile_interval=0.01)
+    states = iter(['PROGRESS', 'FAILURE'])
+
+    async def read_state():
+        return {'state': next(states), 'info': None}
+
+    event = await events.wait('job', read_state)
+
+    assert event == {'task_id': 'job', 'state': 'FAILURE', 'info': None}
+    assert events.waiters == {}
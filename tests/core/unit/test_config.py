@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+
+from core.config import Settings, settings
+
+
+def webhook_settings(**overrides):
+    return Settings(
+        **{
+            **settings.model_dump(),
+            'BOT_MODE': 'webhook',
+            'WEBHOOK_URL': 'https://bot.example.com',
+            'FSM_STORAGE': 'redis',
+            **overrides,
+        }
+    )
+
+
+def test_webhook_mode_with_url_and_redis_is_accepted():
+    assert webhook_settings().BOT_MODE == 'webhook'
+
+
+@pytest.mark.parametrize(
+    'overrides', [{'WEBHOOK_URL': None}, {'FSM_STORAGE': 'memory'}]
+)
+def test_webhook_mode_needs_url_and_redis(overrides):
+    with pytest.raises(ValidationError):
+        webhook_settings(**overrides)
@@ -0,0 +1,59 @@
+import hashlib
+import os
+
+import pytest
+
+from core.dataset_store import DatasetStore
+
+
+def digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def test_duplicate_uploads_are_stored_once(tmp_path):
+    store = DatasetStore(tmp_path, max_bytes=1_000)
+
+    assert store.write([b'a,b\n', b'1,2\n']) == digest(b'a,b\n1,2\n')
+
+    upload = store.temp_path()
+    upload.write_bytes(b'a,b\n1,2\n')
+
+    assert store.add(upload) == (digest(b'a,b\n1,2\n'), False)
+    assert [p.suffix for p in tmp_path.iterdir()] == ['.csv']
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_content_must_match_the_hash(tmp_path):
+    store = DatasetStore(tmp_path, max_bytes=1_000)
+
+    with pytest.raises(ValueError):
+        store.write([b'data'], digest(b'other'))
+
+    assert store.get(digest(b'data')) is None
+
+
+def test_least_recently_used_datasets_are_evicted(tmp_path):
+    store = DatasetStore(tmp_path, max_bytes=250)
+    first, second = store.write([b'1' * 100]), store.write([b'2' * 100])
+
+    # Reading the first dataset makes the second the least recently used.
+    os.utime(store.get(second), (0, 0))
+    store.get(first)
+    third = store.write([b'3' * 100])
+
+    assert store.get(first) is not None
+    assert store.get(second) is None
+    assert store.get(third) is not None
+
+
+def test_columnar_copy_is_evicted_with_its_dataset(tmp_path):
+    store = DatasetStore(tmp_path, max_bytes=250)
+    first = store.write([b'1' * 100])
+    store.columnar_path(first).write_bytes(b'c' * 100)
+    os.utime(store.get(first), (0, 0))
+
+    second = store.write([b'2' * 100])
+
+    assert store.get(first) is None
+    assert not store.columnar_path(first).exists()
+    assert store.get(second) is not None
@@ -0,0 +1,43 @@
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from core.model_cache import ModelCache
+from ml.src import artifacts
+from ml.src.artifacts import build_pipeline, save_model
+from ml.src.data_preprocessing import build_column_transformer
+
+
+def train_pipeline():
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0, 4.0], 'city': ['a', 'b', 'a', 'b']})
+    y = [1.0, 2.0, 3.0, 4.0]
+
+    preprocessor = build_column_transformer(df).fit(df)
+    model = LinearRegression().fit(preprocessor.transform(df), y)
+
+    return build_pipeline(preprocessor, model)
+
+
+def test_saved_pipeline_scores_raw_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+
+    model_id = save_model(train_pipeline(), 'task-1', 'abc123')
+    pipeline = ModelCache().get(model_id)
+
+    assert model_id == 'abc123_task-1'
+    assert len(pipeline.predict(pd.DataFrame([{'x': 5.0, 'city': 'a'}]))) == 1
+
+
+def test_model_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+
+    ids = [save_model(train_pipeline(), f'task-{i}') for i in range(3)]
+    nbytes = artifacts.artifact_path(ids[0]).stat().st_size
+    cache = ModelCache(max_bytes=2 * nbytes + nbytes // 2)
+
+    cache.get(ids[0])
+    cache.get(ids[1])
+    cache.get(ids[0])
+    cache.get(ids[2])
+
+    assert list(cache._models) == [ids[0], ids[2]]
+    assert cache.size <= cache.max_bytes
@@ -0,0 +1,43 @@
+import fakeredis
+
+from core.result_cache import ResultCache
+
+
+def make_cache(**kwargs):
+    return ResultCache(fakeredis.FakeRedis(), **kwargs)
+
+
+def test_result_cache_roundtrip():
+    cache = make_cache()
+    key = cache.make_key('hash', 'Survived', 'classification', search_mode='random')
+
+    assert cache.get(key) is None
+
+    cache.set(key, {'task_id': 'abc', 'result': {'status': 'done'}})
+
+    assert cache.get(key) == {'task_id': 'abc', 'result': {'status': 'done'}}
+    assert key != cache.make_key('hash', 'Survived', 'regression', search_mode='random')
+
+
+def test_result_cache_evicts_oldest_entries():
+    cache = make_cache(max_entries=2)
+
+    for key in ('a', 'b', 'c'):
+        cache.set(key, {'task_id': key})
+
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    assert cache.get('c') is not None
+
+
+def test_claim_coalesces_identical_requests():
+    cache = make_cache()
+
+    assert cache.claim('key', 'first') is None
+    assert cache.claim('key', 'second') == 'first'
+
+    cache.forget('key', 'second')
+    assert cache.claim('key', 'third') == 'first'
+
+    cache.release('key')
+    assert cache.claim('key', 'fourth') is None
@@ -0,0 +1,17 @@
+import numpy as np
+from kombu.serialization import dumps, loads
+
+from core.serialization import register_orjson
+
+
+def test_orjson_serializer_handles_numpy():
+    register_orjson()
+    result = {'best_score': np.float64(0.5), 'predictions_preview': np.arange(3)}
+
+    content_type, encoding, body = dumps(result, serializer='orjson')
+
+    assert isinstance(body, bytes)
+    assert loads(body, content_type, encoding, accept=[content_type]) == {
+        'best_score': 0.5,
+        'predictions_preview': [0, 1, 2],
+    }
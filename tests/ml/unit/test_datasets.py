@@ -0,0 +1,84 @@
+import os
+
+import pandas as pd
+
+from core import dataset_store
+from core.dataset_store import DatasetStore
+from ml.src import datasets
+from ml.src.data_preprocessing import build_column_transformer
+from ml.src.datasets import (
+    ensure_columnar,
+    load_dataset,
+    memory_footprint,
+    save_dataset_as_feather,
+)
+
+
+def test_csv_is_converted_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        datasets, '_columnar_cache', DatasetStore(tmp_path, max_bytes=2**30)
+    )
+    file_path = os.path.join('tests', 'data', 'Titanic-Dataset.csv')
+
+    feather_path = ensure_columnar(file_path)
+    modified = os.path.getmtime(feather_path)
+
+    assert feather_path.endswith('.feather')
+    assert ensure_columnar(file_path) == feather_path
+    assert os.path.getmtime(feather_path) == modified
+
+    df = load_dataset(file_path, columns=['Age', 'Survived'], keep=['Age', 'Survived'])
+
+    assert list(df.columns) == ['Age', 'Survived']
+    assert df.equals(pd.read_csv(file_path)[['Age', 'Survived']])
+
+
+def test_stored_csv_is_converted_next_to_it(tmp_path, monkeypatch):
+    cache = DatasetStore(tmp_path, max_bytes=2**30)
+    monkeypatch.setattr(dataset_store, '_cache', cache)
+
+    with open(os.path.join('tests', 'data', 'Titanic-Dataset.csv'), 'rb') as f:
+        digest = cache.write([f.read()])
+
+    assert ensure_columnar(cache.get(digest)) == str(cache.columnar_path(digest))
+
+
+def test_feather_preserves_dtypes(tmp_path):
+    df = pd.DataFrame(
+        {
+            'small': pd.Series([1, 2, 3], dtype='int8'),
+            'city': pd.Series(['a', 'b', 'a'], dtype='category'),
+        }
+    )
+
+    path = save_dataset_as_feather(df, tmp_path / 'data.feather')
+    loaded = load_dataset(path, keep=list(df.columns))
+
+    assert loaded.dtypes.equals(df.dtypes)
+
+
+def test_load_dataset_downcasts_every_batch(tmp_path):
+    df = pd.DataFrame(
+        {
+            'count': range(1_000),
+            'ratio': [i / 7 for i in range(1_000)],
+            'city': [f'city_{i % 30}' for i in range(1_000)],
+            'target': [i % 2 for i in range(1_000)],
+        }
+    )
+
+    path = tmp_path / 'data.feather'
+    df.to_feather(path, chunksize=100)
+    loaded = load_dataset(path, keep=['target'])
+
+    assert str(loaded['count'].dtype) == 'uint16'
+    assert str(loaded['ratio'].dtype) == 'float32'
+    assert isinstance(loaded['city'].dtype, pd.CategoricalDtype)
+    assert loaded['target'].dtype == df['target'].dtype
+    assert loaded['city'].astype(str).tolist() == df['city'].tolist()
+    assert memory_footprint(loaded) < memory_footprint(df)
+
+    preprocessor = build_column_transformer(loaded.drop(columns=['target']))
+    selected = {name: list(cols) for name, _, cols in preprocessor.transformers}
+
+    assert selected == {'num': ['count', 'ratio'], 'cat': ['city']}
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from ml.src.executors import InlineExecutor, fan_out, resolve_backend
+
+
+def square(x):
+    return x * x
+
+
+def test_inline_executor_runs_synchronously():
+    future = InlineExecutor().submit(square, 3)
+
+    assert future.done()
+    assert future.result() == 9
+
+
+def test_resolve_backend_override(monkeypatch):
+    assert resolve_backend('Ridge') == 'inline'
+
+    monkeypatch.setenv('TRAINING_EXECUTOR', 'thread')
+    assert resolve_backend('Ridge') == 'thread'
+
+    monkeypatch.setenv('TRAINING_EXECUTOR', 'gpu')
+    with pytest.raises(ValueError):
+        resolve_backend('Ridge')
+
+
+def test_fan_out_collects_every_backend():
+    jobs = [
+        ('Ridge', square, (2,)),
+        ('XGBoost', square, (3,)),
+        ('RandomForest', square, (4,)),
+    ]
+
+    assert sorted(fan_out(jobs)) == [4, 9, 16]
+
+
+def test_fan_out_abandons_jobs_past_the_deadline(monkeypatch):
+    monkeypatch.setenv('TRAINING_EXECUTOR', 'thread')
+    jobs = [
+        ('XGBoost', square, (3,)),
+        ('LightGBM', time.sleep, (2,)),
+    ]
+
+    started = time.time()
+    results = list(fan_out(jobs, deadline=time.time() + 0.5))
+
+    assert results == [9]
+    assert time.time() - started < 1.5
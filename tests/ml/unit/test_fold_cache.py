@@ -0,0 +1,77 @@
+import os
+import time
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+
+from ml.src.data_preprocessing import (
+    build_column_transformer,
+    build_cv_splits,
+    split_dataset,
+)
+from ml.src.search import FoldCache, cross_validate, evaluate_until, random_search
+
+
+def build_cache():
+    file_path = os.path.join('tests', 'data', 'Titanic-Dataset.csv')
+    df = pd.read_csv(file_path)
+
+    X_train, X_test, y_train, y_test = split_dataset(df, 'Survived')
+    preprocessor = build_column_transformer(X_train)
+    cv_splits = build_cv_splits(X_train, y_train, stratify=True)
+
+    return FoldCache(preprocessor, X_train, X_test, y_train, y_test, cv_splits)
+
+
+def test_fold_cache_shapes():
+    cache = build_cache()
+
+    assert len(cache.folds) == 3
+    for X_fold, y_fold, X_val, y_val in cache.folds:
+        assert X_fold.shape[0] == len(y_fold)
+        assert X_val.shape[0] == len(y_val)
+        assert X_fold.shape[1] == X_val.shape[1]
+
+    assert cache.X_test.shape[0] == len(cache.y_test)
+
+
+def test_random_search_reuses_cache():
+    cache = build_cache()
+
+    search = random_search(
+        LogisticRegression(),
+        {'model__C': [0.1, 1, 10]},
+        cache,
+        scoring='f1',
+        n_iter=2,
+    )
+
+    assert set(search.best_params) == {'C'}
+    assert 0 <= search.best_score <= 1
+    assert len(search.best_estimator.predict(cache.X_test)) == len(cache.y_test)
+
+
+def test_folds_run_on_the_model_backend(monkeypatch):
+    cache = build_cache()
+    scorer = get_scorer('f1')
+    monkeypatch.setenv('TRAINING_EXECUTOR', 'inline')
+    inline = cross_validate(
+        LogisticRegression(), {'C': 1}, cache, scorer, model_name='Ridge'
+    )
+    monkeypatch.setenv('TRAINING_EXECUTOR', 'thread')
+    threaded = cross_validate(
+        LogisticRegression(), {'C': 1}, cache, scorer, model_name='Ridge'
+    )
+
+    assert inline == threaded
+
+
+def test_candidate_past_the_deadline_is_dropped():
+    def evaluate(candidate, deadline):
+        if deadline is not None:
+            raise TimeoutError()
+
+        return candidate
+
+    assert evaluate_until([1, 2, 3], evaluate, time.time() + 60) == [1]
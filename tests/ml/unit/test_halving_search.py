@@ -0,0 +1,112 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.tree import DecisionTreeClassifier
+from xgboost import XGBClassifier
+
+from ml.src.data_preprocessing import (
+    build_column_transformer,
+    build_cv_splits,
+    split_dataset,
+)
+from ml.src.search import FoldCache, best_iteration, halving_search, run_search
+
+
+@pytest.fixture(scope='module')
+def cache():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(6_000, 4)), columns=['a', 'b', 'c', 'd'])
+    df['target'] = (df['a'] + rng.normal(scale=0.5, size=len(df)) > 0).astype(int)
+
+    X_train, X_test, y_train, y_test = split_dataset(df, 'target')
+    preprocessor = build_column_transformer(X_train)
+    cv_splits = build_cv_splits(X_train, y_train, stratify=True)
+
+    return FoldCache(preprocessor, X_train, X_test, y_train, y_test, cv_splits)
+
+
+def test_halving_search_on_rows(cache):
+    search = halving_search(
+        DecisionTreeClassifier(random_state=0),
+        {
+            'model__max_depth': [2, 4, 6, 8],
+            'model__min_samples_leaf': [1, 5, 20],
+        },
+        cache,
+        scoring='f1',
+        budget=4,
+    )
+
+    assert set(search.best_params) == {'max_depth', 'min_samples_leaf'}
+    assert search.best_score > 0.7
+
+
+def test_halving_search_cut_short_reports_the_rows_it_refitted_on(cache):
+    search = halving_search(
+        DecisionTreeClassifier(random_state=0),
+        {
+            'model__max_depth': [2, 4, 6, 8],
+            'model__min_samples_leaf': [1, 5, 20],
+        },
+        cache,
+        scoring='f1',
+        budget=4,
+        deadline=time.time() - 1,
+    )
+
+    assert search.partial
+    assert search.sample_size < cache.X_train.shape[0]
+    assert search.sample_size == search.best_estimator.tree_.n_node_samples[0]
+
+
+def test_halving_search_on_boosting_rounds(cache):
+    search = halving_search(
+        LGBMClassifier(verbose=-1),
+        {
+            'model__n_estimators': [50, 100],
+            'model__learning_rate': [0.05, 0.1],
+            'model__num_leaves': [15, 31],
+        },
+        cache,
+        scoring='f1',
+        budget=2,
+        resource='n_estimators',
+    )
+
+    assert search.best_params['n_estimators'] == 100
+    assert search.best_estimator.n_estimators == 100
+
+
+def test_run_search_rejects_unknown_mode(cache):
+    with pytest.raises(ValueError):
+        run_search('grid', DecisionTreeClassifier(), {}, cache, scoring='f1')
+
+
+def test_boosters_stop_early(cache):
+    search = run_search(
+        'random',
+        XGBClassifier(n_estimators=1_000, learning_rate=0.3),
+        {'model__max_depth': [3, 6]},
+        cache,
+        scoring='f1',
+    )
+
+    assert best_iteration(search.best_estimator) < 1_000
+    assert best_iteration(DecisionTreeClassifier()) is None
+
+
+def test_search_past_its_deadline_is_partial(cache):
+    search = run_search(
+        'random',
+        DecisionTreeClassifier(random_state=0),
+        {'model__max_depth': [2, 4, 6, 8]},
+        cache,
+        scoring='f1',
+        deadline=time.time(),
+    )
+
+    assert search.partial
+    assert search.best_score > 0
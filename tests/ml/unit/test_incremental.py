@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+from ml.src import artifacts
+from ml.src.artifacts import build_pipeline, save_model
+from ml.src.data_preprocessing import build_column_transformer, split_dataset
+from ml.src.incremental import (
+    describe_lineage,
+    find_parent,
+    incremental_training,
+    save_lineage,
+)
+from ml.src.search import best_iteration, fit_estimator
+
+
+class FakeTask:
+    def update_state(self, **kwargs):
+        pass
+
+
+def make_dataset(rows, seed, flip=False):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(rows, 3)), columns=['a', 'b', 'c'])
+    df['city'] = pd.Categorical(rng.choice(['x', 'y', 'z'], size=rows))
+    df['target'] = (df['a'] + df['b'] > 0).astype(int)
+
+    if flip:
+        df['target'] = 1 - df['target']
+
+    return df
+
+
+@pytest.fixture()
+def parent(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+
+    df = make_dataset(3_000, seed=0)
+    X_train, _, y_train, _ = split_dataset(df, 'target')
+    preprocessor = build_column_transformer(X_train, 'ordinal').fit(X_train)
+    model = fit_estimator(
+        XGBClassifier(n_estimators=200),
+        preprocessor.transform(X_train),
+        y_train.to_numpy(),
+        stratify=True,
+    )
+
+    model_id = save_model(build_pipeline(preprocessor, model), 'task-0')
+    save_lineage(describe_lineage(df, 'target', 'classification'), model_id)
+
+    return df
+
+
+def test_appended_dataset_is_extended(parent):
+    df = pd.concat([parent, make_dataset(1_000, seed=1)], ignore_index=True)
+    lineage = find_parent(df, 'target', 'classification')
+
+    result = incremental_training(
+        FakeTask(),
+        df,
+        'target',
+        lineage,
+        {'XGBoost': XGBClassifier()},
+        {'XGBoost': {'model__max_depth': [3, 6]}},
+        scoring='f1',
+    )
+
+    assert lineage['rows'] == len(parent)
+    assert result['model_name'] == 'XGBoost'
+    assert result['incremental'] is True
+    assert result['sample_size'] == 800
+    assert set(result['params']) == {'max_depth'}
+    assert result['best_iteration'] > best_iteration(
+        artifacts.load_model(lineage['model_id'])['model']
+    )
+
+
+def test_modified_prefix_is_not_a_parent(parent):
+    df = pd.concat([parent, make_dataset(1_000, seed=1)], ignore_index=True)
+    df.loc[10, 'a'] += 1
+
+    assert find_parent(df, 'target', 'classification') is None
+
+
+def test_drift_triggers_a_full_search(parent):
+    df = pd.concat([parent, make_dataset(1_000, seed=1, flip=True)], ignore_index=True)
+    lineage = find_parent(df, 'target', 'classification')
+
+    result = incremental_training(
+        FakeTask(),
+        df,
+        'target',
+        lineage,
+        {'XGBoost': XGBClassifier()},
+        {},
+        scoring='f1',
+    )
+
+    assert lineage is not None
+    assert result is None
+
+
+def test_model_that_cannot_be_extended_runs_the_full_search(parent):
+    X_train, _, y_train, _ = split_dataset(parent, 'target')
+    preprocessor = build_column_transformer(X_train).fit(X_train)
+    model = LogisticRegression().fit(preprocessor.transform(X_train), y_train)
+    model_id = save_model(build_pipeline(preprocessor, model), 'task-1')
+    save_lineage(describe_lineage(parent, 'target', 'classification'), model_id)
+
+    df = pd.concat([parent, make_dataset(1_000, seed=1)], ignore_index=True)
+    lineage = find_parent(df, 'target', 'classification')
+
+    result = incremental_training(
+        FakeTask(),
+        df,
+        'target',
+        lineage,
+        {'LogisticRegression': LogisticRegression()},
+        {},
+        scoring='f1',
+    )
+
+    assert lineage['model_id'] == model_id
+    assert result is None
@@ -0,0 +1,30 @@
+import numpy as np
+
+from ml.src import artifacts
+from ml.src.artifacts import load_predictions, offload_predictions
+
+
+def test_offloaded_predictions_keep_a_preview(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+    result = {'model_name': 'XGBoost', 'predictions': np.arange(100.0)}
+
+    offload_predictions(result, 'task-1')
+
+    assert 'predictions' not in result
+    assert result['predictions_preview'] == list(
+        range(artifacts.PREDICTION_PREVIEW_ROWS)
+    )
+    np.testing.assert_array_equal(
+        load_predictions(result['predictions_id']), np.arange(100.0)
+    )
+
+
+def test_string_labels_load_without_pickle(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+    labels = np.array(['yes', 'no', 'yes'], dtype=object)
+
+    result = offload_predictions(
+        {'model_name': 'LightGBM', 'predictions': labels}, 'task-1'
+    )
+
+    assert load_predictions(result['predictions_id']).tolist() == ['yes', 'no', 'yes']
@@ -1,9 +1,14 @@
 import os
 
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 
-from ml.src.data_preprocessing import build_column_transformer
+from ml.src.data_preprocessing import (
+    MAX_ONEHOT_CATEGORIES,
+    build_column_transformer,
+    categorical_features,
+)
 
 
 def test_build_column_transformer():
@@ -14,3 +19,29 @@ def test_build_column_transformer():
     preprocessor = build_column_transformer(df)
 
     assert isinstance(preprocessor, ColumnTransformer)
+
+
+def test_encodings_keep_high_cardinality_columns_narrow():
+    df = pd.DataFrame(
+        {
+            'zip': pd.Series([f'{i:05d}' for i in range(1_000)], dtype='str'),
+            'income': range(1_000),
+        }
+    )
+
+    onehot = build_column_transformer(df, 'onehot').fit(df)
+    ordinal = build_column_transformer(df, 'ordinal').fit(df)
+
+    assert onehot.transform(df).shape[1] == 1 + MAX_ONEHOT_CATEGORIES
+    assert ordinal.transform(df).shape[1] == 2
+    assert categorical_features(onehot) == []
+    assert categorical_features(ordinal) == [1]
+
+
+def test_unseen_categories_become_missing_codes():
+    train = pd.DataFrame({'city': ['a', 'b', 'a'], 'x': [1.0, 2.0, 3.0]})
+    test = pd.DataFrame({'city': ['c'], 'x': [1.0]})
+
+    ordinal = build_column_transformer(train, 'ordinal').fit(train)
+
+    assert np.isnan(ordinal.transform(test)[0, 1])
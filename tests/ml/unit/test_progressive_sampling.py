@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from ml.src.data_preprocessing import (
+    build_column_transformer,
+    build_cv_splits,
+    split_dataset,
+)
+from ml.src.search import FoldCache, limit_rows, progressive_sample_size
+
+
+def build_cache(rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(rows, 3)), columns=['a', 'b', 'c'])
+    df['target'] = (df['a'] - df['b'] > 0).astype(int)
+
+    X_train, X_test, y_train, y_test = split_dataset(df, 'target')
+    preprocessor = build_column_transformer(X_train)
+    cv_splits = build_cv_splits(X_train, y_train, stratify=True)
+
+    return FoldCache(
+        preprocessor, X_train, X_test, y_train, y_test, cv_splits, stratify=True
+    )
+
+
+def test_limit_rows_keeps_class_proportions():
+    X = np.arange(10_000).reshape(-1, 1)
+    y = np.array([1] * 500 + [0] * 9_500)
+
+    X_small, y_small = limit_rows(X, y, 1_000, stratify=True)
+
+    assert X_small.shape[0] == 1_000
+    assert y_small.sum() == 50
+
+
+def test_progressive_sample_size_stops_on_flat_curve():
+    cache = build_cache(60_000)
+
+    size = progressive_sample_size(
+        LogisticRegression(), cache, scoring='f1', start=1_000
+    )
+
+    assert size is not None
+    assert size < cache.folds[0][0].shape[0]
+
+
+def test_progressive_sample_size_keeps_small_datasets_whole():
+    cache = build_cache(2_000)
+
+    assert progressive_sample_size(LogisticRegression(), cache, scoring='f1') is None
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from ml.src.artifacts import build_pipeline
+from ml.src.data_preprocessing import build_column_transformer
+from ml.src.datasets import save_dataset_as_feather
+from ml.src.scoring import iter_scored_csv, score_file
+
+
+def train_pipeline(df):
+    X = df.drop(columns=['Survived'])
+    preprocessor = build_column_transformer(X).fit(X)
+    model = LogisticRegression().fit(preprocessor.transform(X), df['Survived'])
+
+    return build_pipeline(preprocessor, model)
+
+
+def test_score_file_matches_in_memory_predictions(tmp_path):
+    file_path = os.path.join('tests', 'data', 'Titanic-Dataset.csv')
+    df = pd.read_csv(file_path)
+    pipeline = train_pipeline(df)
+
+    stats = score_file(pipeline, file_path, tmp_path / 'out.csv', chunk_rows=100)
+    scored = pd.read_csv(tmp_path / 'out.csv')
+
+    assert stats['rows'] == len(df)
+    assert stats['rows_per_sec'] > 0
+    assert scored['prediction'].tolist() == pipeline.predict(df).tolist()
+
+
+def test_feather_is_streamed_in_chunks(tmp_path):
+    df = pd.read_csv(os.path.join('tests', 'data', 'Titanic-Dataset.csv'))
+    pipeline = train_pipeline(df)
+    feather_path = save_dataset_as_feather(df, tmp_path / 'data.feather')
+
+    pieces = list(iter_scored_csv(pipeline, feather_path, chunk_rows=300))
+
+    assert pieces[0] == 'prediction\n'
+    assert len(pieces) == 1 + 3
+    assert sum(piece.count('\n') for piece in pieces[1:]) == len(df)
@@ -0,0 +1,115 @@
+import time
+
+import fakeredis
+import pytest
+from celery.backends.cache import CacheBackend
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from core import training_events
+from core.celery_app import celery_app
+from core.training_events import parse_training_event
+from ml.src import artifacts, classification, fold_caches
+from ml.src.artifacts import artifact_path
+from ml.src.tasks.classification import classification_task
+from ml.src.tasks import training
+from ml.src.tasks.training import pick_best, train_model_task
+
+DATASET = 'tests/data/Titanic-Dataset.csv'
+
+
+@pytest.fixture()
+def eager(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'ARTIFACT_DIR', tmp_path)
+    monkeypatch.setattr(fold_caches, 'FOLD_CACHE_DIR', tmp_path / 'folds')
+    monkeypatch.setitem(celery_app.conf, 'task_always_eager', True)
+    monkeypatch.setattr(
+        celery_app._local,
+        'backend',
+        CacheBackend(app=celery_app, backend='memory'),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        classification,
+        'build_models',
+        lambda: {
+            'LogisticRegression': LogisticRegression(),
+            'DesicionTree': DecisionTreeClassifier(),
+        },
+    )
+
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(training_events, '_client', client)
+
+    pubsub = client.pubsub()
+    pubsub.subscribe(training_events.TRAINING_EVENTS_CHANNEL)
+    pubsub.get_message()
+
+    return pubsub
+
+
+def test_chord_reduces_one_subtask_per_model(eager):
+    task = classification_task.apply_async((DATASET, 'Survived'))
+    result = task.get()
+
+    best = result['best_model']
+    results = result['all_results']
+
+    assert [r['model_name'] for r in results] == ['LogisticRegression', 'DesicionTree']
+    assert not result['partial']
+    assert artifact_path(best['model_id']).exists()
+    assert ['model_id' in r for r in results].count(True) == 1
+    assert all(len(r['predictions_preview']) for r in results)
+    assert best['best_score'] == max(r['best_score'] for r in results)
+    assert not list(fold_caches.FOLD_CACHE_DIR.iterdir())
+
+    event = parse_training_event(eager.get_message()['data'])
+
+    assert event == {'task_id': task.id, 'state': 'SUCCESS', 'info': result}
+    assert eager.get_message() is None
+
+
+def test_subtask_past_the_deadline_is_abandoned(eager):
+    result = train_model_task.apply(
+        ('classification', 'job', 'DesicionTree'),
+        {'deadline': time.time() - 1},
+    ).get()
+
+    assert result == {'model_name': 'DesicionTree', 'partial': True, 'abandoned': True}
+
+
+def test_subtask_rebuilds_the_fold_cache_missing_on_its_node(eager):
+    result = train_model_task.apply(
+        ('classification', 'job', 'DesicionTree', DATASET, 'Survived')
+    ).get()
+
+    assert result['model_name'] == 'DesicionTree'
+    assert not result['partial']
+    assert artifact_path(result['model_id']).exists()
+    assert fold_caches.load_fold_cache('job', 'DesicionTree') is not None
+
+
+def test_subtask_is_stopped_at_the_deadline(eager, monkeypatch):
+    monkeypatch.setattr(training, 'load_fold_cache', lambda job_id, model_name: {})
+    monkeypatch.setattr(
+        classification, 'train_model', lambda *args: time.sleep(10) or {}
+    )
+
+    started = time.time()
+    result = train_model_task.apply(
+        ('classification', 'job', 'DesicionTree'),
+        {'deadline': started + 0.2},
+    ).get()
+
+    assert result == {'model_name': 'DesicionTree', 'partial': True, 'abandoned': True}
+    assert time.time() - started < 5
+
+
+def test_pick_best_follows_the_scoring_direction():
+    results = [
+        {'model_name': 'a', 'best_score': 0.7},
+        {'model_name': 'b', 'best_score': 0.8},
+    ]
+
+    assert pick_best(results, 'f1')['model_name'] == 'b'
+    assert pick_best(results, 'neg_mean_absolute_error')['model_name'] == 'a'